@@ -9,9 +9,15 @@
 
 import collections
 import csv
-import subprocess
+import itertools
+import math
+import os
 from .k_funcs import hist_k
 
+# These are the columns of ISIS hist output that hold counts of pixels
+# (or values derived from them), every other column describes the bin.
+_count_fields = ("Pixels", "CumulativePixels", "Percent", "CumulativePercent")
+
 
 class Histogram(collections.abc.Sequence):
     """Reads the output from ISIS hist and provides it as a sequence.
@@ -28,21 +34,81 @@ class Histogram(collections.abc.Sequence):
 
     def __init__(self, histinfo):
         self.histinfo = histinfo
+        self.dictionary, self.headers, self.hist_list = self._parse_histinfo(histinfo)
+
+    @classmethod
+    def from_text(cls, text: str):
+        """Returns a Histogram from the *text* output of ISIS ``hist``."""
+        return cls._from_parsed(text, cls._parse_or_raise(cls.parse, text))
+
+    @classmethod
+    def from_file(cls, path: os.PathLike):
+        """Returns a Histogram from the file at *path*, which must have
+        been written by ISIS ``hist``."""
+        with open(path, "r") as f:
+            return cls._from_parsed(path, cls._parse_or_raise(cls.parse_stream, f))
 
+    @classmethod
+    def from_cube(cls, cube: os.PathLike, **kwargs):
+        """Returns a Histogram from running ISIS ``hist`` on *cube*.
+
+        Any *kwargs* are passed on to :func:`.hist_k`.
+        """
+        return cls._from_parsed(cube, cls.parse(hist_k(cube, **kwargs)))
+
+    @classmethod
+    def _from_parsed(cls, histinfo, parsed: tuple):
+        h = cls.__new__(cls)
+        h.histinfo = histinfo
+        h.dictionary, h.headers, h.hist_list = parsed
+        return h
+
+    @staticmethod
+    def _parse_or_raise(parser, histinfo) -> tuple:
         try:
-            (self.dictionary, self.headers, self.hist_list) = self.parse(histinfo)
-        except StopIteration:
-            try:
-                (self.dictionary, self.headers, self.hist_list) = self.parse(
-                    hist_k(histinfo)
-                )
-            except subprocess.CalledProcessError:
-                with open(histinfo, "r") as f:
-                    (
-                        self.dictionary,
-                        self.headers,
-                        self.hist_list,
-                    ) = self.parse(f.read())
+            return parser(histinfo)
+        except StopIteration as err:
+            raise ValueError(f"{histinfo} does not contain hist output.") from err
+
+    @staticmethod
+    def _parse_histinfo(histinfo) -> tuple:
+        """Determines what kind of thing *histinfo* is, and returns the
+        parsed histogram from it.
+
+        The output of ISIS ``hist`` always spans many lines, so a string
+        with a newline is parsed as text, and an open file object
+        or any other iterable is parsed as lines.  Otherwise *histinfo*
+        is a path, and the beginning of the file is examined: a ``hist``
+        file starts with a "Cube:" line, but an ISIS cube label starts
+        with an "Object = IsisCube" line.  Only if the file is not a
+        ``hist`` file is ISIS ``hist`` run on it.
+
+        If *histinfo* is a path to a file that does not exist, and it
+        has no ISIS attributes (like ``foo.cub+2``), FileNotFoundError is
+        raised, rather than running ISIS ``hist``.
+        """
+        if isinstance(histinfo, str) and "\n" in histinfo:
+            return Histogram._parse_or_raise(Histogram.parse, histinfo)
+
+        if not isinstance(histinfo, (str, os.PathLike)):
+            return Histogram._parse_or_raise(Histogram.parse_stream, histinfo)
+
+        try:
+            with open(histinfo, "r") as f:
+                first = f.readline(256)
+                if ":" in first and "=" not in first:
+                    return Histogram._parse_or_raise(
+                        Histogram.parse_stream, itertools.chain((first,), f)
+                    )
+        except FileNotFoundError:
+            if "+" not in os.path.basename(histinfo):
+                raise
+        except (OSError, UnicodeDecodeError):
+            # Not a readable text file, but it could still be something
+            # that ISIS can read, like a cube with attributes (foo.cub+2).
+            pass
+
+        return Histogram.parse(hist_k(histinfo))
 
     def __str__(self):
         return str(self.dictionary)
@@ -68,6 +134,17 @@ class Histogram(collections.abc.Sequence):
         else:
             return item in self.hist_list
 
+    def __add__(self, other):
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        return self.merge((self, other))
+
+    def __radd__(self, other):
+        # This allows sum() to be used on an iterable of Histograms.
+        if other == 0:
+            return self
+        return NotImplemented
+
     def keys(self):
         """Gets the keys from the initial portion of the hist output file.
 
@@ -79,6 +156,189 @@ class Histogram(collections.abc.Sequence):
         """Gets the values from the initial portion of the hist output file."""
         return self.dictionary.values()
 
+    @classmethod
+    def merge(cls, histograms):
+        """Returns a new Histogram which is the exact combination of the
+        Histograms in the *histograms* iterable.
+
+        The elements of *histograms* can be Histogram objects, or anything
+        that a Histogram can be created from (like the text returned from
+        :func:`.hist_k`), so the results of running ``hist`` on many files
+        in a pool of workers can be reduced like this::
+
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                texts = executor.map(isis.hist_k, cubes)
+            h = isis.Histogram.merge(texts)
+
+        The same thing can be accomplished with ``h1 + h2`` or
+        ``sum(histograms)``.
+
+        The pixel counts of bins with the same DN values are summed (so
+        bins of "1" and "1.0" are the same bin), and the cumulative and
+        percent columns are recomputed, or are zero if there are no pixels.  The bins of
+        the histograms must be aligned, so if the histograms are from
+        different files, you should run ``hist`` with the same
+        MINIMUM=, MAXIMUM=, and NBINS= values.  If the hist output has
+        MinInclusive and MaxExclusive columns, and the bins of different
+        histograms overlap without being identical, a ValueError will be
+        raised.
+
+        The pixel counts in the dictionary portion are summed, the
+        Minimum and Maximum are the extremes of all of the histograms,
+        and the Average, Std Deviation, and Variance are combined from
+        the Valid Pixels, Average, and Variance of each histogram.
+        The Median and Mode are determined from the merged bins, and
+        the Skew is then recomputed from them in the way that ISIS does.
+        """
+        hists = list(h if isinstance(h, Histogram) else cls(h) for h in histograms)
+        if len(hists) == 0:
+            raise ValueError("There must be at least one Histogram to merge.")
+
+        fieldnames = hists[0].headers
+        for h in hists[1:]:
+            if h.headers != fieldnames:
+                raise ValueError(
+                    f"The fields of the histograms differ: {fieldnames} and "
+                    f"{h.headers}"
+                )
+        bin_fields = [f for f in fieldnames if f not in _count_fields]
+
+        # Bins are keyed by their values, so that "1" and "1.0" are the
+        # same bin, but are written as they were first given.
+        bins = dict()
+        labels = dict()
+        for h in hists:
+            for row in h:
+                strings = tuple(getattr(row, f) for f in bin_fields)
+                key = tuple(float(x) for x in strings)
+                labels.setdefault(key, strings)
+                bins[key] = bins.get(key, 0) + int(row.Pixels)
+
+        keys = sorted(bins.keys())
+        if "MinInclusive" in bin_fields and "MaxExclusive" in bin_fields:
+            min_i = bin_fields.index("MinInclusive")
+            max_i = bin_fields.index("MaxExclusive")
+            for prev, this in zip(keys, keys[1:]):
+                if prev[max_i] > this[min_i]:
+                    raise ValueError(
+                        f"The histogram bins are not aligned, {labels[prev]} "
+                        f"overlaps {labels[this]}."
+                    )
+
+        def bin_value(key):
+            if "DN" in bin_fields:
+                return key[bin_fields.index("DN")]
+            else:
+                return (key[min_i] + key[max_i]) / 2
+
+        total = sum(bins.values())
+        rows = list()
+        cumulative = 0
+        median = None
+        mode = None
+        for k in keys:
+            count = bins[k]
+            cumulative += count
+            if median is None and total and cumulative * 2 >= total:
+                median = bin_value(k)
+            if mode is None or count > bins[mode]:
+                mode = k
+            values = dict(zip(bin_fields, labels[k]))
+            values.update(
+                Pixels=count,
+                CumulativePixels=cumulative,
+                Percent="{:g}".format(100 * count / total if total else 0),
+                CumulativePercent="{:g}".format(
+                    100 * cumulative / total if total else 0
+                ),
+            )
+            rows.append(",".join(str(values[f]) for f in fieldnames))
+
+        info = cls._merge_info([h.dictionary for h in hists])
+        if median is not None:
+            for k, v in (("Median", median), ("Mode", bin_value(mode))):
+                if k in info:
+                    info[k] = v
+        try:
+            info["Skew"] = (
+                3 * (info["Average"] - info["Median"]) / info["Std Deviation"]
+            )
+        except (KeyError, TypeError, ZeroDivisionError):
+            pass
+
+        lines = list()
+        for k, v in info.items():
+            if isinstance(v, float):
+                v = "{:.15g}".format(v)
+            lines.append("{:<16}{}".format(k + ":", v))
+        lines.extend(["", ""])
+        lines.append(",".join(fieldnames))
+        lines.extend(rows)
+
+        return cls.from_text("\n".join(lines))
+
+    @staticmethod
+    def _merge_info(dictionaries: list) -> dict:
+        """Returns a dictionary which combines the values in the
+        *dictionaries*, which are the name:value portions of hist output.
+
+        Count values are summed, the extrema are found, and the moments
+        are combined.  Any other values are retained if they are the
+        same in each dictionary, or are joined with spaces if they are not.
+        """
+        info = dict()
+        for k in dictionaries[0].keys():
+            values = list(d[k] for d in dictionaries if k in d)
+            if k.endswith("Pixels"):
+                info[k] = sum(int(v) for v in values)
+            else:
+                unique = list(dict.fromkeys(values))
+                info[k] = " ".join(unique)
+
+        # Only histograms with valid pixels contribute to the statistics.
+        moments = list()
+        for d in dictionaries:
+            try:
+                n = int(d["Valid Pixels"])
+                if n > 0:
+                    mean = float(d["Average"])
+                    if "Variance" in d:
+                        var = float(d["Variance"])
+                    else:
+                        var = float(d["Std Deviation"]) ** 2
+                    moments.append(
+                        (n, mean, var, float(d["Minimum"]), float(d["Maximum"]))
+                    )
+            except (KeyError, ValueError):
+                continue
+
+        if len(moments) > 0:
+            # This is the parallel algorithm of Chan et al. for combining
+            # the means and sums of squared differences of each set.
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            for n, m, var, _, _ in moments:
+                delta = m - mean
+                new_count = count + n
+                mean += delta * n / new_count
+                m2 += var * (n - 1) + delta**2 * count * n / new_count
+                count = new_count
+
+            # ISIS reports the sample variance.
+            variance = m2 / (count - 1) if count > 1 else 0.0
+            for k, v in (
+                ("Average", mean),
+                ("Std Deviation", math.sqrt(variance)),
+                ("Variance", variance),
+                ("Minimum", min(x[3] for x in moments)),
+                ("Maximum", max(x[4] for x in moments)),
+            ):
+                if k in info:
+                    info[k] = v
+
+        return info
+
     @staticmethod
     def parse(histinfo: str) -> tuple:
         """Takes a string (expecting the output of ISIS ``hist``), and
@@ -137,19 +397,39 @@ class Histogram(collections.abc.Sequence):
         Third, it reads the lines with ``n`` and stores them as
         ``namedtuples`` in the returned list.
         """
-        d = dict()
-        hist_rows = []
-        for line in filter(lambda x: ":" in x, str(histinfo).splitlines()):
-            (k, v) = line.split(":")
-            # d[k.strip()] = v.strip()
-            d.setdefault(k.strip(), v.strip())
+        return Histogram.parse_stream(str(histinfo).splitlines())
 
-        reader = csv.reader(filter(lambda x: "," in x, str(histinfo).splitlines()))
-        fieldnames = next(reader)
+    @staticmethod
+    def parse_stream(lines) -> tuple:
+        """Takes an iterable of lines (expecting the output of ISIS ``hist``),
+        like an open file object or the stdout of a subprocess, and parses
+        the output in a single pass.
+
+        The same three-element namedtuple that :meth:`parse` describes is
+        returned.  The lines are consumed one at a time, so the text
+        never needs to be entirely held in memory.  Until the line with the
+        field names is found, lines with a colon are read into the
+        dictionary, and after it, the comma-separated lines are stored
+        as the ``HistRow`` namedtuples.
+
+        If the field names are never found, StopIteration is raised.
+        """
+        d = dict()
+        lines = iter(lines)
+        for line in lines:
+            if ":" in line:
+                k, sep, v = line.partition(":")
+                d.setdefault(k.strip(), v.strip())
+            elif "," in line:
+                fieldnames = next(csv.reader((line,)))
+                break
+        else:
+            raise StopIteration("The field names of the histogram were not found.")
 
         HistRow = collections.namedtuple("HistRow", fieldnames)
-        for row in map(HistRow._make, reader):
-            hist_rows.append(row)
+        hist_rows = list(
+            map(HistRow._make, csv.reader(filter(lambda x: "," in x, lines)))
+        )
 
         HistParsed = collections.namedtuple(
             "HistParsed", ["info", "fieldnames", "data"]
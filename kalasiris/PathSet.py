@@ -27,6 +27,28 @@ delete them, like so::
     isis.final_step(second, to=output_p)
 
     to_delete.unlink()
+
+Rather than waiting until the end, each path can instead be deleted
+as soon as the last of the programs that need it is done, by giving
+the number of *consumers* when it is added, and then calling
+:meth:`.PathSet.release` when each of them is done with it::
+
+    to_delete = isis.PathSet(background=True)
+
+    isis_cub = to_delete.add(input_p.with_suffix('.cub'), consumers=2)
+    isis.lorri2isis(input_fits, to=isis_cub)
+
+    isis.some_program(isis_cub, to=output_p)
+    to_delete.release(isis_cub)
+
+    isis.stats(isis_cub)
+    to_delete.release(isis_cub)  # isis_cub is deleted now.
+
+    reclaimed_bytes = to_delete.wait()
+
+If the PathSet is created with *background* set to True, the files
+are deleted by a separate thread, so that your program does not have
+to wait for them to be deleted.
 """
 
 # Copyright 2019-2020, Ross A. Beyer (rbeyer@seti.org)
@@ -35,13 +57,19 @@ delete them, like so::
 # The AUTHORS file and the LICENSE file are at the
 # top level of this library.
 
+import queue
+import threading
 from pathlib import Path
 
 
 class PathSet(set):
-    """A class for containing a set of :class:`pathlib.Path` objects."""
+    """A class for containing a set of :class:`pathlib.Path` objects.
 
-    def __init__(self, iterable=None):
+    If *background* is True, the files are deleted by a separate
+    thread, see :meth:`.PathSet.wait`.
+    """
+
+    def __init__(self, iterable=None, background=False):
         if iterable:
             for value in iterable:
                 if not isinstance(value, Path):
@@ -49,17 +77,120 @@ class PathSet(set):
             super().__init__(iterable)
         else:
             super().__init__()
-
-    def add(self, elem) -> Path:
-        """This variation on add() returns the element."""
+        self.background = background
+        self.reclaimed = 0
+        self._consumers = dict()
+        self._lock = threading.Lock()
+        self._queue = None
+        self._errors = list()
+
+    def add(self, elem, consumers: int = None) -> Path:
+        """This variation on add() returns the element.
+
+        If *consumers* is given, the element will be removed from the
+        PathSet and deleted once :meth:`.PathSet.release` has been
+        called that many times for it.
+        """
         if not isinstance(elem, Path):
             raise TypeError("only accepts pathlib.Path objects")
-        if elem in self:
-            raise ValueError(f"The {elem} object is already a member of the PathSet.")
-        super().add(elem)
+        if consumers is not None and consumers < 1:
+            raise ValueError(f"The number of consumers, {consumers}, must be positive.")
+        with self._lock:
+            if elem in self:
+                raise ValueError(
+                    f"The {elem} object is already a member of the PathSet."
+                )
+            super().add(elem)
+            if consumers is not None:
+                self._consumers[elem] = consumers
         return elem
 
-    def unlink(self):
-        """Just runs Path.unlink() on all members."""
-        for p in self:
-            p.unlink()
+    def consumers(self, elem: Path):
+        """Returns the number of consumers of *elem* that have not yet
+        released it, or None if it was not added with any."""
+        return self._consumers.get(elem)
+
+    def release(self, elem: Path, missing_ok=False) -> bool:
+        """Indicates that one of the consumers of *elem* is done with it.
+
+        If that was the last one, *elem* is removed from the PathSet,
+        deleted, and True is returned.  If *missing_ok* is False, and
+        the file does not exist, FileNotFoundError is raised (by
+        :meth:`.PathSet.wait` if the PathSet deletes in the
+        background).
+        """
+        with self._lock:
+            if elem not in self._consumers:
+                raise ValueError(f"The {elem} object has no consumers in the PathSet.")
+            self._consumers[elem] -= 1
+            if self._consumers[elem] > 0:
+                return False
+            del self._consumers[elem]
+            self.discard(elem)
+
+        self._delete([elem], missing_ok)
+        return True
+
+    def unlink(self, missing_ok=False):
+        """Just runs Path.unlink() on all members.
+
+        If *missing_ok* is True, members that don't exist are ignored,
+        otherwise FileNotFoundError is raised.  Returns the number of
+        bytes that were reclaimed, or None if the PathSet deletes in the
+        background, in which case see :meth:`.PathSet.wait`.
+        """
+        return self._delete(list(self), missing_ok)
+
+    def wait(self) -> int:
+        """Waits until the files being deleted in the background have
+        been deleted, and returns the total number of bytes that have
+        been reclaimed by deleting files from this PathSet.
+
+        If any of the deletions failed, the first of those exceptions
+        is raised.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        if self._errors:
+            err = self._errors[0]
+            self._errors.clear()
+            raise err
+        return self.reclaimed
+
+    def _delete(self, paths: list, missing_ok: bool):
+        if not self.background:
+            return self._unlink_paths(paths, missing_ok)
+
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue()
+                threading.Thread(target=self._deleter, daemon=True).start()
+        self._queue.put((paths, missing_ok))
+        return None
+
+    def _deleter(self):
+        # Runs in the background thread.
+        while True:
+            (paths, missing_ok) = self._queue.get()
+            try:
+                self._unlink_paths(paths, missing_ok)
+            except OSError as err:
+                self._errors.append(err)
+            finally:
+                self._queue.task_done()
+
+    def _unlink_paths(self, paths: list, missing_ok: bool) -> int:
+        reclaimed = 0
+        try:
+            for p in paths:
+                try:
+                    size = p.stat().st_size
+                    p.unlink()
+                    reclaimed += size
+                except FileNotFoundError:
+                    if not missing_ok:
+                        raise
+        finally:
+            with self._lock:
+                self.reclaimed += reclaimed
+        return reclaimed
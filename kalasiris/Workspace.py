@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""This module contains the Workspace Class.
+
+Chains of ISIS programs create intermediate cubes which are only read
+by the next program or two in the chain, and then never needed again.
+A :class:`.Workspace` hands out paths for those intermediate files in
+a directory on a fast file system (like ``/dev/shm`` or a local NVMe
+drive), and deletes each of them as soon as the last program that
+needs it is done with it, rather than at the end of the whole chain::
+
+    import kalasiris as isis
+
+    with isis.Workspace(fast='/dev/shm', quota=8 * 2**30) as ws:
+        raw = ws.path('raw.cub')
+        isis.hi2isis('some.img', to=raw)
+
+        cal = ws.path('cal.cub', consumers=2)
+        isis.hical(raw, to=cal)
+        ws.release(raw)
+
+        isis.stats(cal)
+        ws.release(cal)
+        isis.histitch(from1=cal, to='durable/final.cub')
+        ws.release(cal)
+
+The final output is not in the workspace, so it goes wherever you
+want it to.  If the files in the fast directory add up to more than
+the *quota*, any new paths are in the *slow* directory instead, until
+enough of them have been deleted.  When the context is exited, any
+remaining intermediate files and the workspace directories are deleted.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from .PathSet import PathSet
+
+
+def _default_fast() -> Path:
+    """Returns /dev/shm if it is available, or the default temporary
+    directory."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+class Workspace:
+    """A class for handing out the paths of intermediate files, and
+    deleting them when they are no longer needed.
+
+    The intermediate files are in a new directory in *fast*, which
+    defaults to ``/dev/shm`` if it is available, unless the sizes of
+    the intermediate files in it add up to more than *quota* bytes,
+    in which case they are in a new directory in *slow*, which defaults
+    to the default temporary directory.  If *quota* is None, there is
+    no limit.
+
+    The paths are kept in a :class:`.PathSet`, and if *background* is
+    True, they are deleted by a separate thread.
+
+    A Workspace can be used as a context manager, or you can call
+    :meth:`cleanup` when you are done with it.
+    """
+
+    def __init__(self, fast=None, slow=None, quota: int = None, background=False):
+        self.fast = Path(_default_fast() if fast is None else fast)
+        self.slow = Path(tempfile.gettempdir() if slow is None else slow)
+        self.quota = quota
+        self.fast_dir = Path(tempfile.mkdtemp(prefix="kalasiris_", dir=self.fast))
+        self.slow_dir = None
+        self.paths = PathSet(background=background)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+        return False
+
+    def usage(self) -> int:
+        """Returns the number of bytes of the intermediate files that are
+        in the fast directory."""
+        total = 0
+        for p in list(self.paths):
+            if p.parent == self.fast_dir:
+                try:
+                    total += p.stat().st_size
+                except FileNotFoundError:
+                    pass
+        return total
+
+    def path(self, name: str, consumers: int = 1, size: int = 0) -> Path:
+        """Returns the path of an intermediate file with the given *name*.
+
+        The file will be deleted once :meth:`release` has been called
+        *consumers* times for it.  If the *size* in bytes that the file
+        is expected to have is given, it is also considered when
+        deciding whether the file would exceed the *quota*.
+        """
+        with self._lock:
+            if self.quota is None or self.usage() + size <= self.quota:
+                p = self.fast_dir / name
+            else:
+                if self.slow_dir is None:
+                    self.slow_dir = Path(
+                        tempfile.mkdtemp(prefix="kalasiris_", dir=self.slow)
+                    )
+                p = self.slow_dir / name
+
+            if (self.fast_dir / name) in self.paths or (
+                self.slow_dir is not None and (self.slow_dir / name) in self.paths
+            ):
+                raise ValueError(f"The name {name} is already in the Workspace.")
+            self.paths.add(p, consumers=consumers)
+
+        return p
+
+    def release(self, path: Path) -> bool:
+        """Indicates that one of the consumers of *path* is done with it,
+        and deletes it if that was the last one.
+
+        Returns True if the file was (or, in the background, will be)
+        deleted.
+        """
+        return self.paths.release(Path(path), missing_ok=True)
+
+    def cleanup(self):
+        """Deletes all of the intermediate files, and the workspace
+        directories."""
+        self.paths.wait()
+        with self._lock:
+            self.paths.clear()
+            for d in (self.fast_dir, self.slow_dir):
+                if d is not None:
+                    shutil.rmtree(d, ignore_errors=True)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Provides admission control, so that the ISIS programs run by many
+threads, or many Python processes, on a node don't together use more
+memory than it has.
+
+An :class:`.admission.Controller` keeps track of the ISIS programs that
+are running in a small state file, which it locks while reading and
+changing it, so all of the Python processes that use the same file
+share the same limits::
+
+    import kalasiris as isis
+    from kalasiris.admission import Controller
+
+    controller = Controller(
+        classes={'cam2map': 'heavy', 'jigsaw': 'heavy', 'noproj': 'heavy'},
+        caps={'heavy': 2},
+        max_jobs=16,
+    )
+    isis.set_admission_controller(controller)
+    isis.set_spawn_backend('posix_spawn')
+
+Before an ISIS program is run, it waits until there are fewer than
+the cap of programs of its class running, fewer than *max_jobs* in
+total, and the memory that the running programs are expected to use,
+plus that of this one, fits in the *memory* of the node.  A program is
+always admitted if nothing else is running.  The programs that are
+waiting are recorded in the state file, and are admitted in the order
+that they arrived, please see :meth:`.admission.Controller.acquire`.
+
+The memory that a program is expected to use is the largest peak
+resident set size of its previous runs, which are recorded in the
+state file.  Those are only known for the spawn backends that report
+resource usage, please see :mod:`kalasiris.spawn`.
+
+This module uses :func:`fcntl.flock`, so it is not imported by
+``import kalasiris``.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+# Like the kalasiris module, this only imports from the Standard Library.
+import contextlib
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+default_class = "default"
+
+
+def physical_memory() -> int:
+    """Returns the number of bytes of physical memory on this node."""
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def maxrss_bytes(rusage: dict) -> int:
+    """Returns the peak resident set size in bytes from the *rusage*
+    dictionary of a :class:`.spawn.CompletedProcess`, or None."""
+    if rusage is None or "ru_maxrss" not in rusage:
+        return None
+    if sys.platform == "darwin":
+        return rusage["ru_maxrss"]
+    # Everywhere else, it is in kilobytes.
+    return rusage["ru_maxrss"] * 1024
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Admission:
+    """What :meth:`.Controller.admit` provides for each admitted
+    *program*, whose *rusage* should be set to that of the program's
+    run, so that the controller can learn how much memory it uses."""
+
+    def __init__(self, program: str, token: str):
+        self.program = program
+        self.token = token
+        self.rusage = None
+
+
+class Controller:
+    """Admits ISIS programs to run, once doing so wouldn't exceed its
+    limits, which are kept in the state file at *path*, which defaults
+    to one for this user in the default temporary directory.
+
+    The *classes* dictionary maps program names to the names of their
+    classes, and any other programs are in the 'default' class.  The
+    *caps* dictionary maps class names to the most programs of that
+    class that can be running at once, and a class that isn't in it
+    has no limit.  No more than *max_jobs* programs in total can be
+    running at once, if it is not None.
+
+    The programs that are running are expected to use no more than
+    *memory* bytes in total, which defaults to the physical memory of
+    the node.  A program that has no recorded runs is expected to use
+    *default_memory* bytes.  Programs wait for admission by checking
+    again every *poll* seconds.
+    """
+
+    def __init__(
+        self,
+        path: os.PathLike = None,
+        classes: dict = None,
+        caps: dict = None,
+        max_jobs: int = None,
+        memory: int = None,
+        default_memory: int = 0,
+        poll: float = 0.05,
+    ):
+        if path is None:
+            path = Path(tempfile.gettempdir()) / f"kalasiris_admission_{os.getuid()}"
+        self.path = Path(path)
+        self.classes = dict() if classes is None else dict(classes)
+        self.caps = dict() if caps is None else dict(caps)
+        self.max_jobs = max_jobs
+        self.memory = physical_memory() if memory is None else memory
+        self.default_memory = default_memory
+        self.poll = poll
+
+    @contextlib.contextmanager
+    def _state(self):
+        # Yields the state, locked, and writes it back when done.
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                text = f.read()
+                try:
+                    state = json.loads(text) if text else dict()
+                except ValueError:
+                    state = dict()
+                state.setdefault("running", dict())
+                # In the order that they arrived:
+                state.setdefault("waiting", dict())
+                state.setdefault("maxrss", dict())
+                yield state
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def class_of(self, program: str) -> str:
+        """Returns the name of the class of *program*."""
+        return self.classes.get(program, default_class)
+
+    def estimate(self, program: str) -> int:
+        """Returns the number of bytes *program* is expected to use."""
+        with self._state() as state:
+            return state["maxrss"].get(program, self.default_memory)
+
+    @staticmethod
+    def _prune(state: dict):
+        # Programs from processes that died without releasing are dropped.
+        for k in ("running", "waiting"):
+            for token in list(state[k].keys()):
+                if not _alive(state[k][token]["pid"]):
+                    del state[k][token]
+
+    def _blocker(self, state: dict, program: str) -> str:
+        # Returns what keeps program from being admitted now: "class",
+        # "jobs", or "memory", or None if it can be.
+        running = state["running"]
+        if len(running) == 0:
+            return None
+
+        cls = self.class_of(program)
+        if cls in self.caps:
+            n = sum(1 for r in running.values() if r["class"] == cls)
+            if n >= self.caps[cls]:
+                return "class"
+
+        if self.max_jobs is not None and len(running) >= self.max_jobs:
+            return "jobs"
+
+        expected = sum(r["memory"] for r in running.values())
+        if expected + state["maxrss"].get(program, self.default_memory) > self.memory:
+            return "memory"
+        return None
+
+    def _ahead(self, state: dict, token: str) -> bool:
+        # Returns True if a program that has waited longer than the one
+        # for token must be admitted first.  Those that are only waiting
+        # for their class's cap don't hold up programs of other classes.
+        cls = state["waiting"][token]["class"]
+        for t, w in state["waiting"].items():
+            if t == token:
+                return False
+            if w["class"] == cls or self._blocker(state, w["program"]) != "class":
+                return True
+        return False
+
+    def acquire(self, program: str) -> Admission:
+        """Waits until *program* can be admitted, and returns its
+        :class:`.admission.Admission`, which must be given to
+        :meth:`release` once the program is done.
+
+        The programs that are waiting are admitted in the order that
+        they arrived, except that one which is only waiting for the cap
+        of its class doesn't hold up programs of other classes, so a
+        stream of small programs can't keep a large one waiting.
+        """
+        token = uuid.uuid4().hex
+        entry = dict(
+            program=program,
+            pid=os.getpid(),
+            memory=None,
+            **{"class": self.class_of(program)},
+        )
+        try:
+            while True:
+                with self._state() as state:
+                    self._prune(state)
+                    state["waiting"].setdefault(token, entry)
+                    if not self._ahead(state, token) and (
+                        self._blocker(state, program) is None
+                    ):
+                        del state["waiting"][token]
+                        entry["memory"] = state["maxrss"].get(
+                            program, self.default_memory
+                        )
+                        state["running"][token] = entry
+                        return Admission(program, token)
+                time.sleep(self.poll)
+        except BaseException:
+            with self._state() as state:
+                state["waiting"].pop(token, None)
+                state["running"].pop(token, None)
+            raise
+
+    def release(self, admission: Admission):
+        """Indicates that the program that *admission* was for is done,
+        and records its peak resident set size, if its *rusage* is set."""
+        with self._state() as state:
+            state["running"].pop(admission.token, None)
+            rss = maxrss_bytes(admission.rusage)
+            if rss is not None:
+                state["maxrss"][admission.program] = max(
+                    rss, state["maxrss"].get(admission.program, 0)
+                )
+
+    @contextlib.contextmanager
+    def admit(self, program: str):
+        """A context manager which waits until *program* can be admitted,
+        provides its :class:`.admission.Admission`, and releases it on
+        exit."""
+        admission = self.acquire(program)
+        try:
+            yield admission
+        finally:
+            self.release(admission)
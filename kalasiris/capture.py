@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Many ISIS programs only write text, to the file given by their
+``TO=`` parameter.  If all you want is that text, having the program
+write it to a file on disk, and then reading it back in, is a
+needless round trip.
+
+The :class:`.capture.TextSink` context manager provides a path that can
+be given to an ISIS program as its ``TO=`` parameter, but which is not
+a file on disk, and whose contents can be read once the program is
+done::
+
+    import kalasiris as isis
+
+    with isis.capture.TextSink() as sink:
+        isis.hist('some.cub', to=sink.path)
+        hist_text = sink.read()
+
+The path is provided in one of these ways, the first of which is the
+default, if it is available on your system:
+
+memfd
+    The path is ``/proc/<pid>/fd/<N>``, which refers to an anonymous
+    file in memory, created by :func:`os.memfd_create` (Linux only).
+
+fifo
+    The path is a named pipe, created by :func:`os.mkfifo`, in a
+    temporary directory, and whatever is written to it is read by
+    a separate thread.
+
+file
+    The path is a regular temporary file, which is read once the program
+    is done and then deleted, this is what kalasiris has always done.
+
+The :func:`.capture.wrap` function adapts any of the kalasiris ISIS
+program functions, so that rather than a
+:class:`subprocess.CompletedProcess`, they return what was written
+to ``TO=``, optionally parsed::
+
+    campt = isis.capture.wrap(isis.campt, parser='pvl')
+    label = campt('some.cub', sample=10, line=20)
+
+The default can be changed with :func:`.capture.set_default_mode`, which
+you might need to do if a program needs to seek within its output.  If
+a program adds an extension to an output path that doesn't have one,
+give the :class:`.capture.TextSink` that *suffix*.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import functools
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+modes = ("memfd", "fifo", "file")
+
+_default_mode = None
+
+
+def available_modes() -> list:
+    """Returns a list of the *modes* that can be used on this system, in
+    order of preference."""
+    m = list()
+    if hasattr(os, "memfd_create") and os.path.isdir(f"/proc/{os.getpid()}/fd"):
+        m.append("memfd")
+    if hasattr(os, "mkfifo"):
+        m.append("fifo")
+    m.append("file")
+    return m
+
+
+def set_default_mode(mode=None):
+    """Sets the mode that :class:`.capture.TextSink` uses when it isn't
+    given one.
+
+    The *mode* must be one of 'memfd', 'fifo', or 'file', and a
+    ValueError is raised if it can't be used on this system.  If *mode*
+    is None, the first of the :func:`.capture.available_modes` is used.
+    """
+    global _default_mode
+    if mode is not None and mode not in available_modes():
+        raise ValueError(
+            f"The mode {mode} is not one of those available on this system: "
+            f"{available_modes()}"
+        )
+    _default_mode = mode
+
+
+def get_default_mode() -> str:
+    """Returns the mode that :class:`.capture.TextSink` uses when it
+    isn't given one."""
+    if _default_mode is None:
+        return available_modes()[0]
+    return _default_mode
+
+
+class TextSink:
+    """A context manager whose *path* attribute can be given to a program
+    to write text to, and whose :meth:`read` method returns that text
+    once the program is done.
+
+    If *mode* is not given, the mode from
+    :func:`.capture.get_default_mode` is used.  Whatever is backing
+    the *path* is removed when the context is exited.
+
+    Some programs add an extension to an output path that does not
+    have one.  If a *suffix* (like '.txt') is given, *path* will end
+    with it, and since a 'memfd' path cannot, the 'fifo' mode is used
+    instead.
+    """
+
+    def __init__(self, mode=None, suffix=None):
+        if mode is None:
+            mode = get_default_mode()
+        if mode not in modes:
+            raise ValueError(f"The mode {mode} is not one of {modes}.")
+        if suffix and mode == "memfd":
+            mode = "fifo"
+        self.mode = mode
+        self.suffix = suffix
+        self.path = None
+        self._fd = None
+        self._writer_fd = None
+        self._dir = None
+        self._thread = None
+        self._chunks = list()
+
+    def __enter__(self):
+        if self.mode == "memfd":
+            self._fd = os.memfd_create("kalasiris_capture")
+            # The program will be a different process, so /proc/self/fd
+            # would not be our file descriptor.
+            self.path = Path(f"/proc/{os.getpid()}/fd/{self._fd}")
+        elif self.mode == "fifo":
+            self._dir = tempfile.TemporaryDirectory()
+            self.path = Path(self._dir.name) / f"capture{self.suffix or ''}"
+            os.mkfifo(self.path)
+            # Opening the read end without blocking, and then holding the
+            # write end open ourselves, means that neither open can block,
+            # and that the reader doesn't see the end of the file until we
+            # close our write end, however many times the program opens
+            # and closes the fifo.
+            self._fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+            os.set_blocking(self._fd, True)
+            self._writer_fd = os.open(self.path, os.O_WRONLY)
+            self._thread = threading.Thread(target=self._drain, daemon=True)
+            self._thread.start()
+        else:
+            (self._fd, p) = tempfile.mkstemp(suffix=self.suffix)
+            self.path = Path(p)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _drain(self):
+        # Reads whatever is written to the fifo until all of the writers,
+        # including our own, have closed it.
+        while True:
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                break
+            self._chunks.append(chunk)
+
+    def _stop_draining(self):
+        if self._thread is None:
+            return
+        os.close(self._writer_fd)
+        self._writer_fd = None
+        self._thread.join()
+        self._thread = None
+
+    def read_bytes(self) -> bytes:
+        """Returns everything that has been written to *path* as bytes.
+
+        For the 'fifo' mode, this must only be called once the program
+        writing to *path* is done.
+        """
+        if self.mode == "fifo":
+            self._stop_draining()
+            return b"".join(self._chunks)
+
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        chunks = list()
+        while True:
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def read(self) -> str:
+        """Returns everything that has been written to *path* as a
+        string."""
+        return self.read_bytes().decode()
+
+    def close(self):
+        """Removes whatever was backing *path*."""
+        if self.mode == "fifo":
+            self._stop_draining()
+            if self._dir is not None:
+                self._dir.cleanup()
+                self._dir = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self.mode == "file" and self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+def _parse_pvl(text: str):
+    import pvl
+
+    return pvl.loads(text)
+
+
+# The parsers that can be named in wrap():
+parsers = {"text": None, "pvl": _parse_pvl}
+
+
+def wrap(program, parser=None, mode=None, suffix=None):
+    """Returns a function that runs *program* and returns the text that
+    it writes to its TO= parameter, rather than the usual
+    :class:`subprocess.CompletedProcess`.
+
+    The *program* is one of the kalasiris ISIS program functions, like
+    ``isis.campt``, and the returned function takes the same arguments.
+    If a TO= argument is given, the file is written and then read, but
+    otherwise the TO= parameter is a :class:`.capture.TextSink` with
+    the given *mode* and *suffix*, which is removed when done, whether
+    the program succeeds or not.  Since each call has its own sink, the
+    returned function can be called concurrently, from many threads.
+
+    The text is returned as a string, unless *parser* is given, in
+    which case the result of calling it on the text is returned.
+    The *parser* can be a callable, or one of the names in
+    :data:`.capture.parsers`: 'text' returns the string and 'pvl'
+    parses it with :func:`pvl.loads` (which requires the pvl library).
+    """
+    if parser in parsers:
+        parser = parsers[parser]
+    elif parser is not None and not callable(parser):
+        raise ValueError(
+            f"The parser {parser} is not callable, nor one of {list(parsers.keys())}."
+        )
+
+    @functools.wraps(program)
+    def capture_fn(*args, **kwargs):
+        to_pathlike = None
+        for k, v in kwargs.items():
+            if "to" == k or "to_" == k:
+                to_pathlike = v
+
+        if to_pathlike:
+            program(*args, **kwargs)
+            with open(to_pathlike, "r") as f:
+                text = f.read()
+        else:
+            with TextSink(mode=mode, suffix=suffix) as sink:
+                kwargs["to"] = sink.path
+                program(*args, **kwargs)
+                text = sink.read()
+
+        return text if parser is None else parser(text)
+
+    return capture_fn
@@ -34,7 +34,9 @@ in the image you've read into img_arr above, you can do this::
 # The AUTHORS file and the LICENSE file are at the
 # top level of this library.
 
+import functools
 import os
+import re
 import struct
 from collections import abc
 from typing import Tuple
@@ -45,6 +47,82 @@ import kalasiris as isis
 data_sizes = {"Integer": 4, "Double": 8, "Real": 4, "Text": 1}
 data_formats = {"Integer": "i", "Double": "d", "Real": "f"}
 
+# These map the Core Pixels Type and ByteOrder values in an ISIS cube
+# label to numpy dtype strings.
+pixel_types = {
+    "UnsignedByte": "u1",
+    "SignedWord": "i2",
+    "UnsignedWord": "u2",
+    "SignedInteger": "i4",
+    "UnsignedInteger": "u4",
+    "Real": "f4",
+    "Double": "f8",
+}
+byte_orders = {"Lsb": "<", "Msb": ">"}
+
+# The line which ends the label of an ISIS cube.
+_end_re = re.compile(rb"^End[ \t]*\r?$", re.MULTILINE)
+
+
+def get_label_text(cube_path: os.PathLike, chunk_size=65536) -> str:
+    """Returns the text of the label at the start of the ISIS cube at
+    *cube_path*, up to and including its final End line.
+
+    Only the label is read from the file, in blocks of *chunk_size*
+    bytes, rather than the whole file.  If there is no End line, all of
+    the text in the file is returned.
+    """
+    buffer = b""
+    with open(cube_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # Only search from the start of the last line that was read.
+            start = buffer.rfind(b"\n") + 1
+            buffer += chunk
+            match = _end_re.search(buffer, start)
+            if match:
+                buffer = buffer[: match.end()]
+                break
+
+    return buffer.partition(b"\0")[0].decode("latin_1")
+
+
+def load_label(cube_path: os.PathLike, strings=False):
+    """Returns the label of the ISIS cube at *cube_path* as parsed by
+    the pvl library, which is required.
+
+    Unlike :func:`pvl.load`, only the label is read from the file.  If
+    *strings* is True, rather than being converted to Python types,
+    the values in the returned label are the strings that are in
+    the label (with any quotes and units removed), which are what
+    ISIS ``getkey`` would return.
+    """
+    import pvl
+
+    decoder = _string_decoder_class()() if strings else None
+
+    return pvl.loads(get_label_text(cube_path), decoder=decoder)
+
+
+@functools.lru_cache(maxsize=None)
+def _string_decoder_class():
+    """Returns a subclass of the pvl library's OmniDecoder which leaves
+    values as the strings in the label, so that it is only defined once,
+    but the pvl library is only imported when needed."""
+    import pvl
+
+    class StringDecoder(pvl.decoder.OmniDecoder):
+        def decode_simple_value(self, value: str):
+            v = super().decode_simple_value(value)
+            return v if isinstance(v, str) else str(value)
+
+        def decode_quantity(self, value, unit):
+            return value
+
+    return StringDecoder
+
 
 def _get_start_size(d: dict) -> Tuple[int, int]:
     """Returns a tuple of ints that represent the true start byte and size
@@ -426,3 +504,84 @@ def overwrite_table(cube_path: os.PathLike, table_name: str, table: dict):
             ImportWarning,
         )
         raise
+
+
+def pixel_blocks(cube_path: os.PathLike, band=1, label=None, lines=None, samples=None):
+    """Generator that yields the pixels of the *band* (1-based) of the
+    ISIS cube at *cube_path* as consecutive two-dimensional numpy arrays,
+    each of which contains all of the samples for a block of lines.
+
+    The cube file is memory-mapped, so only the pixels in each block
+    are read from the file, and the values are the raw pixel values
+    in the file: special pixels are present, and the Base and
+    Multiplier in the label have not been applied.
+
+    If the cube label has already been read by the pvl library, it
+    can be provided as *label*, otherwise :func:`.cube.load_label` will
+    be used to read it.  The numpy library is required.
+
+    For BandSequential cubes, each block contains *lines* lines (by
+    default, enough lines to have about a million pixels).  For Tile
+    cubes, each block is one row of tiles, and *lines* is ignored.
+
+    If *samples* is a :class:`slice` of the (0-based) samples, each
+    block only has those samples, and for Tile cubes, only the tiles
+    that contain them are read.
+    """
+    import numpy as np
+
+    if label is None:
+        label = load_label(cube_path)
+
+    core = label["IsisCube"]["Core"]
+    nsamples = int(core["Dimensions"]["Samples"])
+    nlines = int(core["Dimensions"]["Lines"])
+    bands = int(core["Dimensions"]["Bands"])
+    if not 1 <= band <= bands:
+        raise IndexError(f"Band {band} is not in {cube_path}, it has {bands} bands.")
+    if samples is None:
+        samples = slice(None)
+    (s_start, s_stop, s_step) = samples.indices(nsamples)
+    if s_step != 1:
+        raise ValueError(f"The samples slice ({samples}) must have a step of 1.")
+    s_stop = max(s_start, s_stop)
+
+    dtype = np.dtype(
+        byte_orders[core["Pixels"]["ByteOrder"]] + pixel_types[core["Pixels"]["Type"]]
+    )
+    start = int(core["StartByte"]) - 1
+
+    if core["Format"] == "Tile":
+        tile_s = int(core["TileSamples"])
+        tile_l = int(core["TileLines"])
+        # The tiles cover the whole band, even if they must extend past it.
+        tile_cols = -(-nsamples // tile_s)
+        tile_rows = -(-nlines // tile_l)
+        mm = np.memmap(
+            cube_path,
+            dtype=dtype,
+            mode="r",
+            offset=start,
+            shape=(bands, tile_rows, tile_cols, tile_l, tile_s),
+        )
+        # Only the columns of tiles with the samples are read.
+        (c_start, c_stop) = (s_start // tile_s, -(-s_stop // tile_s))
+        offset = c_start * tile_s
+        for r in range(tile_rows):
+            tiles = mm[band - 1, r, c_start:c_stop]
+            block = tiles.transpose(1, 0, 2).reshape(tile_l, -1)
+            yield block[
+                : min(tile_l, nlines - r * tile_l), s_start - offset : s_stop - offset
+            ]
+    else:
+        mm = np.memmap(
+            cube_path,
+            dtype=dtype,
+            mode="r",
+            offset=start,
+            shape=(bands, nlines, nsamples),
+        )
+        if lines is None:
+            lines = max(1, 2**20 // nsamples)
+        for i in range(0, nlines, lines):
+            yield mm[band - 1, i : i + lines, s_start:s_stop]
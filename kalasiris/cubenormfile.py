@@ -7,6 +7,10 @@ the :class:`.cubenormfile.Dialect` object will be able to read the text
 output of ``cubenorm``, but to write out a file that ``cubenorm`` will
 read in, you will need to use the :class:`.cubenormfile.writer` or
 :class:`.cubenormfile.DictWriter` classes.
+
+If you have the numpy library, :func:`.cubenormfile.read_columns` and
+:func:`.cubenormfile.iter_columns` will read those files directly into
+numpy arrays, which is much faster for large files.
 """
 
 # Copyright 2019-2020, Ross A. Beyer (rbeyer@seti.org)
@@ -16,6 +20,8 @@ read in, you will need to use the :class:`.cubenormfile.writer` or
 # top level of this library.
 
 import csv
+import itertools
+import os
 
 # Establish the allowable cubenorm fieldnames and their character widths.
 fieldnames = (
@@ -37,6 +43,12 @@ for n in fieldnames:
 fieldwidth["Band"] = 8
 fieldwidth["RowCol"] = 8
 
+# The fields that are integers, the others are floats.
+_int_fields = {"Band", "RowCol", "ValidPoints"}
+
+# The format of a whole row, so that it only needs to be built once.
+_row_format = "".join("{:>" + str(fieldwidth[n]) + "}" for n in fieldnames) + "\n"
+
 
 class Dialect(csv.Dialect):
     """A :class:`csv.Dialect` for the output of the ISIS
@@ -58,17 +70,51 @@ class writer:
         self.file_object = f
 
     def writerow(self, row):
-        line = ""
-        for name, elem in zip(fieldnames, row):
-            right_aligned = "{:>" + str(fieldwidth[name]) + "}"
-            line += right_aligned.format(elem)
+        row = tuple(row)
+        if len(row) == len(fieldnames):
+            self.file_object.write(_row_format.format(*row))
+        else:
+            line = ""
+            for name, elem in zip(fieldnames, row):
+                right_aligned = "{:>" + str(fieldwidth[name]) + "}"
+                line += right_aligned.format(elem)
 
-        self.file_object.write(line + "\n")
+            self.file_object.write(line + "\n")
 
     def writerows(self, rows):
         for r in rows:
             self.writerow(r)
 
+    def writecolumns(self, columns, chunk_size=65536):
+        """Writes the rows made up of the elements of *columns*, which
+        is either a sequence of eight sequences (or numpy arrays), in the
+        order of :data:`fieldnames`, or a dictionary whose keys are the
+        :data:`fieldnames`.
+
+        The output is the same as if each row had been written by
+        :meth:`writerow`, but the rows are formatted together, and
+        written out *chunk_size* rows at a time.
+        """
+        if isinstance(columns, dict):
+            columns = list(columns[n] for n in fieldnames)
+        if len(columns) != len(fieldnames):
+            raise ValueError(
+                f"There must be {len(fieldnames)} columns, not {len(columns)}."
+            )
+        rows = len(columns[0])
+        for c in columns:
+            if len(c) != rows:
+                raise ValueError("The columns must all have the same length.")
+
+        for start in range(0, rows, chunk_size):
+            chunk = list()
+            for c in columns:
+                c = c[start : start + chunk_size]
+                # Python scalars format faster than numpy scalars, and
+                # the same.
+                chunk.append(c.tolist() if hasattr(c, "tolist") else c)
+            self.file_object.write("".join(map(_row_format.format, *chunk)))
+
     def writeheader(self):
         """A convenience function, since the fieldnames are pre-defined."""
         self.writerow(fieldnames)
@@ -88,3 +134,87 @@ class DictWriter(csv.DictWriter):
             )
         self.extrasaction = extrasaction
         self.writer = writer(f)
+
+
+def read_columns(f) -> dict:
+    """Returns a dictionary whose keys are the :data:`fieldnames` and
+    whose values are numpy arrays of the values in the ``cubenorm``
+    file *f*, which can be a path, or a file object opened in text or
+    binary mode.
+
+    The Band, RowCol, and ValidPoints arrays are integers, and the others
+    are floats.  This function requires the numpy library.
+    """
+    import numpy as np
+
+    chunks = list(iter_columns(f))
+    if len(chunks) == 0:
+        return _parse_columns([])
+    return {n: np.concatenate(list(c[n] for c in chunks)) for n in fieldnames}
+
+
+def iter_columns(f, chunk_size: int = 65536):
+    """Generator that yields dictionaries like those returned by
+    :func:`.cubenormfile.read_columns`, each with the values from
+    *chunk_size* rows of the file *f*, so that a file that is too
+    large to hold in memory can be read.
+
+    This function requires the numpy library.
+    """
+    if isinstance(f, (str, os.PathLike)):
+        with open(f, "rb") as file_object:
+            yield from iter_columns(file_object, chunk_size)
+        return
+
+    lines = iter(f)
+    first = next(lines, None)
+    if first is None:
+        return
+    if _to_bytes(first).split()[:1] != [fieldnames[0].encode()]:
+        # There is no header line.
+        lines = itertools.chain([first], lines)
+
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield _parse_columns(list(map(_to_bytes, chunk)))
+
+
+def _to_bytes(line) -> bytes:
+    if isinstance(line, str):
+        return line.encode("latin_1")
+    return line
+
+
+def _parse_columns(lines: list) -> dict:
+    """Returns a dictionary of numpy arrays from the list of *lines*
+    (as bytes) from a ``cubenorm`` file, which do not include the
+    header."""
+    import numpy as np
+
+    dtypes = {n: np.int64 if n in _int_fields else np.float64 for n in fieldnames}
+
+    width = sum(fieldwidth.values())
+    lines = list(line.rstrip() for line in lines if line.strip())
+    if all(len(line) == width for line in lines):
+        # Every line is the fixed width, so the fields can just be sliced
+        # out of all of the lines at once.
+        records = np.frombuffer(
+            b"".join(lines),
+            dtype=np.dtype(list((n, f"S{fieldwidth[n]}") for n in fieldnames)),
+        )
+        return {n: records[n].astype(dtypes[n]) for n in fieldnames}
+
+    # Some lines are not the fixed width, which can still be read if
+    # their values are separated by whitespace.  But a value wider than
+    # its whole field runs into the value before it, and can't be.
+    split = list(line.split() for line in lines)
+    for line, values in zip(lines, split):
+        if len(values) != len(fieldnames):
+            raise ValueError(
+                f"This line has {len(values)} values rather than "
+                f"{len(fieldnames)}, one may be wider than its field: {line}"
+            )
+    values = np.array(split, dtype=bytes, ndmin=2).reshape(-1, len(fieldnames))
+    return {n: values[:, i].astype(dtypes[n]) for i, n in enumerate(fieldnames)}
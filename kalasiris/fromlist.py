@@ -12,12 +12,34 @@ creating those files, or simply creating temporary versions.
 # top level of this library.
 
 import builtins
+import hashlib
 import os
+import shutil
 import tempfile
 import sys
+import threading
 import warnings
 from pathlib import Path
 
+# The ways that fromlist.temp() can provide the fromlist to a program:
+modes = ("file", "memfd", "pipe")
+
+# This is a private "global" to the fromlist module:
+_default_mode = "file"
+
+
+def set_default_mode(mode: str = "file"):
+    """Sets the *mode* that :class:`.fromlist.temp()` uses when it isn't
+    given one, which must be one of 'file' (the default), 'memfd', or
+    'pipe'.  Since :func:`.cubeit_k` uses :class:`.fromlist.temp()`,
+    this also affects it.
+    """
+    global _default_mode
+    if mode not in modes:
+        raise ValueError(f"The mode {mode} is not one of {modes}.")
+    _default_mode = mode
+
+
 # with fromlist.open([file1, file2, file3]) as fl:
 #     isis.cubeit(fl, to='foo.cub')
 #
@@ -143,13 +165,183 @@ class temp:
 
     The object that is bound to the *as* clause of the with
     statement is a :class:`pathlib.Path()`.
+
+    If *mode* is not given, the mode set by
+    :func:`.fromlist.set_default_mode` is used, which can be:
+
+    file
+        A temporary file is written, this is the default.
+
+    memfd
+        The fromlist is written to an anonymous file in memory, created
+        by :func:`os.memfd_create` (Linux only), and the path is
+        ``/dev/fd/N``, where N is its file descriptor.
+
+    pipe
+        The fromlist is written by a separate thread into a pipe, and
+        the path is ``/dev/fd/N``, where N is the read end of the pipe.
+        The fromlist can only be read once, so this mode can't be used
+        with programs that read it more than once.
+
+    The ``/dev/fd/N`` paths only work for a program that has inherited
+    the file descriptor, which the kalasiris ISIS program functions
+    arrange, but programs run in other ways might not.
     """
 
-    def __init__(self, fromlist: list):
-        self.path = make(fromlist)
+    def __init__(self, fromlist: list, mode: str = None):
+        self.mode = _default_mode if mode is None else mode
+        self._fd = None
+        self._thread = None
+        if self.mode == "file":
+            self.path = make(fromlist)
+        elif self.mode == "memfd":
+            self._fd = os.memfd_create("kalasiris_fromlist")
+            with builtins.open(self._fd, "w", closefd=False) as f:
+                print(fromlist, file=f)
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            self.path = Path(f"/dev/fd/{self._fd}")
+        elif self.mode == "pipe":
+            content = "".join(f"{elem}\n" for elem in fromlist).encode()
+            (self._fd, writer) = os.pipe()
+            self._thread = threading.Thread(
+                target=_write_pipe, args=(writer, content), daemon=True
+            )
+            self._thread.start()
+            self.path = Path(f"/dev/fd/{self._fd}")
+        else:
+            raise ValueError(f"The mode {self.mode} is not one of {modes}.")
+
+    def __enter__(self) -> Path:
+        return self.path
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._fd is None:
+            self.path.unlink()
+        else:
+            # For a pipe, closing the read end stops the writing thread,
+            # if nothing read it all.
+            os.close(self._fd)
+            self._fd = None
+            if self._thread is not None:
+                self._thread.join()
+
+
+def _write_pipe(fd: int, content: bytes):
+    """Writes *content* to the file descriptor *fd* and closes it."""
+    view = memoryview(content)
+    try:
+        while view:
+            view = view[os.write(fd, view) :]
+    except BrokenPipeError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Store:
+    """A collection of fromlist files, one for each unique list, so
+    that when the same list is needed many times, for example by a
+    series of mosaicking programs, it is only written once::
+
+     with fromlist.Store() as store:
+         with store.temp(cubes) as f:
+             isis.cubeit(fromlist=f, to='stacked.cub')
+         with store.temp(cubes) as f:
+             isis.equalizer(fromlist=f, ...)
+
+    Each file is named by the SHA-256 hash of its contents, and is
+    written atomically (to a temporary name, which is then renamed),
+    in *directory*, which defaults to a new directory in ``/dev/shm``
+    (or the default temporary directory, if that isn't available),
+    which is deleted by :meth:`cleanup`.
+
+    The files are reference-counted: :meth:`get` returns the path to the
+    file for a list, writing it if needed, and :meth:`release` deletes
+    it once it has been called as many times as :meth:`get` was for it.
+    A Store can be used from many threads.
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            from .Workspace import _default_fast
+
+            self.directory = Path(
+                tempfile.mkdtemp(prefix="kalasiris_fromlist_", dir=_default_fast())
+            )
+            self._own_directory = True
+        else:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._own_directory = False
+        self._counts = dict()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+        return False
+
+    def get(self, fromlist: list) -> Path:
+        """Returns the path to a fromlist file with the elements of
+        *fromlist*, one per line."""
+        content = "".join(f"{elem}\n" for elem in fromlist).encode()
+        path = self.directory / (hashlib.sha256(content).hexdigest() + ".lis")
+        with self._lock:
+            if path not in self._counts:
+                (fd, tmp) = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(content)
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.unlink(tmp)
+                    raise
+                self._counts[path] = 0
+            self._counts[path] += 1
+        return path
+
+    def release(self, path: Path) -> bool:
+        """Indicates that one of the users of *path* is done with it,
+        and deletes it if that was the last one, in which case True
+        is returned."""
+        with self._lock:
+            try:
+                self._counts[path] -= 1
+            except KeyError:
+                raise ValueError(f"The path {path} is not in the Store.")
+            if self._counts[path] > 0:
+                return False
+            del self._counts[path]
+            path.unlink(missing_ok=True)
+        return True
+
+    def temp(self, fromlist: list):
+        """Returns a context manager, which works like
+        :class:`.fromlist.temp`, but with a file from this Store."""
+        return _StoreTemp(self, fromlist)
+
+    def cleanup(self):
+        """Deletes all of the files in the Store, and its *directory*,
+        if the Store created it."""
+        with self._lock:
+            for path in self._counts.keys():
+                path.unlink(missing_ok=True)
+            self._counts.clear()
+            if self._own_directory:
+                shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _StoreTemp:
+    """The context manager returned by :meth:`.fromlist.Store.temp`."""
+
+    def __init__(self, store: Store, fromlist: list):
+        self.store = store
+        self.path = store.get(fromlist)
 
     def __enter__(self) -> Path:
         return self.path
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.path.unlink()
+        self.store.release(self.path)
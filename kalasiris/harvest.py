@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Gathers the values of keywords from the labels of many ISIS cubes
+into a table.
+
+If you need an inventory of a large number of cubes, you can walk a
+directory tree to find them, and then harvest the keywords you are
+interested in, which are described in the same way as for
+:func:`.getkeys_k`::
+
+    import kalasiris.harvest as harvest
+
+    keys = [
+        ('Instrument', 'InstrumentId'),
+        ('Instrument', 'StartTime'),
+        ('IsisCube/Core/Dimensions', 'Samples'),
+        ('IsisCube/Core/Dimensions', 'Lines'),
+        ('IsisCube/Core/Pixels', 'Type'),
+    ]
+    table = harvest.harvest(
+        harvest.walk('some/directory'), keys, cache='inventory.json'
+    )
+    harvest.write_csv(table, 'inventory.csv')
+
+The labels are read in parallel by a pool of threads.  If a *cache*
+file is given, the values from previous harvests of files whose size
+and modification time have not changed are used, rather than reading
+their labels again.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import kalasiris as isis
+
+# Set a logger:
+logger = logging.getLogger(__name__)
+
+
+def walk(top: os.PathLike, suffixes=(".cub",)):
+    """Generator that yields a :class:`os.DirEntry` for each file in the
+    directory tree below *top* whose name ends with one of the *suffixes*.
+
+    The directories are read with :func:`os.scandir`, which is much faster
+    than examining each path, and symbolic links to directories are not
+    followed.
+    """
+    directories = [top]
+    while directories:
+        with os.scandir(directories.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith(tuple(suffixes)):
+                    yield entry
+
+
+def column_name(key: tuple) -> str:
+    """Returns the name of the column for the (group, keyword) *key*."""
+    return "/".join(isis.k_funcs._label_path(key[0]) + [key[1]])
+
+
+def harvest(paths, keys: list, max_workers: int = None, cache=None) -> dict:
+    """Returns a dictionary of columns with the values of the *keys* from
+    the labels of each of the cubes in *paths*.
+
+    The *paths* can be :class:`os.DirEntry` objects (like those from
+    :func:`.harvest.walk`) or path-like objects.  The *keys* are
+    (group, keyword) tuples, as for :func:`.getkeys_k`.
+
+    The returned dictionary has a 'Path' key, and a key for each of
+    the *keys*, given by :func:`.harvest.column_name`, like
+    'Instrument/StartTime'.  The values are lists with one element
+    for each of the *paths*, in order, which are strings or lists of
+    strings, or None if the keyword is not in the label, or the label
+    could not be read.
+
+    The labels are read by up to *max_workers* threads (see
+    :class:`concurrent.futures.ThreadPoolExecutor`).
+
+    If *cache* is given, it is the path to a JSON file which records
+    the size, modification time, and harvested values of each file.
+    The values for any file whose size and modification time are the
+    same as those recorded are taken from the *cache*, rather than
+    the label being read again.  Once done, the *cache* is replaced
+    with a record of just the *paths* from this harvest.  If the
+    *cache* can't be read, a warning is logged and it is ignored.
+    """
+    keys = list(keys)
+    names = list(column_name(k) for k in keys)
+
+    cached = dict()
+    if cache is not None:
+        try:
+            with open(cache, "r") as f:
+                c = json.load(f)
+            if c["columns"] == names:
+                cached = c["files"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as err:
+            logger.warning(f"Ignoring the unreadable cache {cache}: {err}")
+
+    def read(entry):
+        path = entry.path if isinstance(entry, os.DirEntry) else os.fspath(entry)
+        try:
+            st = entry.stat() if isinstance(entry, os.DirEntry) else os.stat(path)
+            stamp = [st.st_size, st.st_mtime_ns]
+            if path in cached and cached[path][0] == stamp:
+                return path, stamp, cached[path][1]
+
+            d = isis.getkeys_k(path, keys, missing_ok=True)
+            return path, stamp, list(d[k] for k in keys)
+        except Exception as err:
+            logger.warning(f"Could not harvest {path}: {err}")
+            return path, None, [None] * len(keys)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(read, paths))
+
+    if cache is not None:
+        # Only the files from this harvest are kept.
+        files = dict()
+        for path, stamp, values in results:
+            if stamp is not None:
+                files[path] = [stamp, values]
+        c = dict(columns=names, files=files)
+        tmp = Path(cache).with_name(Path(cache).name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(c, f)
+        os.replace(tmp, cache)
+
+    table = dict(Path=list(r[0] for r in results))
+    for i, name in enumerate(names):
+        table[name] = list(r[2][i] for r in results)
+
+    return table
+
+
+def _cell(value) -> str:
+    """Returns a string for a table cell, which is empty for None and
+    is in PVL array format for a list."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "(" + ", ".join(value) + ")"
+    return value
+
+
+def write_csv(table: dict, path: os.PathLike):
+    """Writes the *table* from :func:`.harvest.harvest` as a CSV file at
+    *path*."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.keys())
+        writer.writerows(zip(*(map(_cell, col) for col in table.values())))
+
+
+def write_npz(table: dict, path: os.PathLike):
+    """Writes the *table* from :func:`.harvest.harvest` as a compressed
+    numpy ``.npz`` file at *path*, with a string array for each column.
+
+    This function requires the numpy library.
+    """
+    import numpy as np
+
+    np.savez_compressed(
+        path, **{k: np.array(list(map(_cell, v)), dtype=str) for k, v in table.items()}
+    )
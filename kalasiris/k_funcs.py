@@ -27,11 +27,56 @@ little differently, so make sure to read their documentation.
 # The AUTHORS file and the LICENSE file are at the
 # top level of this library.
 
-import tempfile
+import contextlib
+import logging
+import math
 import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import kalasiris as isis
+from kalasiris import version
+
+# Set a logger:
+logger = logging.getLogger(__name__)
+
+# This is a private "global" to the k_funcs module:
+_stats_backend = "isis"
+
+# The columns in ISIS batchlist files are separated by whitespace or commas.
+_batch_sep_re = re.compile(r"[\s,]+")
+
+
+def set_stats_backend(backend: str):
+    """Sets what :func:`.stats_k` uses to compute statistics.
+
+    The *backend* must be one of these strings:
+
+    isis
+        The default, ISIS ``stats`` is run.
+
+    native
+        The statistics are computed in Python by
+        :func:`.nativestats.stats`, which requires the numpy and pvl
+        libraries.
+
+    verify
+        Both are run, and any differences are logged as warnings,
+        the results of ISIS ``stats`` are returned.
+
+    Since :func:`.nativestats.stats` only computes statistics, calls
+    to :func:`.stats_k` with parameters other than FROM= (like TO=)
+    are always given to ISIS ``stats``.
+    """
+    if backend not in ("isis", "native", "verify"):
+        raise ValueError(
+            f"The backend ({backend}) must be 'isis', 'native', or 'verify'."
+        )
+    global _stats_backend
+    _stats_backend = backend
 
 
 def getkey_k(cube: os.PathLike, group: str, key: str) -> str:
@@ -42,6 +87,139 @@ def getkey_k(cube: os.PathLike, group: str, key: str) -> str:
     return isis.getkey(cube, grpname=group, keyword=key).stdout.strip()
 
 
+def getkeys_k(
+    cube: os.PathLike, keys: list, max_workers: int = None, missing_ok=False
+) -> dict:
+    """Returns a dictionary of the values of many keywords in the label
+    of *cube*.
+
+    The *keys* are an iterable of two-element tuples, the first element
+    is the name of the group or object that the keyword is in, and the
+    second is the keyword name, these are the *group* and *key* arguments
+    to :func:`.getkey_k`::
+
+        d = isis.getkeys_k(
+            'some.cub',
+            [('Instrument', 'StartTime'), ('Instrument', 'Summing')]
+        )
+        start_time = d[('Instrument', 'StartTime')]
+
+    The returned dictionary has these tuples as keys, and the values
+    are strings, just like :func:`.getkey_k` would return, unless the
+    keyword has an array of values, in which case it is a list of
+    strings.
+
+    The group or object name can also be a path of names separated by
+    slashes (or a tuple of names), like 'IsisCube/Core/Dimensions'.
+    The first name can be anywhere in the label, and each following
+    name must be within the one before it.  If it is None or an empty
+    string, the keyword is at the top level of the label.
+
+    If the pvl library is available, the label is only read and parsed
+    once, and a KeyError is raised if a keyword can't be found.
+    Otherwise, ISIS ``getkey`` is run for each keyword, in parallel
+    by up to *max_workers* threads (see
+    :class:`concurrent.futures.ThreadPoolExecutor`).  If *missing_ok* is
+    True, the value of any keyword that can't be found is None instead.
+    """
+    keys = list(keys)
+    try:
+        label = isis.cube.load_label(cube, strings=True)
+    except ImportError:
+
+        def get(k):
+            try:
+                return _getkey_values(cube, _label_path(k[0]), k[1])
+            except subprocess.CalledProcessError:
+                if missing_ok:
+                    return None
+                raise
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(keys, executor.map(get, keys)))
+
+    d = dict()
+    for k in keys:
+        try:
+            d[k] = _label_values(_find_in_label(label, _label_path(k[0]), k[1]))
+        except KeyError:
+            if missing_ok:
+                d[k] = None
+            else:
+                raise
+    return d
+
+
+def _label_path(path) -> list:
+    """Returns a list of the names in the group or object *path*."""
+    if not path:
+        return list()
+    if isinstance(path, str):
+        return path.strip("/").split("/")
+    return list(path)
+
+
+def _find_in_label(label, names: list, key: str):
+    """Returns the value of the *key* within the *names* of the parsed
+    *label*, the comparisons ignore case, like ISIS ``getkey`` does."""
+
+    def children(aggregation):
+        return filter(lambda x: hasattr(x[1], "items"), aggregation.items())
+
+    def search(aggregation, name):
+        for k, v in children(aggregation):
+            if k.casefold() == name.casefold():
+                return v
+            found = search(v, name)
+            if found is not None:
+                return found
+        return None
+
+    node = label
+    for i, name in enumerate(names):
+        if i == 0:
+            node = search(label, name)
+        else:
+            node = next(
+                (v for k, v in children(node) if k.casefold() == name.casefold()), None
+            )
+        if node is None:
+            raise KeyError(f"There is no {'/'.join(names[: i + 1])} in the label.")
+
+    for k, v in node.items():
+        if k.casefold() == key.casefold() and not hasattr(v, "items"):
+            return v
+    raise KeyError(f"There is no {key} in {'/'.join(names)} in the label.")
+
+
+def _label_values(value):
+    """Returns *value* as a string, or a list of strings."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(map(str, value))
+    return str(value)
+
+
+def _getkey_values(cube: os.PathLike, names: list, key: str):
+    """Returns the value found by ISIS getkey as a string or, if the
+    value is an array, a list of strings."""
+    kwargs = dict(keyword=key)
+    if len(names) > 1:
+        kwargs["objname"] = names[-2]
+    try:
+        if len(names) > 0:
+            kwargs["grpname"] = names[-1]
+        value = isis.getkey(cube, **kwargs).stdout.strip()
+    except subprocess.CalledProcessError:
+        if len(names) == 0:
+            raise
+        # The last name might be of an object and not a group.
+        value = isis.getkey(cube, objname=names[-1], keyword=key).stdout.strip()
+
+    if value.startswith("(") and value.endswith(")"):
+        return list(v.strip().strip('"') for v in value[1:-1].split(","))
+    return value
+
+
 def hi2isis_k(*args, **kwargs):
     """Creates a default name for the to= cube.
 
@@ -67,37 +245,193 @@ def hist_k(*args, **kwargs) -> str:
     """Returns the contents of the file created by ISIS hist as a string.
 
     If there is a TO= parameter in the arguments, ``hist_k()`` will
-    create the file, and return its contents as a string
+    create the file, and return its contents as a string.  Otherwise,
+    ISIS hist writes to a :class:`.capture.TextSink`, so that nothing
+    is written to disk (see :func:`.capture.wrap`).
+    """
+    return isis.capture.wrap(isis.hist)(*args, **kwargs)
+
+
+def cubeit_k(fromlist: list, max_workers: int = None, **kwargs):
+    """Takes a list of paths to cubes to operate cubeit on,
+    rather than having the user create a text list.
+
+    If *max_workers* is greater than one, and there are more cubes in
+    *fromlist* than that, the list is split into *max_workers* shards
+    of consecutive cubes, partial stacks of each shard are made by
+    cubeit programs run in parallel, and then those partial stacks
+    are combined, in order, so the bands are in the same order as
+    *fromlist*.  The partial stacks are written next to the TO= cube,
+    and are deleted when done.
     """
     to_pathlike = None
     for k, v in kwargs.items():
         if "to" == k or "to_" == k:
             to_pathlike = v
 
-    f = None
-    if not to_pathlike:
-        f = tempfile.NamedTemporaryFile(mode="w+")
-        kwargs["to"] = f.name
-
-    isis.hist(*args, **kwargs)
-
-    if not f:
-        f = open(to_pathlike, "r")
-    contents = f.read()
-    f.close()
+    if max_workers is None or max_workers < 2 or to_pathlike is None:
+        shards = 1
+    else:
+        shards = min(max_workers, len(fromlist))
+
+    if shards < 2:
+        with isis.fromlist.temp(fromlist) as f:
+            kwargs["fromlist"] = f
+            cp = isis.cubeit(**kwargs)
+
+        return cp
+
+    fromlist = list(fromlist)
+    to_path = Path(to_pathlike)
+    partials = isis.PathSet()
+    (size, extra) = divmod(len(fromlist), shards)
+    jobs = list()
+    start = 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        partial = partials.add(to_path.with_name(f"{to_path.stem}.part{i}.cub"))
+        jobs.append((fromlist[start:stop], partial))
+        start = stop
+
+    part_kwargs = {k: v for k, v in kwargs.items() if k not in ("to", "to_")}
+
+    def run_shard(job):
+        (shard, partial) = job
+        return cubeit_k(shard, to=partial, **part_kwargs)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(run_shard, jobs))
+        cp = cubeit_k(list(j[1] for j in jobs), **kwargs)
+    finally:
+        partials.unlink(missing_ok=True)
 
-    return contents
+    return cp
 
 
-def cubeit_k(fromlist: list, **kwargs):
-    """Takes a list of paths to cubes to operate cubeit on,
-    rather than having the user create a text list.
+def batch_k(
+    program,
+    params: list,
+    chunk_size: int = None,
+    max_workers: int = None,
+    **kwargs,
+) -> list:
+    """Runs the ISIS *program* for each of the dictionaries of parameters
+    in *params*, and returns a sorted list of the indexes of *params*
+    for which it failed.
+
+    Each dictionary in *params* must have the same keys, which are the
+    parameters that vary, and any *kwargs* are given to every run::
+
+        failed = isis.batch_k(
+            "spiceinit", [{"from": c} for c in cubes], web="yes"
+        )
+
+    Rather than starting the program for each of *params*, they are
+    written to a file given to the ISIS -batchlist reserved parameter,
+    so that one run of the program handles many of them, which is much
+    faster for programs that do little work on each file.  The program
+    is run with -onerror=continue, and the -errlist file it writes is
+    read to determine which of *params* failed.  If the program fails
+    without writing an error list, all of the *params* that it was
+    given are considered to have failed.
+
+    The *program* is the name of an ISIS program, or a
+    :class:`.BoundProgram` from :func:`.bind`.
+
+    If *chunk_size* is given, no more than that many of *params* are
+    given to each run of the program, and the runs are made in
+    parallel by up to *max_workers* threads (see
+    :class:`concurrent.futures.ThreadPoolExecutor`).  If *max_workers*
+    is given without a *chunk_size*, *params* are split evenly
+    between the workers.
+
+    The values in *params* cannot be empty, or contain spaces, commas,
+    or quotes, since they are separated by those in the batchlist file.
+
+    If :func:`.version.capabilities` indicates that ISIS does not
+    support -batchlist, the program is run for each of *params*.
     """
-    with isis.fromlist.temp(fromlist) as f:
-        kwargs["fromlist"] = f
-        cp = isis.cubeit(**kwargs)
+    params = list(params)
+    if len(params) == 0:
+        return list()
+
+    keys = list(params[0].keys())
+    rows = list()
+    for p in params:
+        if set(p.keys()) != set(keys):
+            raise ValueError(
+                f"The keys of {p} are not the same as those of {params[0]}."
+            )
+        row = list(str(p[k]) for k in keys)
+        for v in row:
+            if v == "" or _batch_sep_re.search(v) or '"' in v:
+                raise ValueError(f"The value '{v}' cannot be in a batchlist.")
+        rows.append(row)
+
+    if isinstance(program, str):
+        program_fn = getattr(isis, program)
+    else:
+        program_fn = program
+        program = program.program
+
+    if not version.capabilities()["batchlist"]:
+
+        def run_one(i):
+            try:
+                program_fn(**kwargs, **params[i])
+            except subprocess.CalledProcessError as err:
+                logger.warning(f"ISIS {program} failed for {params[i]}: {err}")
+                return [i]
+            return []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return sorted(sum(executor.map(run_one, range(len(params))), []))
+
+    if chunk_size is None:
+        chunk_size = math.ceil(len(params) / (max_workers or 1))
+    chunks = list(
+        range(start, min(start + chunk_size, len(params)))
+        for start in range(0, len(params), chunk_size)
+    )
+    substitutions = {k: f"${j}" for j, k in enumerate(keys, start=1)}
+
+    def run_chunk(chunk):
+        with tempfile.TemporaryDirectory() as d:
+            batchlist = Path(d) / "batch.lis"
+            errlist = Path(d) / "errors.lis"
+            batchlist.write_text("".join(" ".join(rows[i]) + "\n" for i in chunk))
+            cp = program_fn(
+                **{**kwargs, **substitutions},
+                batchlist__=batchlist,
+                errlist__=errlist,
+                onerror__="continue",
+                _check=False,
+            )
+            errors = list()
+            if errlist.exists():
+                for line in errlist.read_text().splitlines():
+                    if line.strip():
+                        errors.append(_batch_sep_re.split(line.strip()))
+
+        # Each error line claims the first unclaimed row that matches it.
+        failed = list()
+        remaining = list(chunk)
+        for e in errors:
+            for i in remaining:
+                if rows[i] == e:
+                    failed.append(i)
+                    remaining.remove(i)
+                    break
+        if cp.returncode != 0 and len(failed) == 0:
+            failed = list(chunk)
 
-    return cp
+        for i in failed:
+            logger.warning(f"ISIS {program} failed for {params[i]}: {cp.stderr}")
+        return failed
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sorted(sum(executor.map(run_chunk, chunks), []))
 
 
 def stats_k(*args, **kwargs) -> dict:
@@ -107,17 +441,176 @@ def stats_k(*args, **kwargs) -> dict:
     perform the file-based activities that ``stats`` normally would,
     and also return the Python Dictionary.
     """
-    # We could use the pvl library to parse the returned text, but
-    # that would involve a dependency, and since the format is so
-    # simple, we'll just parse it directly here.
+    from_ = None
+    if _stats_backend != "isis":
+        if len(args) == 1 and len(kwargs) == 0:
+            from_ = args[0]
+        elif len(args) == 0 and len(kwargs) == 1:
+            from_ = kwargs.get("from", kwargs.get("from_"))
+
+    if from_ is not None:
+        from kalasiris import nativestats
+
+        # An ISIS band attribute, like some.cub+2, selects a band.
+        (path, plus, band) = str(from_).rpartition("+")
+        if plus and band.isdigit():
+            native_d = nativestats.stats(path, band=int(band))
+        else:
+            native_d = nativestats.stats(from_)
 
-    stats_text = isis.stats(*args, **kwargs).stdout
+        if _stats_backend == "native":
+            return native_d
 
     d = dict()
-    for line in filter(lambda x: "=" in x, stats_text.splitlines()):
-        (k, equals, v) = line.partition("=")
-        if "Group" in k:
-            continue
-        d[k.strip()] = v.strip()
+    for group in _stats_groups(isis.stats(*args, **kwargs).stdout):
+        d.update(group)
+
+    if from_ is not None:
+        diffs = nativestats.compare(
+            native_d["From"], int(native_d["Band"]), isis_dict=d, native_dict=native_d
+        )
+        for k, (isis_v, native_v) in diffs.items():
+            logger.warning(
+                f"For {from_}, ISIS stats has {k} = {isis_v}, "
+                f"but native stats has {native_v}."
+            )
 
     return d
+
+
+def stats_table_k(
+    cubes: list,
+    bands: list = None,
+    max_workers: int = None,
+    to=None,
+    failures: list = None,
+    **kwargs,
+) -> dict:
+    """Returns the results of running ISIS stats on each of *cubes* as a
+    Python Dictionary of columns with one row for each cube and band.
+
+    The keys of the returned dictionary are the same as the keys from
+    :func:`.stats_k`, and the values are lists, the first element of each
+    list is from the first band of the first cube, and so on.  The
+    values are converted: From is a string, Band and the pixel counts
+    are ints, and the statistics are floats (or NaN if ISIS did not
+    provide a number).
+
+    If *bands* is given, only those bands from each of the cubes are
+    examined, otherwise ISIS stats provides results for every band.
+
+    The ISIS stats programs are run in parallel by up to *max_workers*
+    threads (see :class:`concurrent.futures.ThreadPoolExecutor`).  Any
+    *kwargs* are given to each of the calls to stats.
+
+    If ISIS stats fails for an input, a warning is logged, and that
+    input has a single row whose statistics are NaN and whose Band and
+    pixel counts are None.  If *failures* is a list, a two-element tuple
+    of the input and the exception is appended to it for each failure.
+
+    If *to* is given, the ISIS stats FORMAT=FLAT mode is also used, and
+    when done the results are gathered into the flat file at *to*, in
+    the same order as the rows of the returned dictionary.
+    """
+    inputs = list()
+    for c in cubes:
+        if bands is None:
+            inputs.append((c, None))
+        else:
+            inputs.extend((f"{c}+{b}", b) for b in bands)
+
+    with contextlib.ExitStack() as stack:
+        if to is not None:
+            tempdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+
+        def run_stats(i):
+            from_ = inputs[i][0]
+            try:
+                if to is None:
+                    return isis.stats(from_, **kwargs).stdout
+                else:
+                    return isis.stats(
+                        from_, to=tempdir / f"{i}.txt", format="flat", **kwargs
+                    ).stdout
+            except subprocess.CalledProcessError as err:
+                logger.warning(f"ISIS stats failed for {from_}: {err}")
+                if failures is not None:
+                    failures.append((from_, err))
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            texts = list(executor.map(run_stats, range(len(inputs))))
+
+        if to is not None:
+            with open(to, "w") as outfile:
+                header = None
+                for i, text in enumerate(texts):
+                    if text is None:
+                        continue
+                    with open(tempdir / f"{i}.txt", "r") as f:
+                        first = f.readline()
+                        if header is None:
+                            header = first
+                            outfile.write(first)
+                        elif first != header:
+                            outfile.write(first)
+                        outfile.writelines(f)
+
+    # Each row is a dictionary, and whether it is for a failed input.
+    rows = list()
+    for (from_, _), text in zip(inputs, texts):
+        if text is None:
+            rows.append((dict(From=str(from_)), True))
+        else:
+            rows.extend(
+                ({k: _stats_value(k, v) for k, v in g.items()}, False)
+                for g in _stats_groups(text)
+            )
+
+    keys = dict()
+    for row, failed in rows:
+        keys.update(dict.fromkeys(row.keys()))
+
+    table = dict()
+    for k in keys:
+        if k in ("From", "Band") or k.endswith("Pixels"):
+            failed_value = None
+        else:
+            failed_value = math.nan
+        table[k] = list(
+            row.get(k, failed_value if failed else None) for (row, failed) in rows
+        )
+
+    return table
+
+
+def _stats_groups(stats_text: str) -> list:
+    """Returns a list of dictionaries, one for each PVL group in the
+    text output of ISIS stats, whose keys and values are strings.
+    """
+    # We could use the pvl library to parse the returned text, but
+    # that would involve a dependency, and since the format is so
+    # simple, we'll just parse it directly here.
+    groups = list()
+    for line in filter(lambda x: "=" in x, stats_text.splitlines()):
+        (k, equals, v) = line.partition("=")
+        if "Group" in k or len(groups) == 0:
+            groups.append(dict())
+            if "Group" in k:
+                continue
+        groups[-1][k.strip()] = v.strip()
+
+    return groups
+
+
+def _stats_value(key: str, value: str):
+    """Converts the string *value* of an ISIS stats *key* to its type."""
+    if key == "From":
+        return value
+    elif key == "Band" or key.endswith("Pixels"):
+        return int(value)
+    else:
+        try:
+            return float(value)
+        except ValueError:
+            return math.nan
@@ -9,12 +9,19 @@
 # top level of this library.
 
 # Thou shalt only import from the Python Standard Library.
+import collections
 import logging
 import os
+import re
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# These modules also only import from the Standard Library.
+from . import schema, spawn
+
 # This file shall have *NO* non-Standard Library dependencies.
 
 # kalasiris library version:
@@ -48,14 +55,48 @@ except KeyError:
 # as arguments to any ISIS program, prefixed by a dash (-).
 _res_param_no_vals = {"webhelp", "last", "gui", "nogui", "verbose"}
 _res_param_maybe = {"help", "log", "info", "save"}
+# These must have values, so can only be given as keywords, like
+# batchlist__="list.lis", please see batch_k().
+_res_param_vals = {"batchlist", "errlist", "onerror", "preference", "restore"}
+# These can be given as non-keyword arguments, like "help__" or "-help":
+_res_param_bare = frozenset(_res_param_no_vals.union(_res_param_maybe))
 
 # The ISIS programs in this list do not follow the 'normal' argument
 # patters for most ISIS programs, they just consume everything you
 # give them, so we need to treat them differently.
 _pass_through_programs = {"cneteditor", "qmos", "qnet", "qtie", "qview"}
 
-# This is a private "global" to the kalasiris module:
+# These are private "globals" to the kalasiris module:
 _preferences_path = None
+_check_names = True
+_check_types = False
+_spawn_backend = "subprocess"
+_admission_controller = None
+
+# Arguments that refer to one of our file descriptors, like
+# fromlist=/dev/fd/5 (see fromlist.temp), which must be passed on
+# to the ISIS program.
+_dev_fd_re = re.compile(r"(?:^|=)/dev/fd/(\d+)$")
+
+# The output file argument, which is removed if the program times out,
+# unless it is being appended to:
+_to_re = re.compile(r"^to=(.+)$")
+_append_re = re.compile(r"^append=(.+)$", re.IGNORECASE)
+
+Policy = collections.namedtuple(
+    "Policy", ["timeout", "retries", "backoff", "transient"], defaults=(None, 0, 1, ())
+)
+Policy.__doc__ = """How an ISIS program is run, please see :func:`set_policy`.
+
+If *timeout* is not None, a program that runs for longer than that many
+seconds is killed, along with any processes it started.  A program
+that times out, or whose return code is in *transient*, is run again,
+up to *retries* more times, after waiting for *backoff* seconds, which
+doubles for each retry."""
+
+# The policies for particular programs, and for all of the others:
+_policies = dict()
+_default_policy = Policy()
 
 
 def set_persistent_preferences(path: Path):
@@ -83,6 +124,100 @@ def set_persistent_preferences(path: Path):
     _preferences_path = path
 
 
+def set_parameter_checks(names=True, types=False):
+    """
+    Sets whether the arguments given to each ISIS program function are
+    checked, before the ISIS program is run, against the parameters
+    described in the program's XML file in $ISISROOT/bin/xml.
+
+    If *names* is True (the default), a ValueError is raised if any
+    keyword argument is not a parameter of the program, or an
+    unambiguous abbreviation of one.  If *types* is also True, a
+    ValueError is raised if any value can't be converted to the
+    parameter's type (integer, double, or boolean), or if the parameter
+    has a list of options, and the value isn't one of them.  If *names*
+    is False, nothing is checked.
+
+    The checks are skipped for any program whose XML file can't be
+    parsed, please see :mod:`kalasiris.schema`.
+    """
+    global _check_names
+    global _check_types
+    _check_names = names
+    _check_types = names and types
+
+
+def set_spawn_backend(backend="subprocess", address: Path = None):
+    """
+    Sets how each ISIS program is started.
+
+    The *backend* must be one of 'subprocess' (the default, which uses
+    :func:`subprocess.run`), 'posix_spawn', or 'launcher', please see
+    :mod:`kalasiris.spawn`.  Whichever is used, the ISIS program
+    functions return a :class:`subprocess.CompletedProcess`.
+
+    For the 'launcher' backend, if *address* is given, the programs are
+    run by the shared launcher on that Unix socket, otherwise a private
+    launcher process is started, so it is best to do this early, before
+    your Python process gets large.  Please see :mod:`kalasiris.launcher`.
+    """
+    global _spawn_backend
+    if backend not in spawn.backends:
+        raise ValueError(f"The backend {backend} is not one of {spawn.backends}.")
+    if backend == "launcher":
+        from . import launcher
+
+        if address is None:
+            launcher.connect(None)
+            launcher.start()
+        else:
+            launcher.connect(address)
+    _spawn_backend = backend
+
+
+def set_admission_controller(controller=None):
+    """
+    Sets an :class:`.admission.Controller` which each ISIS program must
+    be admitted by before it is run, or if *controller* is None, they
+    are run right away.  Please see :mod:`kalasiris.admission`.
+    """
+    global _admission_controller
+    _admission_controller = controller
+
+
+def set_policy(program: str = None, policy: Policy = None):
+    """
+    Sets the :class:`Policy` for running the ISIS *program*, or if
+    *program* is None, for any program that doesn't have its own.  If
+    *policy* is None, *program* goes back to the default policy, or if
+    *program* is also None, the default policy goes back to no timeout
+    and no retries.  For example::
+
+        isis.set_policy(None, isis.Policy(timeout=3600))
+        isis.set_policy(
+            "spiceinit", isis.Policy(timeout=600, retries=2, transient={1})
+        )
+
+    When a program times out, its whole process group is killed, and
+    the file given as its TO= parameter (if any) is removed, since it
+    would be incomplete, if that attempt created or changed it, and it
+    was not being appended to (APPEND=true).  A ``_timeout`` given to
+    an ISIS program function overrides the policy's timeout.
+    """
+    global _default_policy
+    if program is None:
+        _default_policy = Policy() if policy is None else policy
+    elif policy is None:
+        _policies.pop(program, None)
+    else:
+        _policies[program] = policy
+
+
+def get_policy(program: str) -> Policy:
+    """Returns the :class:`Policy` for running the ISIS *program*."""
+    return _policies.get(program, _default_policy)
+
+
 def param_fmt(key: str, value: str) -> str:
     """Returns a "key=value" string from the inputs.
 
@@ -123,12 +258,32 @@ def param_fmt(key: str, value: str) -> str:
 def _run_isis_program(
     cmd: list, subprocess_kwargs: dict = None
 ) -> subprocess.CompletedProcess:
-    """Wrapper for subprocess.run().
+    """Wrapper for subprocess.run(), or the other spawn backends, please
+    see :func:`set_spawn_backend`.
+
+    Also logs the elements of *cmd* to the logger at level INFO, and
+    waits for admission if there is an admission controller, please see
+    :func:`set_admission_controller`.
 
-    Also logs the elements of *cmd* to the logger at level INFO.
+    The program is run as its :class:`Policy` says, please see
+    :func:`set_policy`.
+
+    If any of the elements of *cmd* are ``/dev/fd/N`` paths (or end in
+    ``=/dev/fd/N``), then file descriptor *N* is added to the
+    ``pass_fds`` given to subprocess.run(), so that the ISIS program
+    can open it.
     """
     if subprocess_kwargs is None:
         subprocess_kwargs = dict()
+    fds = set()
+    for c in cmd:
+        match = _dev_fd_re.search(str(c))
+        if match:
+            fds.add(int(match.group(1)))
+    if fds:
+        subprocess_kwargs["pass_fds"] = tuple(
+            sorted(fds.union(subprocess_kwargs.get("pass_fds", ())))
+        )
     # Set some reasonable defaults, if they aren't already set:
     subprocess_kwargs.setdefault("env", environ)
     subprocess_kwargs.setdefault("check", True)
@@ -136,10 +291,168 @@ def _run_isis_program(
     subprocess_kwargs.setdefault("stderr", subprocess.PIPE)
     subprocess_kwargs.setdefault("universal_newlines", True)
 
+    policy = get_policy(str(cmd[0]))
+    if policy.timeout is not None:
+        subprocess_kwargs.setdefault("timeout", policy.timeout)
+    if "timeout" in subprocess_kwargs:
+        subprocess_kwargs.setdefault("start_new_session", True)
+
     logger.info(" ".join(cmd))
+    attempt = 0
+    while True:
+        outputs = _output_stats(cmd) if "timeout" in subprocess_kwargs else None
+        try:
+            cp = _admit(cmd, subprocess_kwargs)
+        except subprocess.TimeoutExpired as err:
+            _remove_outputs(outputs)
+            if attempt == policy.retries:
+                raise
+            reason = err
+        except subprocess.CalledProcessError as err:
+            if err.returncode not in policy.transient or attempt == policy.retries:
+                raise
+            reason = err
+        else:
+            if cp.returncode not in policy.transient or attempt == policy.retries:
+                return cp
+            reason = f"it returned {cp.returncode}"
+
+        delay = policy.backoff * 2**attempt
+        logger.warning(f"Running {cmd[0]} again in {delay} s, because {reason}")
+        time.sleep(delay)
+        attempt += 1
+
+
+def _admit(cmd: list, subprocess_kwargs: dict) -> subprocess.CompletedProcess:
+    """Runs *cmd* once admitted by the admission controller, if any."""
+    if _admission_controller is None:
+        return _spawn(cmd, subprocess_kwargs)
+    with _admission_controller.admit(str(cmd[0])) as admission:
+        # The runs that fail, or are killed, are worth learning from, too.
+        try:
+            cp = _spawn(cmd, subprocess_kwargs)
+        except subprocess.SubprocessError as err:
+            admission.rusage = getattr(err, "rusage", None)
+            raise
+        admission.rusage = getattr(cp, "rusage", None)
+    return cp
+
+
+def _spawn(cmd: list, subprocess_kwargs: dict) -> subprocess.CompletedProcess:
+    """Runs *cmd* with the spawn backend."""
+    if _spawn_backend == "posix_spawn":
+        return spawn.posix_spawn_run(cmd, **subprocess_kwargs)
+    elif _spawn_backend == "launcher":
+        from . import launcher
+
+        return launcher.run(cmd, **subprocess_kwargs)
+    elif subprocess_kwargs.get("start_new_session") and "timeout" in subprocess_kwargs:
+        # Unlike subprocess.run(), this kills the whole process group.
+        return spawn.popen_run(cmd, **subprocess_kwargs)
     return subprocess.run(cmd, **subprocess_kwargs)
 
 
+def _output_stats(cmd: list) -> dict:
+    """Returns a dictionary whose keys are the paths that the TO=
+    parameter in *cmd* may be written to (with the .cub extension
+    that ISIS might add to it), and whose values are their size and
+    modification time, or None if they don't exist.
+
+    The dictionary is empty if *cmd* has a true APPEND= parameter, since
+    the output was not just written by *cmd*.
+    """
+    paths = list()
+    for c in cmd[1:]:
+        c = str(c)
+        match = _append_re.match(c)
+        if match and match.group(1).lower() not in ("false", "no", "f", "n"):
+            return dict()
+        match = _to_re.match(c)
+        if match:
+            p = Path(match.group(1))
+            paths.extend((p, p.with_suffix(".cub")) if p.suffix == "" else (p,))
+
+    stats = dict()
+    for path in paths:
+        try:
+            st = path.stat()
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stats[path] = None
+    return stats
+
+
+def _remove_outputs(before: dict):
+    """Removes the regular files among the paths in *before* (from
+    :func:`_output_stats`) which have been created or changed since."""
+    for path, stat in before.items():
+        try:
+            st = path.stat()
+            if not path.is_file() or stat == (st.st_size, st.st_mtime_ns):
+                continue
+            path.unlink()
+            logger.warning(f"Removed the partial output {path}")
+        except OSError:
+            pass
+
+
+def _isis_cmd(fn_name: str, args: tuple, kwargs: dict) -> tuple:
+    """Returns a two-tuple of the command list to run the ISIS program
+    *fn_name* with the given *args* and *kwargs*, and a dictionary of
+    the keyword arguments for subprocess.run().
+
+    The keys in *kwargs* that begin with an underscore (_) have it
+    removed and go in the dictionary for subprocess.run().
+    """
+    cmd = [fn_name]
+    # Extract any keyword arguments for subprocess.run:
+    subprocess_kwargs = dict()
+    isis_kwargs = dict()
+    for k, v in kwargs.items():
+        if k.startswith("_"):
+            subprocess_kwargs[k[1:]] = v
+        else:
+            isis_kwargs[k] = v
+
+    if _preferences_path is not None and "pref__" not in isis_kwargs:
+        isis_kwargs["pref__"] = _preferences_path
+
+    if fn_name in _pass_through_programs:
+        cmd.extend(args)
+    else:
+        args_list = list(args)
+        if len(args) > 0 and not (
+            str(args[0]).endswith("__") or str(args[0]).startswith("-")
+        ):
+            from_ = args_list.pop(0)
+            cmd.append(param_fmt("from", from_))
+            if _check_names:
+                schema.check(
+                    fn_name, environ["ISISROOT"], {"from": from_}, _check_types
+                )
+        for a in args_list:
+            if a.endswith("__") and a.rstrip("_") in _res_param_bare:
+                cmd.append("-{}".format(a.rstrip("_")))
+            elif a.startswith("-") and a.lstrip("-") in _res_param_bare:
+                cmd.append(a)
+            elif a.strip("-_") in _res_param_vals:
+                raise IndexError(
+                    f"The reserved parameter {a} must have a value, "
+                    f"give it as a keyword, like {a.strip('-_')}__=value"
+                )
+            else:
+                e = (
+                    "only accepts 1 non-keyword argument "
+                    "(and sets it to from= ) "
+                    "not sure what to do with " + a
+                )
+                raise IndexError(e)
+        if _check_names:
+            schema.check(fn_name, environ["ISISROOT"], isis_kwargs, _check_types)
+        cmd.extend(map(param_fmt, isis_kwargs.keys(), isis_kwargs.values()))
+    return (cmd, subprocess_kwargs)
+
+
 def _build_isis_fn(fn_name: str):
     """This factory builds a simple function to call an ISIS program."""
 
@@ -154,49 +467,110 @@ have their leading underscore removed and passed on to
 subprocess.run(), please see its documentation to see what is
 allowed.
 """
-        cmd = [fn_name]
-        # Extract any keyword arguments for subprocess.run:
-        subprocess_kwargs = dict()
+        (cmd, subprocess_kwargs) = _isis_cmd(fn_name, args, kwargs)
+        return _run_isis_program(cmd, subprocess_kwargs)
+
+    # Then add it, by name to the enclosing module.
+    setattr(sys.modules[__name__], fn_name, isis_fn)
+    # Could have also used sys.modules['kalasiris'] if I wanted to be explicit.
+
+
+class BoundProgram:
+    """An ISIS *program* with some of its arguments already given, which
+    can be called like the kalasiris ISIS program functions, with the
+    rest of them.
+
+    The arguments given when a BoundProgram is created are checked and
+    formatted once, and the result is kept as the *cmd* list and the
+    *subprocess_kwargs* dictionary, so each call only needs to format
+    the arguments that it is given.  Please see :func:`bind`.
+    """
+
+    def __init__(self, program: str, *args, **kwargs):
+        self.program = program
+        (self.cmd, self.subprocess_kwargs) = _isis_cmd(program, args, kwargs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({' '.join(map(str, self.cmd))})"
+
+    def __call__(self, *args, **kwargs) -> subprocess.CompletedProcess:
+        """Runs the program with the bound arguments and these.
+
+        At most one non-keyword argument is allowed, which is given as
+        the FROM= parameter.  Keyword arguments are ISIS parameters, or
+        if they begin with an underscore (_), are given to
+        subprocess.run(), overriding the bound ones.
+        """
+        cmd = list(self.cmd)
+        subprocess_kwargs = dict(self.subprocess_kwargs)
+        if self.program in _pass_through_programs:
+            cmd.extend(args)
+            args = ()
+        elif len(args) > 1:
+            raise IndexError(
+                f"{self!r} only accepts 1 non-keyword argument "
+                f"(and sets it to from= ), not {args}"
+            )
+
         isis_kwargs = dict()
+        if len(args) == 1:
+            isis_kwargs["from"] = args[0]
         for k, v in kwargs.items():
             if k.startswith("_"):
                 subprocess_kwargs[k[1:]] = v
             else:
                 isis_kwargs[k] = v
 
-        if _preferences_path is not None and "pref__" not in isis_kwargs:
-            isis_kwargs["pref__"] = _preferences_path
-
-        if fn_name in _pass_through_programs:
-            cmd.extend(args)
-        else:
-            args_list = list(args)
-            if len(args) > 0 and not (
-                str(args[0]).endswith("__") or str(args[0]).startswith("-")
-            ):
-                cmd.append(param_fmt("from", args_list.pop(0)))
-            for a in args_list:
-                if a.endswith("__") and a.rstrip("_") in _res_param_no_vals.union(
-                    _res_param_maybe
-                ):
-                    cmd.append("-{}".format(a.rstrip("_")))
-                elif a.startswith("-") and a.lstrip("-") in _res_param_no_vals.union(
-                    _res_param_maybe
-                ):
-                    cmd.append(a)
-                else:
-                    e = (
-                        "only accepts 1 non-keyword argument "
-                        "(and sets it to from= ) "
-                        "not sure what to do with " + a
-                    )
-                    raise IndexError(e)
+        if self.program not in _pass_through_programs:
+            if _check_names:
+                schema.check(
+                    self.program, environ["ISISROOT"], isis_kwargs, _check_types
+                )
             cmd.extend(map(param_fmt, isis_kwargs.keys(), isis_kwargs.values()))
         return _run_isis_program(cmd, subprocess_kwargs)
 
-    # Then add it, by name to the enclosing module.
-    setattr(sys.modules[__name__], fn_name, isis_fn)
-    # Could have also used sys.modules['kalasiris'] if I wanted to be explicit.
+    def map(self, froms, max_workers: int = None, **kwargs) -> list:
+        """Returns a list of the results of calling this BoundProgram
+        with each of *froms*, in order.
+
+        The value of each keyword argument must be a sequence of the
+        same length as *froms*, and the calls are made with the
+        corresponding elements, for example::
+
+            b.map(['a.cub', 'b.cub'], to=['a.map.cub', 'b.map.cub'])
+
+        The calls are made in parallel by up to *max_workers* threads
+        (see :class:`concurrent.futures.ThreadPoolExecutor`), and the
+        first exception raised by any of them is raised.
+        """
+        froms = list(froms)
+        vectors = {k: list(v) for k, v in kwargs.items()}
+        for k, v in vectors.items():
+            if len(v) != len(froms):
+                raise ValueError(
+                    f"There are {len(v)} values for {k}, but {len(froms)} froms."
+                )
+
+        def call(i):
+            return self(froms[i], **{k: v[i] for k, v in vectors.items()})
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, range(len(froms))))
+
+
+def bind(program: str, *args, **kwargs) -> BoundProgram:
+    """Returns a :class:`BoundProgram` for the ISIS *program* with these
+    arguments, for when a program is called many times with the same
+    parameters, except for a few, like FROM= and TO=::
+
+        cam2map = isis.bind("cam2map", map="some.map", pixres="mpp")
+        for cub in cubes:
+            cam2map(cub, to=cub.with_suffix(".map.cub"))
+
+    The persistent preferences (see :func:`set_persistent_preferences`)
+    are those that were set when :func:`bind` was called.
+    """
+    return BoundProgram(program, *args, **kwargs)
 
 
 def _get_isis_program_names():
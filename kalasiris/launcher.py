@@ -0,0 +1,431 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Provides a small launcher process which starts ISIS programs on behalf
+of kalasiris.
+
+When the 'launcher' spawn backend is selected (please see
+:func:`kalasiris.set_spawn_backend`), each ISIS program is started by
+a launcher, which is a separate Python interpreter that only has
+kalasiris loaded, and so is cheap to fork, rather than by your
+(possibly very large) Python process.  The launcher sends back the
+program's output as it is written, and its return code and resource
+usage.
+
+By default, a private launcher is started for each Python process, and
+exits when that process does.  Alternately, a single launcher can be
+run as a daemon on a node, and shared by all of the Python processes
+on it, which also limits how many ISIS programs run at once on the
+node::
+
+    $> python -m kalasiris.launcher --max-jobs 16 /tmp/kalasiris.sock
+
+and then in each of the Python processes::
+
+    import kalasiris as isis
+
+    isis.set_spawn_backend('launcher', address='/tmp/kalasiris.sock')
+
+The ISIS programs that a shared launcher runs have its environment
+(the kalasiris.environ in the launcher), unless a different *env* is
+given for a particular call.
+
+The launcher listens on a Unix socket, and each request is a connection
+that sends a line of JSON with the command, and receives lines of JSON
+with the output, and finally the results.  If a request has a timeout,
+and the program runs for longer than that, the launcher kills its whole
+process group, and reports that it timed out.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+# Like the kalasiris module, this only imports from the Standard Library.
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import kalasiris
+from kalasiris import spawn
+
+# The keyword arguments for subprocess.run() that run() handles:
+_launcher_kwargs = {
+    "env",
+    "check",
+    "stdout",
+    "stderr",
+    "universal_newlines",
+    "text",
+    "encoding",
+    "errors",
+    "cwd",
+    "timeout",
+    "start_new_session",
+}
+
+# Those that are given to stream(), or are handled by the launcher:
+_stream_kwargs = {"env", "stdout", "stderr", "cwd", "timeout", "start_new_session"}
+
+# The programs run in a cwd are run by this shell command:
+_cd_exec = 'cd "$0" && exec "$@"'
+
+# These are private "globals" to the launcher module:
+_address = None
+_send_env = True
+_helper = None
+_helper_address = None
+_helper_lock = threading.Lock()
+
+
+def _to_str(b: bytes) -> str:
+    # JSON can only carry strings, this round-trips any bytes.
+    return None if b is None else b.decode("utf-8", errors="surrogateescape")
+
+
+def _to_bytes(s: str) -> bytes:
+    return None if s is None else s.encode("utf-8", errors="surrogateescape")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        env = request.get("env")
+        if env is None:
+            env = self.server.env
+        send_lock = threading.Lock()
+
+        def send(message: dict):
+            # If the client has gone away, the program is still waited for.
+            with send_lock:
+                try:
+                    self.wfile.write((json.dumps(message) + "\n").encode())
+                    self.wfile.flush()
+                except OSError:
+                    pass
+
+        def forward(name: str, fd: int):
+            with open(fd, "rb", closefd=True) as f:
+                while True:
+                    chunk = f.read1(65536)
+                    if not chunk:
+                        break
+                    send({name: _to_str(chunk)})
+
+        timeout = request.get("timeout")
+        # A program that may be killed leads its own process group, so
+        # that any processes it started are killed with it.
+        setsid = timeout is not None or bool(request.get("start_new_session"))
+        with self.server.jobs:
+            cmd = request["cmd"]
+            try:
+                if request.get("cwd") is not None:
+                    cmd = ["/bin/sh", "-c", _cd_exec, request["cwd"]] + cmd
+                (pid, readers) = spawn.start(
+                    cmd,
+                    env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    setsid=setsid,
+                )
+            except OSError as err:
+                send(
+                    dict(errno=err.errno, strerror=err.strerror, filename=err.filename)
+                )
+                return
+            threads = list(
+                threading.Thread(target=forward, args=(name, readers[fd]), daemon=True)
+                for fd, name in ((1, "stdout"), (2, "stderr"))
+            )
+            for t in threads:
+                t.start()
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+
+            def remaining():
+                return None if deadline is None else max(0, deadline - time.monotonic())
+
+            for t in threads:
+                t.join(remaining())
+            returncode = None
+            if not any(t.is_alive() for t in threads):
+                (returncode, rusage) = spawn.wait(pid, remaining())
+            if returncode is None:
+                spawn.kill(pid, setsid)
+                for t in threads:
+                    t.join()
+                (_, rusage) = spawn.wait(pid)
+                send(dict(timeout=timeout, rusage=rusage))
+                return
+
+        send(dict(returncode=returncode, rusage=rusage))
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A server on the Unix socket at *address* which runs the programs
+    it is asked to, each in its own thread, but no more than *max_jobs*
+    of them at once (if it is not None), the rest wait their turn.
+
+    The programs are run with *env* as their environment, unless a
+    request provides one, which defaults to ``kalasiris.environ``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: os.PathLike, max_jobs: int = None, env: dict = None):
+        super().__init__(str(address), _Handler)
+        if max_jobs is None:
+            self.jobs = contextlib.nullcontext()
+        else:
+            self.jobs = threading.BoundedSemaphore(max_jobs)
+        self.env = dict(kalasiris.environ) if env is None else env
+
+
+def serve(address: os.PathLike, max_jobs: int = None, watch_stdin=False):
+    """Runs a :class:`Server` on the Unix socket at *address* until it is
+    interrupted, or if *watch_stdin* is True, until its standard input
+    is closed.
+
+    Once the socket is ready, "ready" is written to standard output.
+    """
+    with Server(address, max_jobs=max_jobs) as server:
+        if watch_stdin:
+
+            def watch():
+                sys.stdin.buffer.read()
+                server.shutdown()
+
+            threading.Thread(target=watch, daemon=True).start()
+        print("ready", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            Path(address).unlink(missing_ok=True)
+
+
+def start(address: os.PathLike = None, max_jobs: int = None) -> str:
+    """Starts a private launcher process with a :class:`Server` on the
+    Unix socket at *address*, or in a new temporary directory if
+    *address* is None, and returns the address, which :func:`run` then
+    uses.
+
+    If a private launcher is already running, its address is returned.
+    It is stopped by :func:`stop`, or when this process exits.
+    """
+    global _address
+    global _send_env
+    global _helper
+    global _helper_address
+    with _helper_lock:
+        # The private launcher inherited this process's environment, but
+        # kalasiris.environ may have been changed since.
+        _send_env = True
+        if _helper is not None and _helper.poll() is None:
+            _address = _helper_address
+            return _address
+        if address is None:
+            address = Path(tempfile.mkdtemp(prefix="kalasiris_")) / "launcher.sock"
+        args = [sys.executable, "-m", "kalasiris.launcher", "--watch-stdin"]
+        if max_jobs is not None:
+            args.append(f"--max-jobs={max_jobs}")
+        _helper = subprocess.Popen(
+            args + [str(address)], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        if _helper.stdout.readline().strip() != b"ready":
+            _helper.kill()
+            _helper.wait()
+            _helper = None
+            raise RuntimeError(f"The launcher did not start at {address}.")
+        _helper_address = str(address)
+        _address = _helper_address
+        atexit.register(stop)
+        return _address
+
+
+def stop():
+    """Stops the private launcher process started by :func:`start`, if
+    any."""
+    global _address
+    global _helper
+    global _helper_address
+    with _helper_lock:
+        if _helper is None:
+            return
+        _helper.stdin.close()
+        try:
+            _helper.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _helper.kill()
+            _helper.wait()
+        _helper.stdout.close()
+        _helper = None
+        Path(_helper_address).unlink(missing_ok=True)
+        try:
+            Path(_helper_address).parent.rmdir()
+        except OSError:
+            pass
+        if _address == _helper_address:
+            _address = None
+        _helper_address = None
+
+
+def connect(address: os.PathLike):
+    """Sets :func:`run` to use the shared launcher on the Unix socket at
+    *address*, or if *address* is None, to go back to using a private
+    launcher.
+
+    The programs are run with the shared launcher's environment, unless
+    an *env* other than ``kalasiris.environ`` is given to :func:`run`.
+    """
+    global _address
+    global _send_env
+    if address is not None:
+        stop()
+    with _helper_lock:
+        _address = None if address is None else str(address)
+        _send_env = address is None
+
+
+def stream(
+    cmd: list,
+    env: dict = None,
+    cwd: os.PathLike = None,
+    timeout: float = None,
+    start_new_session=False,
+):
+    """Runs *cmd* with the launcher, starting a private one if needed,
+    and yields two-tuples as the program runs: ('stdout', bytes) and
+    ('stderr', bytes) with whatever it writes, and then finally
+    ('returncode', int) and ('rusage', dict).
+
+    If *env* is None, the program is run with the launcher's
+    environment, and if *cwd* is given, in that directory.  An OSError
+    is raised if the program can't be started.
+
+    If *timeout* is given, the program is run in a new session, and if
+    it runs for longer than *timeout* seconds, its process group is
+    killed, and ('timeout', float) is yielded instead of the return
+    code.  If *start_new_session* is True, it is run in a new session
+    regardless.
+    """
+    address = _address if _address is not None else start()
+    request = dict(
+        cmd=list(str(c) for c in cmd),
+        env=None if env is None else dict(env),
+        cwd=None if cwd is None else str(cwd),
+        timeout=timeout,
+        start_new_session=start_new_session,
+    )
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(address)
+        with s.makefile("rwb") as f:
+            f.write((json.dumps(request) + "\n").encode())
+            f.flush()
+            for line in f:
+                message = json.loads(line)
+                if "errno" in message:
+                    raise OSError(
+                        message["errno"], message["strerror"], message["filename"]
+                    )
+                elif "returncode" in message or "timeout" in message:
+                    for name in ("returncode", "timeout", "rusage"):
+                        if name in message:
+                            yield (name, message[name])
+                    return
+                for name, value in message.items():
+                    yield (name, _to_bytes(value))
+    raise ConnectionError(f"The launcher at {address} did not finish {cmd}.")
+
+
+def run(cmd: list, **kwargs) -> subprocess.CompletedProcess:
+    """Runs *cmd* with the launcher (see :func:`stream`), taking the same
+    keyword arguments as :func:`subprocess.run`.
+
+    The launcher can only capture *stdout* and *stderr*, so if they are
+    not :data:`subprocess.PIPE`, or if any other keyword arguments than
+    *env*, *check*, *universal_newlines*, *text*, *encoding*, *errors*,
+    *cwd*, *timeout*, and *start_new_session* are given,
+    :func:`.spawn.posix_spawn_run` is used instead.
+
+    If the program times out, the launcher kills its process group, and
+    :exc:`subprocess.TimeoutExpired` is raised.
+    """
+    if (
+        not set(kwargs).issubset(_launcher_kwargs)
+        or kwargs.get("stdout") != subprocess.PIPE
+        or kwargs.get("stderr") != subprocess.PIPE
+    ):
+        return spawn.posix_spawn_run(cmd, **kwargs)
+
+    env = kwargs.get("env")
+    if not _send_env and env is kalasiris.environ:
+        env = None
+
+    outputs = dict(stdout=list(), stderr=list())
+    results = dict()
+    for name, value in stream(
+        cmd,
+        env=env,
+        cwd=kwargs.get("cwd"),
+        timeout=kwargs.get("timeout"),
+        start_new_session=kwargs.get("start_new_session", False),
+    ):
+        if name in outputs:
+            outputs[name].append(value)
+        else:
+            results[name] = value
+
+    if "timeout" in results:
+        err = subprocess.TimeoutExpired(
+            cmd,
+            results["timeout"],
+            output=b"".join(outputs["stdout"]),
+            stderr=b"".join(outputs["stderr"]),
+        )
+        err.rusage = results["rusage"]
+        raise err
+
+    return spawn.completed(
+        cmd,
+        results["returncode"],
+        b"".join(outputs["stdout"]),
+        b"".join(outputs["stderr"]),
+        rusage=results["rusage"],
+        **{k: v for k, v in kwargs.items() if k not in _stream_kwargs},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Runs a launcher for ISIS programs on a Unix socket."
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        help="The most ISIS programs that will be run at once.",
+    )
+    parser.add_argument(
+        "--watch-stdin",
+        action="store_true",
+        help="Exit when standard input is closed.",
+    )
+    parser.add_argument("address", help="The path of the Unix socket.")
+    args = parser.parse_args()
+    serve(args.address, max_jobs=args.max_jobs, watch_stdin=args.watch_stdin)
+
+
+if __name__ == "__main__":
+    main()
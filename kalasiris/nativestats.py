@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Computes the statistics that the ISIS ``stats`` program does, but
+directly from the pixels of a cube, in Python.
+
+The :func:`.nativestats.stats` function returns a dictionary with
+the same keys (and string values) that :func:`.stats_k` does, so it can be
+used in its place::
+
+    import kalasiris as isis
+    import kalasiris.nativestats
+
+    d = isis.stats_k('some.cub')
+    native_d = kalasiris.nativestats.stats('some.cub')
+
+The cube is memory-mapped and read in blocks, so it never needs to be
+entirely held in memory, and no ISIS program is run.  You can also ask
+:func:`.stats_k` to use this module rather than ISIS ``stats`` with
+:func:`.set_stats_backend`, or to run both and log any differences,
+which you can also get directly from :func:`.nativestats.compare`.
+
+Similarly, :func:`.nativestats.cubenorm_stats` computes the per-column
+(or per-row) statistics that the ISIS ``cubenorm`` program does, and
+:func:`.nativestats.write_cubenorm_stats` writes them to a file that
+``cubenorm`` can read with its FROMSTATS= parameter, so that ISIS
+``cubenorm`` only needs to be run once::
+
+    kalasiris.nativestats.write_cubenorm_stats('some.cub', 'some.stats')
+    isis.cubenorm('some.cub', to='norm.cub', fromstats='some.stats',
+                  statsource='table')
+
+Unlike the rest of kalasiris, this module requires the numpy and pvl
+libraries.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import math
+import os
+
+import numpy as np
+
+import kalasiris as isis
+from kalasiris import cube, cubenormfile, specialpixels
+
+# The special pixel types in the order that they should be identified,
+# for UnsignedByte pixels, the Null, Lrs, and Lis values are the same, as
+# are the His and Hrs values, and ISIS reads them as Null and Hrs.
+special_names = ("Null", "Hrs", "Lrs", "Lis", "His")
+
+# The pixel types for which the histogram has one bin per DN.
+_dn_histogram_types = {"UnsignedByte": 256, "SignedWord": 65536, "UnsignedWord": 65536}
+
+# The number of histogram bins for the other pixel types.
+histogram_bins = 65536
+
+# About how many pixels cubenorm_stats() reads at once, for columns.
+slab_pixels = 2**22
+
+
+def classify(raw, pixel_type: str) -> tuple:
+    """Returns a two-element tuple, the first element is a dictionary
+    whose keys are the names in :data:`special_names` and whose values
+    are the number of those special pixels in the numpy array *raw*,
+    and the second element is a boolean numpy array which is true
+    where the pixels of *raw* are not special pixels.
+
+    The *pixel_type* is the Core Pixels Type of the cube, like
+    'SignedWord' or 'Real'.
+    """
+    special = getattr(specialpixels, pixel_type)
+    valid = np.ones(raw.shape, dtype=bool)
+    counts = dict()
+    for name in special_names:
+        is_special = valid & (raw == getattr(special, name))
+        counts[name] = int(np.count_nonzero(is_special))
+        valid &= ~is_special
+
+    return counts, valid
+
+
+def stats(
+    cube_path: os.PathLike, band=None, validmin=None, validmax=None, label=None
+) -> dict:
+    """Returns the statistics of the *band* of the ISIS cube at *cube_path*
+    as a Python Dictionary.
+
+    The dictionary has the same keys as that returned by
+    :func:`.stats_k`, and its values are strings.  If *band* is not
+    given, the last band is used, since that is what :func:`.stats_k`
+    would return for a multi-band cube.
+
+    Pixels with values less than *validmin* or greater than *validmax*
+    are excluded, and counted, like the ISIS ``stats`` VALIDMIN and
+    VALIDMAX parameters.
+
+    The moments, extrema, and special pixel counts are gathered in
+    one pass through the pixels, block by block, and the blocks are
+    combined with the parallel algorithm of Chan et al.  The Median
+    and Mode come from a histogram, which for 8- and 16-bit pixels has
+    one bin per DN, and is gathered in the same pass.  For the
+    other pixel types, there are :data:`histogram_bins` bins between the
+    Minimum and Maximum, which needs a second pass.
+
+    If the cube label has already been read by the pvl library, it
+    can be provided as *label*.
+    """
+    if label is None:
+        label = cube.load_label(cube_path)
+    core = label["IsisCube"]["Core"]
+    if band is None:
+        band = int(core["Dimensions"]["Bands"])
+    pixel_type = core["Pixels"]["Type"]
+    base = float(core["Pixels"].get("Base", 0.0))
+    multiplier = float(core["Pixels"].get("Multiplier", 1.0))
+
+    if pixel_type in _dn_histogram_types:
+        dn_offset = int(np.iinfo(cube.pixel_types[pixel_type]).min)
+        hist = np.zeros(_dn_histogram_types[pixel_type], dtype=np.int64)
+    else:
+        hist = None
+
+    def valid_values(raw, valid):
+        # Returns the valid raw and scaled values, and the number of those
+        # that are under and over the valid range.
+        raw = raw[valid]
+        values = raw.astype(np.float64) * multiplier + base
+        keep = np.ones(values.shape, dtype=bool)
+        under = over = 0
+        if validmin is not None:
+            keep &= values >= validmin
+            under = int(values.size - np.count_nonzero(keep))
+        if validmax is not None:
+            is_over = keep & (values > validmax)
+            over = int(np.count_nonzero(is_over))
+            keep &= ~is_over
+        return raw[keep], values[keep], under, over
+
+    specials = dict.fromkeys(special_names, 0)
+    total_pixels = under = over = 0
+    count = 0
+    mean = m2 = total = 0.0
+    minimum = math.inf
+    maximum = -math.inf
+    for raw in cube.pixel_blocks(cube_path, band, label):
+        total_pixels += raw.size
+        (block_specials, valid) = classify(raw, pixel_type)
+        for k, v in block_specials.items():
+            specials[k] += v
+        (raw_v, values, block_under, block_over) = valid_values(raw, valid)
+        under += block_under
+        over += block_over
+
+        n = values.size
+        if n == 0:
+            continue
+        block_sum = float(values.sum())
+        block_mean = block_sum / n
+        block_m2 = float(np.square(values - block_mean).sum())
+
+        delta = block_mean - mean
+        new_count = count + n
+        mean += delta * n / new_count
+        m2 += block_m2 + delta**2 * count * n / new_count
+        count = new_count
+        total += block_sum
+        minimum = min(minimum, float(values.min()))
+        maximum = max(maximum, float(values.max()))
+
+        if hist is not None:
+            hist += np.bincount(raw_v.astype(np.int64) - dn_offset, minlength=hist.size)
+
+    if count > 0:
+        if hist is not None:
+            median = (_percentile_bin(hist, count) + dn_offset) * multiplier + base
+            mode = (int(np.argmax(hist)) + dn_offset) * multiplier + base
+        elif minimum == maximum:
+            median = mode = minimum
+        else:
+            hist = np.zeros(histogram_bins, dtype=np.int64)
+            for raw in cube.pixel_blocks(cube_path, band, label):
+                (block_specials, valid) = classify(raw, pixel_type)
+                values = valid_values(raw, valid)[1]
+                hist += np.histogram(
+                    values, bins=histogram_bins, range=(minimum, maximum)
+                )[0]
+            width = (maximum - minimum) / histogram_bins
+            median = minimum + (_percentile_bin(hist, count) + 0.5) * width
+            mode = minimum + (int(np.argmax(hist)) + 0.5) * width
+
+        variance = m2 / (count - 1) if count > 1 else 0.0
+        std = math.sqrt(variance)
+        skew = 3 * (mean - median) / std if std != 0 else 0.0
+        moments = list(
+            repr(float(x))
+            for x in (mean, std, variance, median, mode, skew, minimum, maximum, total)
+        )
+    else:
+        moments = ["N/A"] * 9
+
+    d = dict(From=str(cube_path), Band=str(band))
+    d.update(
+        zip(
+            (
+                "Average",
+                "StandardDeviation",
+                "Variance",
+                "Median",
+                "Mode",
+                "Skew",
+                "Minimum",
+                "Maximum",
+                "Sum",
+            ),
+            moments,
+        )
+    )
+    d["TotalPixels"] = str(total_pixels)
+    d["ValidPixels"] = str(count)
+    d["OverValidMaximumPixels"] = str(over)
+    d["UnderValidMinimumPixels"] = str(under)
+    for name in ("Null", "Lis", "Lrs", "His", "Hrs"):
+        d[f"{name}Pixels"] = str(specials[name])
+
+    return d
+
+
+def _percentile_bin(hist, count: int, percent=50) -> int:
+    """Returns the index of the first bin of *hist* where the cumulative
+    count of the *count* values reaches *percent*."""
+    return int(np.searchsorted(np.cumsum(hist), count * percent / 100))
+
+
+def compare(
+    cube_path: os.PathLike, band=None, rtol=1e-6, isis_dict=None, native_dict=None
+) -> dict:
+    """Returns a dictionary of the differences between the results of
+    :func:`.stats_k` and :func:`.nativestats.stats` for the *band* of the
+    cube at *cube_path*.
+
+    The keys of the returned dictionary are those whose values differ,
+    and the values are two-element tuples of the ISIS and the native
+    values.  Numbers are compared with the relative tolerance *rtol*.
+    If nothing differs, the returned dictionary is empty.
+
+    If the result of :func:`.stats_k` or :func:`.nativestats.stats` is
+    already known, it can be provided as *isis_dict* or *native_dict*.
+    """
+    if isis_dict is None:
+        from_ = cube_path if band is None else f"{cube_path}+{band}"
+        isis_dict = isis.stats_k(from_)
+    if native_dict is None:
+        native_dict = stats(cube_path, band=band)
+
+    diffs = dict()
+    for k in native_dict.keys():
+        if k == "From":
+            continue
+        isis_v = isis_dict.get(k)
+        native_v = native_dict[k]
+        try:
+            if math.isclose(float(isis_v), float(native_v), rel_tol=rtol):
+                continue
+        except (TypeError, ValueError):
+            if isis_v == native_v:
+                continue
+        diffs[k] = (isis_v, native_v)
+
+    return diffs
+
+
+def cubenorm_stats(
+    cube_path: os.PathLike, direction="column", band=None, label=None
+) -> dict:
+    """Returns a dictionary of the statistics of each column (or row,
+    if *direction* is 'row') of the ISIS cube at *cube_path*, like
+    those that ISIS ``cubenorm`` writes to its STATS= file.
+
+    The keys of the dictionary are the :data:`.cubenormfile.fieldnames`,
+    and the values are numpy arrays, with one element for each column
+    (or row) of each band, or of just *band*, if it is given.  The
+    StdDev is the sample standard deviation, and the Median is the
+    lower median of the valid pixels.  Special pixels are excluded, and
+    if a column or row has no valid pixels, its statistics are the ISIS
+    Null value.
+
+    For rows, the cube is read in blocks of lines.  For columns, it is
+    read in slabs of as many columns as have about :data:`slab_pixels`
+    pixels, since all of the pixels of a column are needed for its
+    median.
+    """
+    if direction.lower() not in ("column", "row"):
+        raise ValueError(f"The direction ({direction}) must be 'column' or 'row'.")
+    if label is None:
+        label = cube.load_label(cube_path)
+    core = label["IsisCube"]["Core"]
+    if band is None:
+        bands = range(1, int(core["Dimensions"]["Bands"]) + 1)
+    else:
+        bands = [band]
+
+    def column_slabs(b):
+        width = max(1, slab_pixels // int(core["Dimensions"]["Lines"]))
+        for s in range(0, int(core["Dimensions"]["Samples"]), width):
+            blocks = cube.pixel_blocks(cube_path, b, label, samples=slice(s, s + width))
+            yield np.concatenate(list(blocks)).T
+
+    chunks = list()
+    for b in bands:
+        if direction.lower() == "column":
+            blocks = column_slabs(b)
+        else:
+            blocks = cube.pixel_blocks(cube_path, b, label)
+        start = 1
+        for raw in blocks:
+            d = _unit_stats(raw, core["Pixels"])
+            d["Band"] = np.full(raw.shape[0], b, dtype=np.int64)
+            d["RowCol"] = np.arange(start, start + raw.shape[0], dtype=np.int64)
+            start += raw.shape[0]
+            chunks.append(d)
+
+    return {
+        n: np.concatenate(list(c[n] for c in chunks)) for n in cubenormfile.fieldnames
+    }
+
+
+def _unit_stats(raw, pixels) -> dict:
+    """Returns a dictionary of the statistics of each row of the
+    two-dimensional array of *raw* pixels."""
+    (specials, valid) = classify(raw, pixels["Type"])
+    values = raw.astype(np.float64) * float(pixels.get("Multiplier", 1.0)) + float(
+        pixels.get("Base", 0.0)
+    )
+    count = np.count_nonzero(valid, axis=1)
+    has_valid = count > 0
+    safe_count = np.maximum(count, 1)
+
+    mean = np.where(valid, values, 0).sum(axis=1) / safe_count
+    m2 = np.square(np.where(valid, values - mean[:, np.newaxis], 0)).sum(axis=1)
+    std = np.sqrt(np.where(count > 1, m2 / np.maximum(count - 1, 1), 0))
+    minimum = np.where(valid, values, np.inf).min(axis=1)
+    maximum = np.where(valid, values, -np.inf).max(axis=1)
+
+    # Invalid pixels sort to the end.
+    ordered = np.sort(np.where(valid, values, np.inf), axis=1)
+    median = np.take_along_axis(
+        ordered, np.maximum(count - 1, 0)[:, np.newaxis] // 2, axis=1
+    )[:, 0]
+
+    d = dict(ValidPoints=count.astype(np.int64))
+    for k, v in zip(
+        ("Average", "Median", "StdDev", "Minimum", "Maximum"),
+        (mean, median, std, minimum, maximum),
+    ):
+        d[k] = np.where(has_valid, v, specialpixels.Double.Null)
+    return d
+
+
+def write_cubenorm_stats(
+    cube_path: os.PathLike, to, direction="column", band=None, label=None
+):
+    """Writes the statistics from :func:`.nativestats.cubenorm_stats`
+    with a :class:`.cubenormfile.DictWriter` to *to*, which is either a
+    path or a file object open for writing.
+
+    The floating point values are written with six significant digits,
+    as ISIS ``cubenorm`` does.
+    """
+    if isinstance(to, (str, os.PathLike)):
+        with open(to, "w") as f:
+            return write_cubenorm_stats(
+                cube_path, f, direction=direction, band=band, label=label
+            )
+
+    d = cubenorm_stats(cube_path, direction=direction, band=band, label=label)
+
+    columns = list()
+    for n in cubenormfile.fieldnames:
+        if d[n].dtype.kind == "i":
+            columns.append(list(map(str, d[n].tolist())))
+        else:
+            columns.append(list(f"{v:g}" for v in d[n].tolist()))
+
+    writer = cubenormfile.DictWriter(to)
+    writer.writeheader()
+    writer.writerows(dict(zip(cubenormfile.fieldnames, row)) for row in zip(*columns))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Provides the parameters of ISIS programs, as described by the XML
+files in $ISISROOT/bin/xml, so that the arguments given to a kalasiris
+ISIS program function can be checked before the program is run.
+
+By default, the names of the keyword arguments are checked, and the
+values can also be checked with :func:`.set_parameter_checks`::
+
+    import kalasiris as isis
+
+    isis.set_parameter_checks(names=True, types=True)
+    isis.cam2map('some.cub', too='out.cub')  # Raises a ValueError.
+
+Each program's XML file is only read the first time that it is needed.
+If a program's XML file is empty, or can't be parsed, its arguments
+are not checked.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+# Like the kalasiris module, this only imports from the Standard Library.
+import collections
+import functools
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+Parameter = collections.namedtuple("Parameter", ["name", "type", "options"])
+Parameter.__doc__ = """The *name* of an ISIS program parameter (in
+upper case), its *type*, like 'cube', 'integer', or 'double', and a tuple
+of the allowed values (in upper case) if it has a list of *options*,
+otherwise None."""
+
+# The values in a -batchlist run are substituted for these:
+_batch_var_re = re.compile(r"^\$\d+$")
+
+_true_false = {"TRUE", "FALSE", "YES", "NO", "T", "F", "Y", "N", "ON", "OFF"}
+
+
+def parameters(program: str, isisroot: str) -> dict:
+    """Returns a dictionary whose keys are the names of the parameters
+    of the ISIS *program* (in upper case), and whose values are
+    :class:`Parameter` objects, from its XML file in the
+    bin/xml directory of *isisroot*.
+
+    Returns None if the XML file doesn't exist, is empty, or can't be
+    parsed.
+    """
+    return _parameters(str(Path(isisroot) / "bin" / "xml" / f"{program}.xml"))
+
+
+@functools.lru_cache(maxsize=None)
+def _parameters(xml_path: str) -> dict:
+    try:
+        root = ET.parse(xml_path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+
+    params = dict()
+    for p in root.iter("parameter"):
+        name = p.get("name")
+        if name is None:
+            continue
+        options = None
+        option_list = p.find("list")
+        if option_list is not None:
+            options = tuple(
+                o.get("value").upper()
+                for o in option_list.findall("option")
+                if o.get("value") is not None
+            )
+        params[name.upper()] = Parameter(
+            name.upper(), p.findtext("type", default="").strip().lower(), options
+        )
+    if len(params) == 0:
+        return None
+    return params
+
+
+def _resolve(names, given: str, what: str, program: str) -> str:
+    """Returns the one element of *names* that is *given* or that
+    *given* is an abbreviation of, as ISIS allows, or raises ValueError."""
+    if given in names:
+        return given
+    matches = list(n for n in names if n.startswith(given))
+    if len(matches) == 1:
+        return matches[0]
+    if len(matches) == 0:
+        raise ValueError(
+            f"{given} is not a {what} of {program}, which are: {', '.join(names)}"
+        )
+    raise ValueError(
+        f"{given} is an ambiguous {what} of {program}, it could be: "
+        f"{', '.join(matches)}"
+    )
+
+
+def check(program: str, isisroot: str, kwargs: dict, types=False):
+    """Raises a ValueError if any of the keys of *kwargs* (as given to
+    a kalasiris ISIS program function, with any trailing underbars) are
+    not names of the parameters of *program*, or, if *types* is True,
+    if their values are not of the right type, or one of the allowed
+    options.
+
+    Keys that end in two underbars are reserved parameters, and are not
+    checked, nor are values like $1, which are substituted in a
+    -batchlist run.  If the program's parameters can't be determined, nothing
+    is checked.
+    """
+    params = parameters(program, isisroot)
+    if params is None:
+        return
+
+    for key, value in kwargs.items():
+        if key.endswith("__"):
+            continue
+        name = _resolve(params.keys(), key.rstrip("_").upper(), "parameter", program)
+        if types:
+            _check_value(params[name], value, program)
+
+
+def _check_value(param: Parameter, value, program: str):
+    """Raises a ValueError if *value* is not right for *param*."""
+    v = str(value)
+    if _batch_var_re.match(v):
+        return
+    try:
+        if param.type == "integer":
+            int(v)
+        elif param.type == "double":
+            float(v)
+        elif param.type == "boolean" and v.upper() not in _true_false:
+            raise ValueError
+    except ValueError:
+        raise ValueError(
+            f"The {param.name} parameter of {program} must be {param.type}, "
+            f"not {v}."
+        ) from None
+
+    if param.options:
+        _resolve(param.options, v.upper(), f"{param.name} option", program)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Provides ways of starting ISIS programs other than
+:func:`subprocess.run`.
+
+When the Python process that runs an ISIS program is large (say it has
+a few gigabytes of numpy arrays loaded), the fork that
+:func:`subprocess.run` may use to start each program gets slow.  These
+are the backends that kalasiris can use, please see
+:func:`kalasiris.set_spawn_backend`:
+
+subprocess
+    The default, :func:`subprocess.run`.
+
+posix_spawn
+    The program is started by :func:`os.posix_spawn`, which does not
+    copy the Python process, and it is waited for with :func:`os.wait4`,
+    so its resource usage is known.
+
+launcher
+    The program is started by a small helper process, please see the
+    :mod:`kalasiris.launcher` module.
+
+All of them return a :class:`subprocess.CompletedProcess`, and the
+ones other than 'subprocess' return the :class:`.spawn.CompletedProcess`
+subclass, whose *rusage* attribute has the resource usage of the program.
+The :exc:`subprocess.CalledProcessError` and
+:exc:`subprocess.TimeoutExpired` that they raise have the same *rusage*
+attribute, since the runs that fail are as worth knowing about.
+
+If a program is run with keyword arguments for :func:`subprocess.run`
+that a backend doesn't support (like *cwd* or *pass_fds* for
+'posix_spawn'), it is run with :func:`subprocess.run` instead.
+
+If a program is given a *timeout* and *start_new_session* is True, and
+it times out, its whole process group is killed, not just the program
+(:func:`subprocess.run` only kills the program), please see
+:func:`.spawn.popen_run`.
+"""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+# Like the kalasiris module, this only imports from the Standard Library.
+import errno
+import io
+import locale
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+
+backends = ("subprocess", "posix_spawn", "launcher")
+
+# The keyword arguments for subprocess.run() that posix_spawn_run() handles:
+_posix_spawn_kwargs = {
+    "env",
+    "check",
+    "stdout",
+    "stderr",
+    "universal_newlines",
+    "text",
+    "encoding",
+    "errors",
+    "timeout",
+    "start_new_session",
+}
+
+# Set a logger:
+logger = logging.getLogger(__name__)
+
+
+class CompletedProcess(subprocess.CompletedProcess):
+    """A :class:`subprocess.CompletedProcess` which also has the resource
+    usage of the program as *rusage*, a dictionary of the fields of
+    :func:`resource.getrusage`, like 'ru_maxrss' (the peak resident
+    set size, in kilobytes on Linux), or None if that isn't known.
+    """
+
+    def __init__(self, args, returncode, stdout=None, stderr=None, rusage=None):
+        super().__init__(args, returncode, stdout, stderr)
+        self.rusage = rusage
+
+
+def rusage_dict(rusage) -> dict:
+    """Returns a dictionary of the ru_* fields of the *rusage* from
+    :func:`os.wait4`."""
+    return {k: getattr(rusage, k) for k in dir(rusage) if k.startswith("ru_")}
+
+
+def exitcode(status: int) -> int:
+    """Returns the return code of a process from its wait *status*, which
+    is negative if it was killed by a signal, like
+    :attr:`subprocess.Popen.returncode`."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def which(program: str, env: dict = None) -> str:
+    """Returns the path to *program*, found on the PATH in *env*, or on
+    the PATH of this process if *env* is None, like :func:`subprocess.run`
+    does, or raises FileNotFoundError."""
+    if os.sep in program:
+        return program
+    path = None if env is None else env.get("PATH", os.defpath)
+    found = shutil.which(program, path=path)
+    if found is None:
+        raise FileNotFoundError(
+            errno.ENOENT, f"No such file or directory: {program!r}", program
+        )
+    return found
+
+
+def completed(
+    cmd: list,
+    returncode: int,
+    stdout: bytes,
+    stderr: bytes,
+    rusage: dict = None,
+    check=False,
+    universal_newlines=None,
+    text=None,
+    encoding=None,
+    errors=None,
+) -> CompletedProcess:
+    """Returns a :class:`.spawn.CompletedProcess` from the results of
+    running *cmd*, with *stdout* and *stderr* decoded as
+    :func:`subprocess.run` would for the given *universal_newlines*,
+    *text*, *encoding*, and *errors*.
+
+    If *check* is True and the *returncode* is not zero, a
+    :exc:`subprocess.CalledProcessError` is raised instead, with the
+    *rusage* as its attribute of the same name.
+    """
+    if text or universal_newlines or encoding or errors:
+        if encoding is None:
+            encoding = locale.getpreferredencoding(False)
+        (stdout, stderr) = (
+            None
+            if b is None
+            else io.TextIOWrapper(
+                io.BytesIO(b), encoding=encoding, errors=errors
+            ).read()
+            for b in (stdout, stderr)
+        )
+    if check and returncode != 0:
+        err = subprocess.CalledProcessError(returncode, cmd, stdout, stderr)
+        err.rusage = rusage
+        raise err
+    return CompletedProcess(cmd, returncode, stdout, stderr, rusage)
+
+
+def _read_all(fd: int, chunks: list):
+    with open(fd, "rb", closefd=True) as f:
+        while True:
+            chunk = f.read1(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+
+def kill(pid: int, group=False):
+    """Kills the process *pid*, or if *group* is True, the process group
+    that it leads, if it is still there."""
+    try:
+        if group:
+            os.killpg(pid, signal.SIGKILL)
+        else:
+            os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def popen_run(cmd: list, timeout: float = None, check=False, **kwargs):
+    """Runs *cmd* like :func:`subprocess.run`, taking the same keyword
+    arguments, except *input*, but if it times out and
+    *start_new_session* is True, kills its whole process group, so that
+    any processes it started are killed too.
+    """
+    with subprocess.Popen(cmd, **kwargs) as process:
+        try:
+            (stdout, stderr) = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill(process.pid, kwargs.get("start_new_session", False))
+            (stdout, stderr) = process.communicate()
+            raise subprocess.TimeoutExpired(
+                process.args, timeout, output=stdout, stderr=stderr
+            )
+        except BaseException:
+            kill(process.pid, kwargs.get("start_new_session", False))
+            raise
+        returncode = process.poll()
+    if check and returncode:
+        raise subprocess.CalledProcessError(returncode, process.args, stdout, stderr)
+    return subprocess.CompletedProcess(process.args, returncode, stdout, stderr)
+
+
+def start(cmd: list, env: dict = None, stdout=None, stderr=None, setsid=False) -> tuple:
+    """Starts *cmd* with :func:`os.posix_spawn`, and returns a two-tuple
+    of its process id and a dictionary whose keys are 1 (for stdout)
+    and 2 (for stderr) and whose values are the file descriptors to read
+    them from, if *stdout* and *stderr* were :data:`subprocess.PIPE`.
+
+    The *stdout* and *stderr* can also be None, :data:`subprocess.DEVNULL`,
+    a file descriptor, or a file object, and *stderr* can be
+    :data:`subprocess.STDOUT`.  The process must be waited for with
+    :func:`.spawn.wait`.  If *setsid* is True, it is started in a new
+    session, and so leads a new process group.
+    """
+    path = which(str(cmd[0]), env)
+    argv = list(str(c) for c in cmd)
+
+    file_actions = list()
+    readers = dict()
+    writers = list()
+    for fd, target in ((1, stdout), (2, stderr)):
+        if target is None:
+            continue
+        elif target == subprocess.PIPE:
+            (r, w) = os.pipe()
+            readers[fd] = r
+            writers.append(w)
+            file_actions.append((os.POSIX_SPAWN_DUP2, w, fd))
+        elif target == subprocess.DEVNULL:
+            file_actions.append((os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0))
+        elif target == subprocess.STDOUT and fd == 2:
+            file_actions.append((os.POSIX_SPAWN_DUP2, 1, 2))
+        else:
+            fileno = target if isinstance(target, int) else target.fileno()
+            file_actions.append((os.POSIX_SPAWN_DUP2, fileno, fd))
+
+    try:
+        pid = os.posix_spawn(
+            path,
+            argv,
+            os.environ if env is None else env,
+            file_actions=file_actions,
+            setsid=setsid,
+        )
+    except BaseException:
+        for fd in list(readers.values()) + writers:
+            os.close(fd)
+        raise
+    for w in writers:
+        os.close(w)
+
+    return (pid, readers)
+
+
+def wait(pid: int, timeout: float = None) -> tuple:
+    """Waits for the process *pid* to finish, and returns a two-tuple of
+    its return code, and its resource usage as a dictionary.
+
+    If *timeout* seconds pass first, (None, None) is returned.
+    """
+    if timeout is None:
+        (_, status, rusage) = os.wait4(pid, 0)
+        return (exitcode(status), rusage_dict(rusage))
+
+    deadline = time.monotonic() + timeout
+    while True:
+        (p, status, rusage) = os.wait4(pid, os.WNOHANG)
+        if p != 0:
+            return (exitcode(status), rusage_dict(rusage))
+        if time.monotonic() >= deadline:
+            return (None, None)
+        time.sleep(min(0.01, max(0, deadline - time.monotonic())))
+
+
+def posix_spawn_run(cmd: list, **kwargs) -> subprocess.CompletedProcess:
+    """Runs *cmd* with :func:`os.posix_spawn`, and waits for it with
+    :func:`os.wait4`, taking the same keyword arguments as
+    :func:`subprocess.run`.
+
+    If any of *kwargs* are not among those that this function handles
+    (*env*, *check*, *stdout*, *stderr*, *universal_newlines*, *text*,
+    *encoding*, *errors*, *timeout*, and *start_new_session*),
+    :func:`subprocess.run` is used instead.
+    """
+    if not hasattr(os, "posix_spawn") or not set(kwargs).issubset(_posix_spawn_kwargs):
+        logger.debug(f"Using subprocess.run() rather than posix_spawn for {cmd}")
+        return subprocess.run(cmd, **kwargs)
+
+    timeout = kwargs.pop("timeout", None)
+    setsid = kwargs.pop("start_new_session", False)
+    (pid, readers) = start(
+        cmd,
+        kwargs.get("env"),
+        kwargs.get("stdout"),
+        kwargs.get("stderr"),
+        setsid=setsid,
+    )
+    outputs = {fd: list() for fd in readers}
+    threads = list(
+        threading.Thread(target=_read_all, args=(r, outputs[fd]), daemon=True)
+        for fd, r in readers.items()
+    )
+    for t in threads:
+        t.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    returncode = None
+    for t in threads:
+        t.join(None if deadline is None else max(0, deadline - time.monotonic()))
+    if not any(t.is_alive() for t in threads):
+        (returncode, rusage) = wait(
+            pid, None if deadline is None else max(0, deadline - time.monotonic())
+        )
+    if returncode is None:
+        kill(pid, setsid)
+        for t in threads:
+            t.join()
+        err = subprocess.TimeoutExpired(
+            cmd,
+            timeout,
+            output=b"".join(outputs[1]) if 1 in outputs else None,
+            stderr=b"".join(outputs[2]) if 2 in outputs else None,
+        )
+        (_, err.rusage) = wait(pid)
+        raise err
+
+    return completed(
+        cmd,
+        returncode,
+        b"".join(outputs[1]) if 1 in outputs else None,
+        b"".join(outputs[2]) if 2 in outputs else None,
+        rusage=rusage,
+        **{k: v for k, v in kwargs.items() if k not in ("env", "stdout", "stderr")},
+    )
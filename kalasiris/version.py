@@ -4,6 +4,16 @@
 
 Most of the time, the only thing you'll probably need is the
 version_info() function which returns an ISISversion tuple.
+
+If you need to know whether the ISIS underlying kalasiris can do
+something, the capabilities() function returns a dictionary that
+answers that, which is faster than comparing version numbers::
+
+    if version.capabilities()["batchlist"]:
+        ...
+
+Both of these only read files the first time that they are called for
+a particular ``kalasiris.environ["ISISROOT"]``.
 """
 
 # Copyright 2019-2024, Ross A. Beyer (rbeyer@seti.org)
@@ -14,11 +24,13 @@ version_info() function which returns an ISISversion tuple.
 
 import collections
 import datetime
+import functools
 import os
 import re
+import types
 from pathlib import Path
 
-from kalasiris import environ
+import kalasiris
 
 
 class ISISversion(
@@ -48,16 +60,76 @@ def version_info() -> ISISversion:
     """Returned :func:`collections.namedtuple` of ISIS version information
     for the ISIS system underlying kalasiris.  If you want to answer,
     "What version of ISIS is being used?"  This is the function you're after.
-    It is modeled after :func:`sys.version_info`."""
+    It is modeled after :func:`sys.version_info`.
+
+    The result is cached for each value of ``kalasiris.environ["ISISROOT"]``,
+    see :func:`clear_cache`."""
+    return _version_info(kalasiris.environ["ISISROOT"])
+
+
+@functools.lru_cache(maxsize=None)
+def _version_info(isisroot: str) -> ISISversion:
     for fn in ("isis_version.txt", "version"):
         try:
-            return get_from_file(Path(environ["ISISROOT"]) / fn)
+            return get_from_file(Path(isisroot) / fn)
         except FileNotFoundError:
             continue
     else:
-        raise FileNotFoundError(
-            f"No such file: {Path(environ['ISISROOT']) / 'isis_version.txt'}"
-        )
+        raise FileNotFoundError(f"No such file: {Path(isisroot) / 'isis_version.txt'}")
+
+
+def capabilities() -> types.MappingProxyType:
+    """Returns a read-only dictionary which describes what the ISIS system
+    underlying kalasiris has or can do, with these keys:
+
+    version
+        The :class:`ISISversion` from :func:`version_info`, or None if
+        it could not be determined.
+
+    isis_version.txt
+        True if $ISISROOT/isis_version.txt exists (ISIS 3.6 and later),
+        rather than $ISISROOT/version.
+
+    xml
+        True if $ISISROOT/bin/xml exists, which has the XML files that
+        describe each program (the conda distributions).
+
+    isisdata
+        True if the ISISDATA environment variable is used, rather than
+        ISIS3DATA.
+
+    batchlist
+        True if programs accept the -batchlist=, -errlist=, and -onerror=
+        reserved parameters.
+
+    The result is cached for each value of ``kalasiris.environ["ISISROOT"]``
+    (and whether it has ISISDATA), see :func:`clear_cache`.
+    """
+    return _capabilities(kalasiris.environ["ISISROOT"], "ISISDATA" in kalasiris.environ)
+
+
+@functools.lru_cache(maxsize=None)
+def _capabilities(isisroot: str, isisdata: bool) -> types.MappingProxyType:
+    try:
+        v = _version_info(isisroot)
+    except (FileNotFoundError, ValueError):
+        v = None
+    c = {
+        "version": v,
+        "isis_version.txt": (Path(isisroot) / "isis_version.txt").exists(),
+        "xml": (Path(isisroot) / "bin" / "xml").is_dir(),
+        "isisdata": isisdata,
+        "batchlist": v is not None and v.major >= 3,
+    }
+    return types.MappingProxyType(c)
+
+
+def clear_cache():
+    """Forgets the cached results of :func:`version_info` and
+    :func:`capabilities`, which you would only need to do if the
+    ISIS installation at an ISISROOT has changed."""
+    _version_info.cache_clear()
+    _capabilities.cache_clear()
 
 
 def get_from_string(s: str) -> ISISversion:
@@ -10,8 +10,12 @@
 # top level of this library.
 
 import contextlib
+import io
+import sys
+import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import kalasiris as isis
 from kalasiris.version import version_info
@@ -205,6 +209,68 @@ DN,Pixels,CumulativePixels,Percent,CumulativePercent
     def test_values(self):
         self.assertEqual("0", list(self.h.values())[-1])
 
+    def test_init_stream(self):
+        f = io.StringIO(self.h.histinfo)
+        h = isis.Histogram(f)
+        self.assertEqual(107, len(h))
+        self.assertEqual(self.h.dictionary, h.dictionary)
+        self.assertEqual(self.h.hist_list, h.hist_list)
+
+    def test_parse_stream(self):
+        lines = iter(self.h.histinfo.splitlines(keepends=True))
+        (d, fieldnames, rows) = isis.Histogram.parse_stream(lines)
+        self.assertEqual(17, len(d))
+        self.assertEqual(self.h.headers, fieldnames)
+        self.assertEqual("8230", rows[-1].DN)
+
+    def test_from_text(self):
+        h = isis.Histogram.from_text(self.h.histinfo)
+        self.assertEqual(107, len(h))
+        self.assertRaises(ValueError, isis.Histogram.from_text, "Not\nhist")
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "test.hist"
+            p.write_text(self.h.histinfo)
+            with patch.object(sys.modules["kalasiris.Histogram"], "hist_k") as m_hk:
+                for h in (isis.Histogram.from_file(p), isis.Histogram(p)):
+                    with self.subTest(h=h):
+                        self.assertEqual(107, len(h))
+                        self.assertEqual(p, h.histinfo)
+                m_hk.assert_not_called()
+
+    def test_from_cube(self):
+        with patch.object(
+            sys.modules["kalasiris.Histogram"],
+            "hist_k",
+            return_value=self.h.histinfo,
+        ) as m_hk:
+            h = isis.Histogram.from_cube("dummy.cub", nbins=10)
+            self.assertEqual(107, len(h))
+            m_hk.assert_called_once_with("dummy.cub", nbins=10)
+            m_hk.reset_mock()
+
+            with tempfile.TemporaryDirectory() as d:
+                cube = Path(d) / "dummy.cub"
+                cube.write_text("Object = IsisCube\n")
+                h = isis.Histogram(cube)
+                self.assertEqual(107, len(h))
+                m_hk.assert_called_once_with(cube)
+                m_hk.reset_mock()
+
+            h = isis.Histogram("dummy.cub+2")
+            self.assertEqual(107, len(h))
+            m_hk.assert_called_once_with("dummy.cub+2")
+            m_hk.reset_mock()
+
+            self.assertRaises(FileNotFoundError, isis.Histogram, "dummy.cub")
+            m_hk.assert_not_called()
+
+    def test_parse_stream_fail(self):
+        self.assertRaises(
+            StopIteration, isis.Histogram.parse_stream, ["Cube: foo.cub\n"]
+        )
+
 
 @unittest.skipUnless(run_real_files, run_real_files_reason)
 class TestHistogram_filesystem(unittest.TestCase):
@@ -250,3 +316,111 @@ class TestHistogram_filesystem(unittest.TestCase):
     def test_len(self):
         h = isis.Histogram(self.histfile)
         self.assertEqual(107, len(h))
+
+
+class TestHistogramMerge(unittest.TestCase):
+    def setUp(self):
+        self.h1 = isis.Histogram(
+            """Cube:           a.cub
+Band:           1
+Average:        2
+Std Deviation:  1
+Variance:       1
+Median:         2
+Mode:           2
+Skew:           0
+Minimum:        1
+Maximum:        3
+
+Total Pixels:    4
+Valid Pixels:    3
+Null Pixels:     1
+Lis Pixels:      0
+Lrs Pixels:      0
+His Pixels:      0
+Hrs Pixels:      0
+
+
+MinInclusive,MaxExclusive,Pixels,CumulativePixels,Percent,CumulativePercent
+1,2,1,1,33.3333,33.3333
+2,3,1,2,33.3333,66.6667
+3,4,1,3,33.3333,100"""
+        )
+        self.h2 = isis.Histogram(
+            """Cube:           b.cub
+Band:           1
+Average:        4
+Std Deviation:  1
+Variance:       1
+Median:         4
+Mode:           4
+Skew:           0
+Minimum:        3
+Maximum:        5
+
+Total Pixels:    3
+Valid Pixels:    3
+Null Pixels:     0
+Lis Pixels:      0
+Lrs Pixels:      0
+His Pixels:      0
+Hrs Pixels:      0
+
+
+MinInclusive,MaxExclusive,Pixels,CumulativePixels,Percent,CumulativePercent
+3,4,1,1,33.3333,33.3333
+4,5,1,2,33.3333,66.6667
+5,6,1,3,33.3333,100"""
+        )
+
+    def test_add(self):
+        h = self.h1 + self.h2
+        self.assertIsInstance(h, isis.Histogram)
+        self.assertEqual(5, len(h))
+        self.assertEqual("2", h[2].Pixels)
+        self.assertEqual("4", h[2].CumulativePixels)
+        self.assertEqual("100", h[-1].CumulativePercent)
+        self.assertEqual("a.cub b.cub", h["Cube"])
+        self.assertEqual("1", h["Band"])
+        self.assertEqual("7", h["Total Pixels"])
+        self.assertEqual("6", h["Valid Pixels"])
+        self.assertEqual("1", h["Null Pixels"])
+        self.assertEqual("3", h["Average"])
+        # The sample variance of 1, 2, 3, 3, 4, 5:
+        self.assertAlmostEqual(2.0, float(h["Variance"]))
+        self.assertEqual("1", h["Minimum"])
+        self.assertEqual("5", h["Maximum"])
+        self.assertEqual("3.5", h["Mode"])
+
+    def test_merge(self):
+        h = isis.Histogram.merge([self.h1, self.h2, self.h1])
+        self.assertEqual("9", h["Valid Pixels"])
+        self.assertEqual("3", h[2].Pixels)
+        self.assertEqual(
+            h["Valid Pixels"], sum([self.h1, self.h2, self.h1])["Valid Pixels"]
+        )
+
+    def test_merge_text(self):
+        h = isis.Histogram.merge([self.h1.histinfo, self.h2.histinfo])
+        self.assertEqual("6", h["Valid Pixels"])
+
+    def test_merge_fail(self):
+        self.assertRaises(ValueError, isis.Histogram.merge, [])
+        h3 = isis.Histogram(self.h2.histinfo.replace("\n3,4,", "\n2.5,4,"))
+        self.assertRaises(ValueError, isis.Histogram.merge, [self.h1, h3])
+
+    def test_merge_empty(self):
+        # Histograms of bands with no valid pixels have all-zero bins.
+        empty = self.h1.histinfo.replace(",1,1,33.3333,33.3333", ",0,0,0,0")
+        empty = empty.replace(",1,2,33.3333,66.6667", ",0,0,0,0")
+        empty = empty.replace(",1,3,33.3333,100", ",0,0,0,0")
+        h = isis.Histogram.merge([empty, empty])
+        self.assertEqual(3, len(h))
+        self.assertEqual("0", h[0].Pixels)
+        self.assertEqual("0", h[-1].CumulativePercent)
+
+    def test_merge_bin_values(self):
+        h3 = isis.Histogram(self.h2.histinfo.replace("\n3,4,", "\n3.0,4.0,"))
+        h = isis.Histogram.merge([self.h1, h3])
+        self.assertEqual(5, len(h))
+        self.assertEqual("2", h[2].Pixels)
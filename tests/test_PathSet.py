@@ -10,6 +10,7 @@
 # top level of this library.
 
 import contextlib
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -65,3 +66,55 @@ class TestPathSet(unittest.TestCase):
         ps.unlink()
         for p in ps:
             self.assertFalse(p.exists())
+
+
+class TestPathSetConsumers(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.paths = list(Path(self.tempdir.name) / f"{i}.cub" for i in range(3))
+        for p in self.paths:
+            p.write_bytes(bytes(10))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_release(self):
+        for background in (False, True):
+            with self.subTest(background=background):
+                for p in self.paths:
+                    p.write_bytes(bytes(10))
+                ps = isis.PathSet(background=background)
+                (a, b) = (ps.add(self.paths[0], consumers=2), ps.add(self.paths[1]))
+                self.assertEqual(2, ps.consumers(a))
+                self.assertIsNone(ps.consumers(b))
+                self.assertRaises(ValueError, ps.add, self.paths[2], consumers=0)
+                self.assertRaises(ValueError, ps.release, b)
+
+                self.assertFalse(ps.release(a))
+                self.assertIn(a, ps)
+                self.assertTrue(ps.release(a))
+                self.assertNotIn(a, ps)
+                self.assertEqual(10, ps.wait())
+                self.assertFalse(a.exists())
+                self.assertTrue(b.exists())
+                self.assertRaises(ValueError, ps.release, a)
+
+    def test_unlink(self):
+        ps = isis.PathSet(self.paths)
+        self.assertEqual(30, ps.unlink())
+        for p in self.paths:
+            self.assertFalse(p.exists())
+        self.assertRaises(FileNotFoundError, ps.unlink)
+        self.assertEqual(0, ps.unlink(missing_ok=True))
+        self.assertEqual(30, ps.reclaimed)
+
+    def test_unlink_background(self):
+        ps = isis.PathSet(self.paths, background=True)
+        self.assertIsNone(ps.unlink())
+        self.assertEqual(30, ps.wait())
+        for p in self.paths:
+            self.assertFalse(p.exists())
+        ps.unlink()
+        self.assertRaises(FileNotFoundError, ps.wait)
+        ps.unlink(missing_ok=True)
+        self.assertEqual(30, ps.wait())
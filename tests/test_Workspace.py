@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `Workspace` class."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import kalasiris as isis
+
+
+class TestWorkspace(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.fast = Path(self.tempdir.name) / "fast"
+        self.slow = Path(self.tempdir.name) / "slow"
+        self.fast.mkdir()
+        self.slow.mkdir()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_release(self):
+        with isis.Workspace(fast=self.fast, slow=self.slow) as ws:
+            a = ws.path("a.cub")
+            b = ws.path("b.cub", consumers=2)
+            self.assertEqual(self.fast, a.parent.parent)
+            self.assertRaises(ValueError, ws.path, "a.cub")
+            self.assertRaises(ValueError, ws.path, "c.cub", consumers=0)
+            a.write_text("a")
+            b.write_text("b")
+
+            self.assertTrue(ws.release(a))
+            self.assertFalse(a.exists())
+            self.assertRaises(ValueError, ws.release, a)
+
+            self.assertFalse(ws.release(b))
+            self.assertTrue(b.exists())
+            self.assertTrue(ws.release(b))
+            self.assertFalse(b.exists())
+
+            c = ws.path("c.cub")
+            c.write_text("c")
+        self.assertFalse(c.exists())
+        self.assertEqual([], list(self.fast.iterdir()))
+
+    def test_quota(self):
+        with isis.Workspace(fast=self.fast, slow=self.slow, quota=10) as ws:
+            a = ws.path("a.cub")
+            a.write_bytes(bytes(8))
+            self.assertEqual(8, ws.usage())
+            b = ws.path("b.cub")
+            self.assertEqual(self.fast, b.parent.parent)
+            c = ws.path("c.cub", size=4)
+            self.assertEqual(self.slow, c.parent.parent)
+            b.write_bytes(bytes(4))
+            d = ws.path("d.cub")
+            self.assertEqual(self.slow, d.parent.parent)
+            self.assertRaises(ValueError, ws.path, "c.cub")
+
+            ws.release(a)
+            self.assertEqual(4, ws.usage())
+            e = ws.path("e.cub", size=4)
+            self.assertEqual(self.fast, e.parent.parent)
+        self.assertEqual([], list(self.slow.iterdir()))
+
+    def test_background(self):
+        with isis.Workspace(fast=self.fast, slow=self.slow, background=True) as ws:
+            a = ws.path("a.cub")
+            a.write_bytes(bytes(8))
+            self.assertTrue(ws.release(a))
+            self.assertEqual(8, ws.paths.wait())
+            self.assertFalse(a.exists())
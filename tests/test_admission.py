@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `admission` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import json
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import kalasiris.admission as admission
+import kalasiris.kalasiris as isis
+
+
+class TestController(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tempdir.name) / "state"
+        self.running = dict()
+        self.peak = dict()
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def run_many(self, controller, programs):
+        # Runs the programs in threads, and records the peak number of
+        # each that were admitted at once.
+        def run(program):
+            with controller.admit(program):
+                with self.lock:
+                    self.running[program] = self.running.get(program, 0) + 1
+                    total = sum(self.running.values())
+                    self.peak[program] = max(
+                        self.peak.get(program, 0), self.running[program]
+                    )
+                    self.peak["total"] = max(self.peak.get("total", 0), total)
+                time.sleep(0.02)
+                with self.lock:
+                    self.running[program] -= 1
+
+        with ThreadPoolExecutor(max_workers=len(programs)) as executor:
+            list(executor.map(run, programs))
+
+    def test_caps(self):
+        c = admission.Controller(
+            self.path, classes={"cam2map": "heavy"}, caps={"heavy": 1}, poll=0.005
+        )
+        self.run_many(c, ["cam2map"] * 4 + ["getkey"] * 4)
+        self.assertEqual(1, self.peak["cam2map"])
+        self.assertGreater(self.peak["getkey"], 1)
+
+    def test_max_jobs(self):
+        c = admission.Controller(self.path, max_jobs=2, poll=0.005)
+        self.run_many(c, ["getkey"] * 6)
+        self.assertEqual(2, self.peak["total"])
+
+    def test_learned_memory(self):
+        c = admission.Controller(self.path, memory=3 * 2**30, poll=0.005)
+        self.assertEqual(0, c.estimate("cam2map"))
+
+        a = c.acquire("cam2map")
+        a.rusage = {"ru_maxrss": 2**20}  # 1 GiB in kilobytes.
+        c.release(a)
+        a = c.acquire("cam2map")
+        a.rusage = {"ru_maxrss": 2**19}
+        c.release(a)
+        self.assertEqual(2**30, c.estimate("cam2map"))
+
+        # Only three 1 GiB programs fit.
+        self.run_many(c, ["cam2map"] * 6)
+        self.assertEqual(3, self.peak["cam2map"])
+
+        # But one is always admitted, even if it won't fit.
+        c.memory = 2**20
+        self.peak.clear()
+        self.run_many(c, ["cam2map"] * 2)
+        self.assertEqual(1, self.peak["cam2map"])
+
+    def test_dead_process(self):
+        p = subprocess.Popen(["true"])
+        p.wait()
+        state = {
+            "running": {
+                "x": {"program": "jigsaw", "pid": p.pid, "memory": 0, "class": "heavy"}
+            },
+            "maxrss": {},
+        }
+        self.path.write_text(json.dumps(state))
+        c = admission.Controller(
+            self.path, classes={"jigsaw": "heavy"}, caps={"heavy": 1}, poll=0.005
+        )
+        a = c.acquire("jigsaw")
+        c.release(a)
+        self.assertEqual({}, json.loads(self.path.read_text())["running"])
+
+    def test_shared(self):
+        # Two controllers on the same file share their limits.
+        c1 = admission.Controller(self.path, max_jobs=1, poll=0.005)
+        c2 = admission.Controller(self.path, max_jobs=1, poll=0.005)
+        a = c1.acquire("getkey")
+        t = threading.Thread(target=lambda: c2.release(c2.acquire("getkey")))
+        t.start()
+        t.join(0.1)
+        self.assertTrue(t.is_alive())
+        c1.release(a)
+        t.join(5)
+        self.assertFalse(t.is_alive())
+
+    def test_queue(self):
+        # A stream of small programs doesn't keep a large one waiting.
+        gib = 2**30
+        self.path.write_text(
+            json.dumps({"maxrss": {"getkey": gib, "cam2map": 3 * gib}})
+        )
+        c = admission.Controller(self.path, memory=3 * gib, poll=0.005)
+        (a1, a2) = (c.acquire("getkey"), c.acquire("getkey"))
+        order = list()
+
+        def run(program):
+            a = c.acquire(program)
+            order.append(program)
+            return a
+
+        def waiting(n):
+            for _ in range(1000):
+                try:
+                    if len(json.loads(self.path.read_text()).get("waiting", {})) == n:
+                        return
+                except ValueError:
+                    # It was read while being written.
+                    pass
+                time.sleep(0.005)
+            self.fail(f"There were not {n} programs waiting.")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            heavy = executor.submit(run, "cam2map")
+            try:
+                waiting(1)
+                small = executor.submit(run, "getkey")
+                waiting(2)
+
+                # The getkey would fit, but the cam2map was waiting first.
+                c.release(a1)
+                time.sleep(0.1)
+                self.assertEqual([], order)
+            finally:
+                c.release(a1)
+                c.release(a2)
+            c.release(heavy.result(timeout=5))
+            c.release(small.result(timeout=5))
+        self.assertEqual(["cam2map", "getkey"], order)
+
+
+class TestRunIsisProgram(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.controller = admission.Controller(Path(self.tempdir.name) / "state")
+
+    def tearDown(self):
+        isis.set_admission_controller()
+        self.tempdir.cleanup()
+
+    @patch("kalasiris.kalasiris.subprocess.run")
+    def test_admission(self, subp):
+        subp.return_value = subprocess.CompletedProcess([], 0)
+        subp.return_value.rusage = {"ru_maxrss": 100}
+        isis.set_admission_controller(self.controller)
+        with patch.object(
+            self.controller, "acquire", wraps=self.controller.acquire
+        ) as m_acquire:
+            isis.spiceinit("foo.cub")
+            m_acquire.assert_called_once_with("spiceinit")
+        subp.assert_called_once()
+        self.assertEqual(
+            admission.maxrss_bytes({"ru_maxrss": 100}),
+            self.controller.estimate("spiceinit"),
+        )
+
+    @patch("kalasiris.kalasiris.subprocess.run")
+    def test_admission_failed(self, subp):
+        # A program that was killed for using too much memory is recorded.
+        err = subprocess.CalledProcessError(-9, [])
+        err.rusage = {"ru_maxrss": 200}
+        subp.side_effect = err
+        isis.set_admission_controller(self.controller)
+        self.assertRaises(subprocess.CalledProcessError, isis.cam2map, "foo.cub")
+        self.assertEqual(
+            admission.maxrss_bytes({"ru_maxrss": 200}),
+            self.controller.estimate("cam2map"),
+        )
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `capture` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import importlib.util
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import kalasiris as isis
+
+has_pvl = importlib.util.find_spec("pvl") is not None
+has_pvl_reason = "Requires the pvl library."
+
+text = "Cube: foo.cub\\nBand: 1\\n" * 5000
+
+
+class TestTextSink(unittest.TestCase):
+    def test_modes(self):
+        self.assertEqual("file", isis.capture.available_modes()[-1])
+        self.assertEqual(
+            isis.capture.available_modes()[0], isis.capture.get_default_mode()
+        )
+        self.assertRaises(ValueError, isis.capture.TextSink, mode="foo")
+        self.assertRaises(ValueError, isis.capture.set_default_mode, "foo")
+
+    def test_write(self):
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                with isis.capture.TextSink(mode) as sink:
+                    with open(sink.path, "w") as f:
+                        f.write(text)
+                    self.assertEqual(text, sink.read())
+                    path = sink.path
+                if mode != "memfd":
+                    self.assertFalse(path.exists())
+
+    def test_subprocess(self):
+        # The path must be usable by another process.
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                with isis.capture.TextSink(mode) as sink:
+                    subprocess.run(
+                        [
+                            sys.executable,
+                            "-c",
+                            f"open({str(sink.path)!r}, 'w').write({text!r})",
+                        ],
+                        check=True,
+                    )
+                    self.assertEqual(text, sink.read())
+
+    def test_not_written(self):
+        # Nothing ever opens the path, which must not hang.
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                with isis.capture.TextSink(mode) as sink:
+                    self.assertEqual("", sink.read())
+
+    def test_suffix(self):
+        with isis.capture.TextSink("memfd", suffix=".txt") as sink:
+            self.assertEqual(".txt", sink.path.suffix)
+            self.assertEqual("fifo", sink.mode)
+            with open(sink.path, "w") as f:
+                f.write(text)
+            self.assertEqual(text, sink.read())
+
+    def test_reopened(self):
+        # A program may open its output more than once.
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                with isis.capture.TextSink(mode) as sink:
+                    with open(sink.path, "w") as f:
+                        f.write("a")
+                    with open(sink.path, "a") as f:
+                        f.write("b")
+                    self.assertEqual("ab", sink.read())
+
+
+class TestWrap(unittest.TestCase):
+    def setUp(self):
+        self.paths = list()
+
+    def fake_program(self, from_, **kwargs):
+        self.paths.append(Path(kwargs["to"]))
+        if from_ == "bad.cub":
+            raise subprocess.CalledProcessError(1, "fake")
+        with open(kwargs["to"], "w") as f:
+            f.write(f"Group = Results\n  From = {from_}\nEnd_Group\nEnd\n")
+
+    def test_text(self):
+        capture_fn = isis.capture.wrap(self.fake_program)
+        self.assertTrue(capture_fn("a.cub").startswith("Group = Results"))
+        self.assertEqual(
+            "a.cub", isis.capture.wrap(self.fake_program, parser=str.split)("a.cub")[5]
+        )
+        self.assertRaises(ValueError, isis.capture.wrap, self.fake_program, "foo")
+
+    @unittest.skipUnless(has_pvl, has_pvl_reason)
+    def test_pvl(self):
+        label = isis.capture.wrap(self.fake_program, "pvl")("a.cub")
+        self.assertEqual("a.cub", label["Results"]["From"])
+
+    def test_to(self):
+        with tempfile.TemporaryDirectory() as d:
+            to = Path(d) / "out.txt"
+            capture_fn = isis.capture.wrap(self.fake_program)
+            self.assertIn("a.cub", capture_fn("a.cub", to=to))
+            self.assertTrue(to.exists())
+
+    def test_concurrent(self):
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                self.paths.clear()
+                capture_fn = isis.capture.wrap(self.fake_program, mode=mode)
+                froms = list(f"{i}.cub" for i in range(50)) + ["bad.cub"]
+
+                def run(from_):
+                    try:
+                        return capture_fn(from_).split()[5]
+                    except subprocess.CalledProcessError:
+                        return None
+
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    results = list(executor.map(run, froms))
+                self.assertEqual(froms[:-1] + [None], results)
+                if mode != "memfd":
+                    self.assertEqual(len(froms), len(set(self.paths)))
+                    for p in self.paths:
+                        self.assertFalse(p.exists())
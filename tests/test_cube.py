@@ -10,6 +10,7 @@
 # top level of this library.
 
 import contextlib
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -44,6 +45,17 @@ class TestBasic(unittest.TestCase):
     def test_get_startsize_from(self):
         self.assertEqual((9, 20), isis.cube.get_startsize_from(self.d))
 
+    def test_get_label_text(self):
+        label = "Object = IsisCube\n  A = 1\nEnd_Object\nEnd\n"
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "test.cub"
+            p.write_bytes(label.encode() + bytes(10) + b"\xff" * 100 + b"\nEnd\n")
+            for size in (5, 1000):
+                with self.subTest(chunk_size=size):
+                    self.assertEqual(
+                        label.rstrip("\n"), isis.cube.get_label_text(p, size)
+                    )
+
 
 @unittest.skipUnless(run_real_files, run_real_files_reason)
 class TestTable(unittest.TestCase):
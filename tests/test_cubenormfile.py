@@ -11,7 +11,9 @@
 
 import contextlib
 import csv
+import importlib.util
 import io
+import tempfile
 import unittest
 from unittest.mock import call, Mock
 from pathlib import Path
@@ -24,6 +26,9 @@ from .utils import (
 )
 
 
+has_numpy = importlib.util.find_spec("numpy") is not None
+has_numpy_reason = "Requires the numpy library."
+
 # Hardcoding this, but I sure would like a better solution.
 img = Path("test-resources") / "PSP_010502_2090_RED5_0.img"
 
@@ -93,6 +98,105 @@ class TestCubenormFile(unittest.TestCase):
         expected3.append(call.write(line0))
         self.assertEqual(csvfile3.method_calls, expected3)
 
+    def test_writecolumns(self):
+        rows = list(
+            csv.reader(self.stats.splitlines(), dialect=isis.cubenormfile.Dialect)
+        )[1:]
+        columns = list(zip(*rows))
+        for chunk_size in (1, 4, 100):
+            with self.subTest(chunk_size=chunk_size):
+                with io.StringIO() as f:
+                    isis.cubenormfile.writer(f).writecolumns(columns, chunk_size)
+                    self.assertEqual(
+                        "".join(self.stats.splitlines(True)[1:]), f.getvalue()
+                    )
+
+        csvfile = Mock()
+        writer = isis.cubenormfile.writer(csvfile)
+        writer.writecolumns(dict(zip(isis.cubenormfile.fieldnames, columns)), 4)
+        self.assertEqual(2, len(csvfile.method_calls))
+
+        with io.StringIO() as f:
+            isis.cubenormfile.writer(f).writerow(("1", "2"))
+            self.assertEqual("       1       2\n", f.getvalue())
+
+        self.assertRaises(ValueError, writer.writecolumns, columns[:7])
+        self.assertRaises(ValueError, writer.writecolumns, columns[:7] + [("1",)])
+
+    @unittest.skipUnless(has_numpy, has_numpy_reason)
+    def test_writecolumns_numpy(self):
+        import numpy as np
+
+        rng = np.random.default_rng(1)
+        n = 1000
+        columns = [
+            np.ones(n, dtype=np.int32),
+            np.arange(1, n + 1),
+            rng.integers(0, 4000, n),
+            rng.normal(6500, 200, n),
+            rng.normal(6500, 200, n).astype(np.float32),
+            rng.random(n) * 200,
+            np.floor(rng.normal(5000, 200, n)),
+            rng.normal(7000, 200, n).astype(np.float32),
+        ]
+        with io.StringIO() as f1, io.StringIO() as f2:
+            isis.cubenormfile.writer(f1).writerows(zip(*columns))
+            isis.cubenormfile.writer(f2).writecolumns(columns, chunk_size=300)
+            self.assertEqual(f1.getvalue(), f2.getvalue())
+
+    @unittest.skipUnless(has_numpy, has_numpy_reason)
+    def test_read_columns(self):
+        import numpy as np
+
+        rows = list(
+            csv.DictReader(self.stats.splitlines(), dialect=isis.cubenormfile.Dialect)
+        )
+        for f in (io.StringIO(self.stats), io.BytesIO(self.stats.encode())):
+            with self.subTest(f=f):
+                d = isis.cubenormfile.read_columns(f)
+                self.assertEqual(list(isis.cubenormfile.fieldnames), list(d.keys()))
+                for n in isis.cubenormfile.fieldnames:
+                    self.assertEqual(6, len(d[n]))
+                self.assertEqual(np.int64, d["ValidPoints"].dtype)
+                self.assertEqual(np.float64, d["StdDev"].dtype)
+                self.assertEqual([1, 2, 3, 4, 5, 6], d["RowCol"].tolist())
+                self.assertEqual(
+                    list(float(r["Average"]) for r in rows), d["Average"].tolist()
+                )
+
+        # A value too wide for its field, and no header:
+        lines = self.stats.splitlines(True)[1:]
+        lines[1] = lines[1].replace("  187.865", "187.8654321")
+        d = isis.cubenormfile.read_columns(io.StringIO("".join(lines)))
+        self.assertEqual(187.8654321, d["StdDev"][1])
+        self.assertEqual(6, len(d["Band"]))
+
+        # Trailing whitespace:
+        d = isis.cubenormfile.read_columns(io.StringIO(self.stats.replace("\n", " \n")))
+        self.assertEqual(6, len(d["Band"]))
+
+        # A value wider than its whole field runs into the one before it:
+        lines = self.stats.splitlines(True)
+        lines[2] = lines[2].replace("        187.865", "12345678.1878654")
+        self.assertRaisesRegex(
+            ValueError,
+            "wider than its field",
+            isis.cubenormfile.read_columns,
+            io.StringIO("".join(lines)),
+        )
+
+        empty = isis.cubenormfile.read_columns(io.StringIO(""))
+        self.assertEqual(0, len(empty["Band"]))
+
+    @unittest.skipUnless(has_numpy, has_numpy_reason)
+    def test_iter_columns(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "test.stats"
+            path.write_text(self.stats)
+            chunks = list(isis.cubenormfile.iter_columns(path, chunk_size=4))
+        self.assertEqual([4, 2], list(len(c["Median"]) for c in chunks))
+        self.assertEqual([6526, 6303, 6378, 6415], chunks[0]["Median"].tolist())
+
     def test_DictWriter(self):
         columns = list()
         reader = csv.DictReader(
@@ -11,11 +11,15 @@
 
 import contextlib
 import os
+import sys
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 from pathlib import Path
 
 import kalasiris as isis
+from kalasiris.kalasiris import _run_isis_program
 from .utils import (
     real_files as run_real_files,
     real_files_reason as run_real_files_reason,
@@ -109,3 +113,97 @@ class TestFromList_filesystem(unittest.TestCase):
             filename = f
             self.assertTrue(filename.exists())
         self.assertFalse(filename.exists())
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.list = ["a.cub", "b.cub", "c.cub"]
+        self.text = "a.cub\nb.cub\nc.cub\n"
+
+    def test_get(self):
+        with tempfile.TemporaryDirectory() as d:
+            store = isis.fromlist.Store(Path(d) / "store")
+            p1 = store.get(self.list)
+            p2 = store.get(Path(x) for x in self.list)
+            p3 = store.get(self.list[:2])
+            self.assertEqual(p1, p2)
+            self.assertNotEqual(p1, p3)
+            self.assertEqual(self.text, p1.read_text())
+            self.assertEqual(2, len(list(store.directory.iterdir())))
+
+            self.assertFalse(store.release(p1))
+            self.assertTrue(p1.exists())
+            self.assertTrue(store.release(p1))
+            self.assertFalse(p1.exists())
+            self.assertRaises(ValueError, store.release, p1)
+
+            store.cleanup()
+            self.assertFalse(p3.exists())
+            self.assertTrue(store.directory.exists())
+
+    def test_temp(self):
+        with isis.fromlist.Store() as store:
+            with store.temp(self.list) as f:
+                with store.temp(self.list) as f2:
+                    self.assertEqual(f, f2)
+                self.assertEqual(self.text, f.read_text())
+            self.assertFalse(f.exists())
+        self.assertFalse(store.directory.exists())
+
+    def test_threads(self):
+        lists = list([f"{i}.cub", f"{i % 3}.cub"] for i in range(30))
+        with isis.fromlist.Store() as store:
+
+            def use(fl):
+                with store.temp(fl) as f:
+                    return f.read_text()
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                texts = list(executor.map(use, lists * 4))
+            self.assertEqual(list(f"{a}\n{b}\n" for (a, b) in lists * 4), texts)
+            self.assertEqual([], list(store.directory.iterdir()))
+
+
+class TestTempModes(unittest.TestCase):
+    def setUp(self):
+        self.list = list(f"{i}.cub" for i in range(20000))
+        self.text = "".join(f"{x}\n" for x in self.list)
+        self.modes = ["file", "pipe"]
+        if hasattr(os, "memfd_create"):
+            self.modes.append("memfd")
+
+    def test_subprocess(self):
+        # The path must be readable by a program run by kalasiris.
+        code = "import sys; print(open(sys.argv[1][9:]).read(), end='')"
+        for mode in self.modes:
+            with self.subTest(mode=mode):
+                with isis.fromlist.temp(self.list, mode=mode) as f:
+                    if mode != "file":
+                        self.assertTrue(str(f).startswith("/dev/fd/"))
+                    cp = _run_isis_program(
+                        [sys.executable, "-c", code, f"fromlist={f}"],
+                        dict(env=os.environ),
+                    )
+                self.assertEqual(self.text, cp.stdout)
+
+    def test_not_read(self):
+        for mode in self.modes:
+            with self.subTest(mode=mode):
+                with isis.fromlist.temp(self.list, mode=mode):
+                    pass
+
+    def test_default_mode(self):
+        self.assertRaises(ValueError, isis.fromlist.set_default_mode, "foo")
+        self.assertRaises(ValueError, isis.fromlist.temp, self.list, "foo")
+
+        def fake_cubeit(**kwargs):
+            with open(kwargs["fromlist"]) as f:
+                self.assertEqual(self.text, f.read())
+
+        try:
+            isis.fromlist.set_default_mode("pipe")
+            with patch("kalasiris.k_funcs.isis.cubeit", side_effect=fake_cubeit):
+                isis.cubeit_k(self.list, to="stacked.cub")
+        finally:
+            isis.fromlist.set_default_mode()
+        self.assertEqual("file", isis.fromlist.temp(["a.cub"]).mode)
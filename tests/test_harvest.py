@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `harvest` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import csv
+import importlib.util
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import kalasiris as isis
+
+has_pvl = importlib.util.find_spec("pvl") is not None
+has_pvl_reason = "Requires the pvl library."
+has_numpy = importlib.util.find_spec("numpy") is not None
+has_numpy_reason = "Requires the numpy library."
+
+label = """Object = IsisCube
+  Group = Instrument
+    InstrumentId = HIRISE
+    Summing      = {summing}
+    Purpose      = (A, B)
+  End_Group
+End_Object
+End
+"""
+
+
+class TestWalk(unittest.TestCase):
+    def test_walk(self):
+        with tempfile.TemporaryDirectory() as d:
+            top = Path(d)
+            (top / "a" / "b").mkdir(parents=True)
+            for p in ("1.cub", "2.img", "a/3.cub", "a/b/4.cub", "a/b/5.lbl"):
+                (top / p).touch()
+            names = sorted(e.name for e in isis.harvest.walk(top))
+            self.assertEqual(["1.cub", "3.cub", "4.cub"], names)
+            names = sorted(
+                e.name for e in isis.harvest.walk(top, suffixes=(".img", ".lbl"))
+            )
+            self.assertEqual(["2.img", "5.lbl"], names)
+
+
+@unittest.skipUnless(has_pvl, has_pvl_reason)
+class TestHarvest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.top = Path(self.tempdir.name)
+        for i in range(3):
+            (self.top / f"{i}.cub").write_text(label.format(summing=i + 1))
+        (self.top / "bad.cub").write_text("Not a label.")
+        self.keys = [
+            ("Instrument", "Summing"),
+            ("IsisCube/Instrument", "Purpose"),
+            ("Instrument", "Tdi"),
+        ]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_harvest(self):
+        paths = sorted(self.top.glob("*.cub"))
+        with self.assertLogs("kalasiris.harvest", level="WARNING"):
+            t = isis.harvest.harvest(paths, self.keys, max_workers=2)
+        self.assertEqual(
+            [
+                "Path",
+                "Instrument/Summing",
+                "IsisCube/Instrument/Purpose",
+                "Instrument/Tdi",
+            ],
+            list(t.keys()),
+        )
+        self.assertEqual(list(map(str, paths)), t["Path"])
+        self.assertEqual(["1", "2", "3", None], t["Instrument/Summing"])
+        self.assertEqual(["A", "B"], t["IsisCube/Instrument/Purpose"][0])
+        self.assertEqual([None] * 4, t["Instrument/Tdi"])
+
+        out = self.top / "out.csv"
+        isis.harvest.write_csv(t, out)
+        with open(out, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(5, len(rows))
+        self.assertEqual([str(paths[0]), "1", "(A, B)", ""], rows[1])
+
+    def test_cache(self):
+        cache = self.top / "cache.json"
+        t = isis.harvest.harvest(isis.harvest.walk(self.top), self.keys, cache=cache)
+        self.assertTrue(cache.exists())
+
+        (self.top / "1.cub").write_text(label.format(summing=10))
+        with patch(
+            "kalasiris.harvest.isis.getkeys_k", wraps=isis.getkeys_k
+        ) as m_getkeys:
+            t2 = isis.harvest.harvest(
+                isis.harvest.walk(self.top), self.keys, cache=cache
+            )
+            # Only the changed file, and the one that couldn't be read.
+            self.assertEqual(2, m_getkeys.call_count)
+
+        i = t["Path"].index(str(self.top / "1.cub"))
+        self.assertEqual("2", t["Instrument/Summing"][i])
+        i = t2["Path"].index(str(self.top / "1.cub"))
+        self.assertEqual("10", t2["Instrument/Summing"][i])
+
+        with patch(
+            "kalasiris.harvest.isis.getkeys_k", wraps=isis.getkeys_k
+        ) as m_getkeys:
+            isis.harvest.harvest(
+                isis.harvest.walk(self.top), self.keys[:1], cache=cache
+            )
+            # Different keys, so the cache can't be used.
+            self.assertEqual(4, m_getkeys.call_count)
+
+    def test_cache_pruned(self):
+        cache = self.top / "cache.json"
+        isis.harvest.harvest(isis.harvest.walk(self.top), self.keys, cache=cache)
+        (self.top / "0.cub").unlink()
+        isis.harvest.harvest(isis.harvest.walk(self.top), self.keys, cache=cache)
+        files = json.loads(cache.read_text())["files"]
+        self.assertEqual(
+            sorted(str(self.top / f"{i}.cub") for i in (1, 2)), sorted(files.keys())
+        )
+
+    def test_cache_corrupt(self):
+        cache = self.top / "cache.json"
+        for text in ('{"columns": [', '{"files": {}}'):
+            with self.subTest(text=text):
+                cache.write_text(text)
+                with self.assertLogs("kalasiris.harvest", level="WARNING") as cm:
+                    t = isis.harvest.harvest(
+                        sorted(self.top.glob("?.cub")), self.keys, cache=cache
+                    )
+                self.assertIn("cache", cm.output[0])
+                self.assertEqual(["1", "2", "3"], t["Instrument/Summing"])
+                self.assertEqual(3, len(json.loads(cache.read_text())["files"]))
+
+    @unittest.skipUnless(has_numpy, has_numpy_reason)
+    def test_write_npz(self):
+        import numpy as np
+
+        paths = sorted(self.top.glob("?.cub"))
+        t = isis.harvest.harvest(paths, self.keys)
+        out = self.top / "out.npz"
+        isis.harvest.write_npz(t, out)
+        with np.load(out) as npz:
+            self.assertEqual(sorted(t.keys()), sorted(npz.files))
+            self.assertEqual(["1", "2", "3"], npz["Instrument/Summing"].tolist())
+            self.assertEqual("(A, B)", npz["IsisCube/Instrument/Purpose"][0])
+            self.assertEqual(["", "", ""], npz["Instrument/Tdi"].tolist())
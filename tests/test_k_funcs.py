@@ -10,8 +10,11 @@
 # top level of this library.
 
 import contextlib
+import importlib.util
+import math
 import os
 import subprocess
+import tempfile
 import unittest
 from unittest.mock import call, patch, MagicMock, Mock
 from pathlib import Path
@@ -23,6 +26,9 @@ from .utils import (
     real_files_reason as run_real_files_reason,
 )
 
+has_pvl = importlib.util.find_spec("pvl") is not None
+has_pvl_reason = "Requires the pvl library."
+
 # Hardcoding these, but I sure would like a better solution.
 # IsisPreferences = os.path.join('test-resources', 'IsisPreferences')
 HiRISE_img = Path("test-resources") / "PSP_010502_2090_RED5_0.img"
@@ -46,6 +52,109 @@ class Test_getkey_k(unittest.TestCase):
             self.assertEqual(truth, key)
 
 
+class Test_getkeys_k(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cub = Path(self.tempdir.name) / "test.cub"
+        label = """Object = IsisCube
+  Object = Core
+    StartByte = 65537
+    Group = Dimensions
+      Samples = 2048
+      Lines   = 40
+    End_Group
+  End_Object
+
+  Group = Instrument
+    SpacecraftName = "MARS RECONNAISSANCE ORBITER"
+    StartTime      = 2008-10-26T11:57:13.477
+    Summing        = 1
+    Tdi            = 128
+    ExposureTime   = 1.0 <seconds>
+    Purpose        = (A, B, C)
+  End_Group
+End_Object
+
+Object = Table
+  Name = "HiRISE Calibration Ancillary"
+End_Object
+End
+"""
+        self.cub.write_bytes(label.encode() + bytes(100) + b"End\n")
+        self.keys = [
+            ("Instrument", "StartTime"),
+            ("IsisCube/Instrument", "TDI"),
+            ("IsisCube/Core/Dimensions", "Lines"),
+            ("Instrument", "ExposureTime"),
+            ("Instrument", "Purpose"),
+            ("Table", "Name"),
+            ("IsisCube/Core", "StartByte"),
+        ]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    @unittest.skipUnless(has_pvl, has_pvl_reason)
+    def test_pvl(self):
+        with patch("kalasiris.k_funcs.isis.getkey") as m_getkey:
+            d = isis.getkeys_k(self.cub, self.keys)
+            m_getkey.assert_not_called()
+        self.assertEqual(
+            {
+                ("Instrument", "StartTime"): "2008-10-26T11:57:13.477",
+                ("IsisCube/Instrument", "TDI"): "128",
+                ("IsisCube/Core/Dimensions", "Lines"): "40",
+                ("Instrument", "ExposureTime"): "1.0",
+                ("Instrument", "Purpose"): ["A", "B", "C"],
+                ("Table", "Name"): "HiRISE Calibration Ancillary",
+                ("IsisCube/Core", "StartByte"): "65537",
+            },
+            d,
+        )
+        self.assertRaises(KeyError, isis.getkeys_k, self.cub, [("Instrument", "Foo")])
+        self.assertRaises(KeyError, isis.getkeys_k, self.cub, [("Core/Foo", "A")])
+        self.assertEqual(
+            {("Instrument", "Foo"): None, ("Instrument", "Tdi"): "128"},
+            isis.getkeys_k(
+                self.cub,
+                [("Instrument", "Foo"), ("Instrument", "Tdi")],
+                missing_ok=True,
+            ),
+        )
+
+    def test_getkey(self):
+        def fake_getkey(cube, **kwargs):
+            if kwargs.get("grpname") in ("Table", "Core"):
+                raise subprocess.CalledProcessError(1, "getkey")
+            values = {"Purpose": "(A, B, C)"}
+            return Mock(stdout=values.get(kwargs["keyword"], "value") + "\n")
+
+        with patch(
+            "kalasiris.k_funcs.isis.cube.load_label", side_effect=ImportError
+        ), patch("kalasiris.k_funcs.isis.getkey", side_effect=fake_getkey) as m_getkey:
+            d = isis.getkeys_k(self.cub, self.keys)
+            self.assertEqual(["A", "B", "C"], d[("Instrument", "Purpose")])
+            self.assertEqual("value", d[("Table", "Name")])
+            self.assertIn(
+                call(
+                    self.cub,
+                    keyword="Lines",
+                    objname="Core",
+                    grpname="Dimensions",
+                ),
+                m_getkey.call_args_list,
+            )
+            self.assertIn(
+                call(self.cub, objname="Table", keyword="Name"),
+                m_getkey.call_args_list,
+            )
+            self.assertEqual("value", d[("IsisCube/Core", "StartByte")])
+            self.assertIn(
+                call(self.cub, objname="Core", keyword="StartByte"),
+                m_getkey.call_args_list,
+            )
+
+
 @unittest.skipUnless(run_real_files, run_real_files_reason)
 class Test_getkey_k_filesystem(unittest.TestCase):
     def setUp(self):
@@ -100,17 +209,22 @@ class Test_hi2isis_k_filesystem(unittest.TestCase):
 
 
 class Test_hist_k(unittest.TestCase):
-    @patch("kalasiris.k_funcs.isis.hist")
-    def test_run(self, m_hist):
+    def test_run(self):
         hist_txt = "This is hist output."
-        filelike = Mock()
-        filelike.read = Mock(return_value=hist_txt)
-        with patch(
-            "kalasiris.k_funcs.isis.tempfile.NamedTemporaryFile",
-            return_value=filelike,
-        ):
-            hist_as_string = isis.hist_k("dummy.cub")
-            self.assertEqual(hist_as_string, hist_txt)
+
+        def fake_hist(*args, **kwargs):
+            with open(kwargs["to"], "w") as f:
+                f.write(hist_txt)
+
+        for mode in isis.capture.available_modes():
+            with self.subTest(mode=mode):
+                try:
+                    isis.capture.set_default_mode(mode)
+                    with patch("kalasiris.k_funcs.isis.hist", side_effect=fake_hist):
+                        hist_as_string = isis.hist_k("dummy.cub")
+                finally:
+                    isis.capture.set_default_mode()
+                self.assertEqual(hist_as_string, hist_txt)
 
     def test_fail(self):
         # ISIS hist_k needs at least a FROM=, giving it nothing:
@@ -140,6 +254,104 @@ class Test_hist_k_filesystem(unittest.TestCase):
         text_file.unlink()
 
 
+@patch("kalasiris.k_funcs.version.capabilities", return_value={"batchlist": True})
+class Test_batch_k(unittest.TestCase):
+    def setUp(self):
+        self.params = list(
+            {"from": f"{n}.cub", "to": f"{n}.out.cub"} for n in ("a", "b", "c", "b")
+        )
+        self.batchlists = list()
+
+    def fake_spiceinit(self, **kwargs):
+        # Fails for the b cubes, and reports them in the errlist.
+        lines = Path(kwargs["batchlist__"]).read_text().splitlines()
+        self.batchlists.append(lines)
+        errors = list(line for line in lines if line.startswith("b"))
+        if errors:
+            Path(kwargs["errlist__"]).write_text(
+                "".join(e.replace(" ", ",") + "\n" for e in errors)
+            )
+        return subprocess.CompletedProcess(
+            args=[], returncode=1 if errors else 0, stdout="", stderr="err"
+        )
+
+    def test_batch_k(self, m_cap):
+        with patch(
+            "kalasiris.k_funcs.isis.spiceinit", side_effect=self.fake_spiceinit
+        ) as m_spice:
+            with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                failed = isis.batch_k("spiceinit", self.params, web="yes")
+            self.assertEqual([1, 3], failed)
+            m_spice.assert_called_once()
+            self.assertEqual(
+                {
+                    "from": "$1",
+                    "to": "$2",
+                    "web": "yes",
+                    "onerror__": "continue",
+                    "_check": False,
+                },
+                {
+                    k: v
+                    for k, v in m_spice.call_args.kwargs.items()
+                    if not k.endswith("list__")
+                },
+            )
+            self.assertEqual(
+                ["a.cub a.out.cub", "b.cub b.out.cub", "c.cub c.out.cub"],
+                self.batchlists[0][:3],
+            )
+
+    def test_batch_k_chunks(self, m_cap):
+        with patch(
+            "kalasiris.k_funcs.isis.spiceinit", side_effect=self.fake_spiceinit
+        ) as m_spice:
+            with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                failed = isis.batch_k("spiceinit", self.params, max_workers=2)
+            self.assertEqual([1, 3], failed)
+            self.assertEqual(2, m_spice.call_count)
+            self.assertEqual([2, 2], sorted(len(lines) for lines in self.batchlists))
+
+    def test_batch_k_bound(self, m_cap):
+        bound = Mock(spec=isis.BoundProgram, side_effect=self.fake_spiceinit)
+        bound.program = "spiceinit"
+        with self.assertLogs("kalasiris.k_funcs", level="WARNING") as logs:
+            failed = isis.batch_k(bound, self.params)
+        self.assertEqual([1, 3], failed)
+        bound.assert_called_once()
+        self.assertIn("ISIS spiceinit failed", logs.output[0])
+
+    def test_batch_k_whole_chunk(self, m_cap):
+        cp = subprocess.CompletedProcess(args=[], returncode=1, stderr="bad")
+        with patch("kalasiris.k_funcs.isis.spiceinit", return_value=cp):
+            with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                failed = isis.batch_k("spiceinit", self.params, chunk_size=3)
+            self.assertEqual([0, 1, 2, 3], failed)
+
+    def test_batch_k_bad_params(self, m_cap):
+        self.assertEqual([], isis.batch_k("spiceinit", []))
+        self.assertRaises(
+            ValueError, isis.batch_k, "spiceinit", [{"from": "a.cub"}, {"to": "b"}]
+        )
+        self.assertRaises(
+            ValueError, isis.batch_k, "spiceinit", [{"from": "my cube.cub"}]
+        )
+
+    def test_batch_k_fallback(self, m_cap):
+        m_cap.return_value = {"batchlist": False}
+
+        def fake(**kwargs):
+            if kwargs["from"].startswith("b"):
+                raise subprocess.CalledProcessError(1, "spiceinit")
+
+        with patch("kalasiris.k_funcs.isis.spiceinit", side_effect=fake) as m_spice:
+            with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                failed = isis.batch_k("spiceinit", self.params, web="yes")
+            self.assertEqual([1, 3], failed)
+            self.assertEqual(4, m_spice.call_count)
+            m_spice.assert_any_call(web="yes", **self.params[2])
+
+
 class Test_stats_k(unittest.TestCase):
     def test_stats_k(self):
         stats_text = """Group = Results
@@ -184,6 +396,84 @@ End_Group
             Path("print.prt").unlink()
 
 
+class Test_stats_table_k(unittest.TestCase):
+    def setUp(self):
+        self.stats_text = """Group = Results
+  From                    = {cube}
+  Band                    = {band}
+  Average                 = 6498.477293457
+  StandardDeviation       = 181.94624138776
+  Minimum                 = 4117.0
+  TotalPixels             = 2048000
+  ValidPixels             = 2048000
+  NullPixels              = 0
+End_Group
+"""
+
+    def fake_stats(self, from_, **kwargs):
+        cube = str(from_).partition("+")[0]
+        text = self.stats_text.format(cube=cube, band=1)
+        text += self.stats_text.format(cube=cube, band=2)
+        if "to" in kwargs:
+            header = "" if Path(kwargs["to"]).exists() else "From,Band\n"
+            with open(kwargs["to"], "a") as f:
+                f.write(f"{header}{cube},1\n{cube},2\n")
+        return Mock(stdout=text)
+
+    def test_stats_table_k(self):
+        with patch(
+            "kalasiris.k_funcs.isis.stats", side_effect=self.fake_stats
+        ) as m_stats:
+            t = isis.stats_table_k(["a.cub", "b.cub", "c.cub"], max_workers=2)
+            self.assertEqual(3, m_stats.call_count)
+            self.assertEqual(
+                ["a.cub", "a.cub", "b.cub", "b.cub", "c.cub", "c.cub"], t["From"]
+            )
+            self.assertEqual([1, 2, 1, 2, 1, 2], t["Band"])
+            self.assertEqual(6498.477293457, t["Average"][3])
+            self.assertEqual(2048000, t["ValidPixels"][5])
+            self.assertIsInstance(t["NullPixels"][0], int)
+
+    def test_stats_table_k_bands(self):
+        with patch(
+            "kalasiris.k_funcs.isis.stats", side_effect=self.fake_stats
+        ) as m_stats:
+            isis.stats_table_k(["a.cub"], bands=[2, 3], max_workers=1)
+            self.assertEqual(m_stats.call_args_list, [call("a.cub+2"), call("a.cub+3")])
+
+    def test_stats_table_k_to(self):
+        with tempfile.TemporaryDirectory() as d:
+            flat = Path(d) / "flat.csv"
+            with patch("kalasiris.k_funcs.isis.stats", side_effect=self.fake_stats):
+                t = isis.stats_table_k(["a.cub", "b.cub"], to=flat)
+            self.assertEqual(4, len(t["Band"]))
+            lines = flat.read_text().splitlines()
+            self.assertEqual("From,Band", lines[0])
+            self.assertEqual(5, len(lines))
+            self.assertEqual(["a.cub,1", "a.cub,2", "b.cub,1", "b.cub,2"], lines[1:])
+
+    def test_stats_table_k_fail(self):
+        def fake_stats(from_, **kwargs):
+            if from_ == "b.cub":
+                raise subprocess.CalledProcessError(1, "stats")
+            return self.fake_stats(from_, **kwargs)
+
+        failures = list()
+        with tempfile.TemporaryDirectory() as d:
+            flat = Path(d) / "flat.csv"
+            with patch("kalasiris.k_funcs.isis.stats", side_effect=fake_stats):
+                with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                    t = isis.stats_table_k(
+                        ["a.cub", "b.cub", "c.cub"], to=flat, failures=failures
+                    )
+            self.assertEqual(5, len(flat.read_text().splitlines()))
+        self.assertEqual(["a.cub", "a.cub", "b.cub", "c.cub", "c.cub"], t["From"])
+        self.assertEqual([1, 2, None, 1, 2], t["Band"])
+        self.assertTrue(math.isnan(t["Average"][2]))
+        self.assertIsNone(t["ValidPixels"][2])
+        self.assertEqual(["b.cub"], list(f[0] for f in failures))
+
+
 class Test_cubeit_k(unittest.TestCase):
     @patch("kalasiris.k_funcs.isis.cubeit")
     def test_cubeit_k(self, m_cubeit):
@@ -198,6 +488,30 @@ class Test_cubeit_k(unittest.TestCase):
                 [call(fromlist=from_name, to="stacked.cub")],
             )
 
+    def test_cubeit_k_sharded(self):
+        def fake_cubeit(fromlist, to, **kwargs):
+            # Writes the "bands" of the stack, one per line.
+            bands = list()
+            for line in Path(fromlist).read_text().splitlines():
+                if Path(line).exists():
+                    bands.extend(Path(line).read_text().splitlines())
+                else:
+                    bands.append(line)
+            Path(to).write_text("".join(f"{b}\n" for b in bands))
+
+        cubes = list(f"{i}.cub" for i in range(10))
+        with tempfile.TemporaryDirectory() as d:
+            to = Path(d) / "stacked.cub"
+            with patch(
+                "kalasiris.k_funcs.isis.cubeit", side_effect=fake_cubeit
+            ) as m_cubeit:
+                isis.cubeit_k(cubes, max_workers=3, to=to, proplab="a.cub")
+                self.assertEqual(4, m_cubeit.call_count)
+                for c in m_cubeit.call_args_list:
+                    self.assertEqual("a.cub", c.kwargs["proplab"])
+            self.assertEqual(cubes, to.read_text().splitlines())
+            self.assertEqual([to], list(Path(d).iterdir()))
+
     @unittest.skipUnless(run_real_files, run_real_files_reason)
     def test_cubeit_k_files(self):
         a_cube = "test_cubeit_a.cub"
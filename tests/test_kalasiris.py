@@ -10,12 +10,17 @@
 # top level of this library.
 
 import contextlib
+import os
 import subprocess
+import tempfile
+import time
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 import kalasiris.kalasiris as isis
+import kalasiris.spawn as spawn
+from .test_spawn import fake_program
 from .utils import (
     resource_check as rc,
     real_files as run_real_files,
@@ -143,6 +148,211 @@ class Test_Mocks(unittest.TestCase):
                 subp.reset_mock()
                 isis.set_persistent_preferences(None)
 
+    @patch("kalasiris.kalasiris.subprocess.run")
+    def test_pass_fds(self, subp):
+        isis.cubeit(fromlist="/dev/fd/7", to="/dev/fd/3", _pass_fds=(5,))
+        self.subp_defs["pass_fds"] = (3, 5, 7)
+        subp.assert_called_once_with(
+            ["cubeit", "fromlist=/dev/fd/7", "to=/dev/fd/3"], **self.subp_defs
+        )
+
+    @patch("kalasiris.kalasiris.subprocess.run")
+    def test_batchlist(self, subp):
+        isis.spiceinit(
+            from_="$1", batchlist__="b.lis", errlist__="e.lis", onerror__="continue"
+        )
+        subp.assert_called_once_with(
+            [
+                "spiceinit",
+                "from=$1",
+                "-batchlist=b.lis",
+                "-errlist=e.lis",
+                "-onerror=continue",
+            ],
+            **self.subp_defs,
+        )
+        self.assertRaises(IndexError, isis.spiceinit, "foo.cub", "batchlist__")
+        self.assertRaises(IndexError, isis.spiceinit, "foo.cub", "-errlist")
+
+
+@patch("kalasiris.kalasiris.subprocess.run")
+class Test_bind(unittest.TestCase):
+    def setUp(self) -> None:
+        self.subp_defs = dict(
+            check=True,
+            env=isis.environ,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+
+    def test_call(self, subp):
+        cam2map = isis.bind("cam2map", map="some.map", pixres="mpp", _cwd="foo")
+        self.assertEqual(["cam2map", "map=some.map", "pixres=mpp"], cam2map.cmd)
+
+        cam2map("a.cub", to="a.map.cub")
+        cam2map(from_="b.cub", to="b.map.cub", _check=False)
+        self.assertEqual(
+            [
+                call(
+                    cam2map.cmd + ["from=a.cub", "to=a.map.cub"],
+                    **self.subp_defs,
+                    cwd="foo",
+                ),
+                call(
+                    cam2map.cmd + ["from=b.cub", "to=b.map.cub"],
+                    **dict(self.subp_defs, check=False),
+                    cwd="foo",
+                ),
+            ],
+            subp.call_args_list,
+        )
+        # The bound arguments are not changed by the calls.
+        self.assertEqual({"cwd": "foo"}, cam2map.subprocess_kwargs)
+        self.assertRaises(IndexError, cam2map, "a.cub", "b.cub")
+
+    def test_preferences(self, subp):
+        isis.set_persistent_preferences("foo")
+        spiceinit = isis.bind("spiceinit")
+        isis.set_persistent_preferences(None)
+        spiceinit("a.cub")
+        subp.assert_called_once_with(
+            ["spiceinit", "-pref=foo", "from=a.cub"], **self.subp_defs
+        )
+
+    def test_map(self, subp):
+        cam2map = isis.bind("cam2map", pixres="mpp")
+        cps = cam2map.map(["a.cub", "b.cub"], to=["a.map", "b.map"], max_workers=2)
+        self.assertEqual(2, len(cps))
+        self.assertCountEqual(
+            [
+                call(cam2map.cmd + ["from=a.cub", "to=a.map"], **self.subp_defs),
+                call(cam2map.cmd + ["from=b.cub", "to=b.map"], **self.subp_defs),
+            ],
+            subp.call_args_list,
+        )
+        self.assertRaises(ValueError, cam2map.map, ["a.cub", "b.cub"], to=["a.map"])
+
+
+class Test_policy(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.bindir = Path(self.tempdir.name)
+        self.pidfile = self.bindir / "pid"
+        self.counter = self.bindir / "count"
+        # Writes its TO= file, then hangs in a child process.
+        fake_program(
+            self.bindir,
+            "spiceinit",
+            'for a in "$@"; do case "$a" in to=*) echo partial > "${a#to=}";; esac; '
+            f"done\nsleep 30 &\necho $! > {self.pidfile}\nwait",
+        )
+        # Fails with 75 until its third run.
+        fake_program(
+            self.bindir,
+            "getkey",
+            f"n=$(cat {self.counter} 2>/dev/null || echo 0)\n"
+            f"n=$((n + 1))\necho $n > {self.counter}\n"
+            '[ "$n" -ge 3 ] && exit 0\nexit 75',
+        )
+        self.environ = patch.dict(isis.environ, PATH=f"{self.bindir}:{os.defpath}")
+        self.environ.start()
+
+    def tearDown(self):
+        isis.set_policy("spiceinit")
+        isis.set_policy("getkey")
+        isis.set_policy()
+        isis.set_spawn_backend()
+        self.environ.stop()
+        self.tempdir.cleanup()
+
+    def test_set_policy(self):
+        self.assertEqual(isis.Policy(), isis.get_policy("getkey"))
+        isis.set_policy(None, isis.Policy(timeout=60))
+        isis.set_policy("getkey", isis.Policy(retries=2))
+        self.assertEqual(isis.Policy(retries=2), isis.get_policy("getkey"))
+        self.assertEqual(isis.Policy(timeout=60), isis.get_policy("stats"))
+        isis.set_policy("getkey")
+        self.assertEqual(isis.Policy(timeout=60), isis.get_policy("getkey"))
+
+    def test_timeout(self):
+        isis.set_policy("spiceinit", isis.Policy(timeout=0.5))
+        out = self.bindir / "out.cub"
+        for backend in spawn.backends:
+            with self.subTest(backend=backend):
+                isis.set_spawn_backend(backend)
+                start = time.monotonic()
+                with self.assertLogs("kalasiris.kalasiris", level="WARNING"):
+                    self.assertRaises(
+                        subprocess.TimeoutExpired, isis.spiceinit, "a.cub", to=out
+                    )
+                self.assertLess(time.monotonic() - start, 10)
+                self.assertFalse(out.exists())
+
+                # The program's child process was killed, too.
+                pid = int(self.pidfile.read_text())
+                for _ in range(100):
+                    try:
+                        os.kill(pid, 0)
+                    except ProcessLookupError:
+                        break
+                    time.sleep(0.05)
+                else:
+                    self.fail(f"The process {pid} was not killed.")
+
+    def test_timeout_existing(self):
+        isis.set_policy("spiceinit", isis.Policy(timeout=0.5))
+
+        # A file being appended to is never removed.
+        existing = self.bindir / "all.csv"
+        existing.write_text("rows\n")
+        self.assertRaises(
+            subprocess.TimeoutExpired,
+            isis.spiceinit,
+            "a.cub",
+            to=existing,
+            append=True,
+        )
+        self.assertTrue(existing.exists())
+
+        # Nor is a cube that ISIS might have written to, but didn't.
+        cube = self.bindir / "out.cub"
+        cube.write_text("not partial")
+        with self.assertLogs("kalasiris.kalasiris", level="WARNING") as logs:
+            self.assertRaises(
+                subprocess.TimeoutExpired,
+                isis.spiceinit,
+                "a.cub",
+                to=self.bindir / "out",
+            )
+        self.assertFalse((self.bindir / "out").exists())
+        self.assertEqual("not partial", cube.read_text())
+        self.assertEqual(1, len(logs.output))
+
+    def test_retries(self):
+        isis.set_policy("getkey", isis.Policy(retries=2, backoff=0.01, transient={75}))
+        with self.assertLogs("kalasiris.kalasiris", level="WARNING") as logs:
+            cp = isis.getkey("a.cub")
+        self.assertEqual(0, cp.returncode)
+        self.assertEqual(2, len(logs.output))
+
+        self.counter.unlink()
+        isis.set_policy("getkey", isis.Policy(retries=1, backoff=0.01, transient={75}))
+        with self.assertLogs("kalasiris.kalasiris", level="WARNING"):
+            self.assertRaises(subprocess.CalledProcessError, isis.getkey, "a.cub")
+        self.assertEqual("2", self.counter.read_text().strip())
+
+        # Without check, the result of the last attempt is returned.
+        self.counter.unlink()
+        cp = isis.getkey("a.cub", _check=False)
+        self.assertEqual(75, cp.returncode)
+        self.assertEqual("2", self.counter.read_text().strip())
+
+    def test_not_transient(self):
+        isis.set_policy("getkey", isis.Policy(retries=2, transient={1}))
+        self.assertRaises(subprocess.CalledProcessError, isis.getkey, "a.cub")
+        self.assertEqual("1", self.counter.read_text().strip())
+
 
 @unittest.skipUnless(run_real_files, run_real_files_reason)
 class Test_hi2isis(unittest.TestCase):
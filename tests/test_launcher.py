@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `launcher` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import kalasiris
+import kalasiris.launcher as launcher
+from .test_spawn import fake_program
+
+
+class TestLauncher(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.bindir = Path(self.tempdir.name)
+        fake_program(self.bindir, "echoargs", 'echo "$@"; echo oops >&2; exit $#')
+        self.env = {"PATH": str(self.bindir)}
+        self.kwargs = dict(
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.address = launcher.start()
+
+    def tearDown(self):
+        launcher.stop()
+        self.tempdir.cleanup()
+
+    def test_start_stop(self):
+        self.assertTrue(Path(self.address).is_socket())
+        self.assertEqual(self.address, launcher.start())
+        launcher.stop()
+        self.assertFalse(Path(self.address).exists())
+
+    def test_run(self):
+        cp = launcher.run(["echoargs", "from=a.cub"], **self.kwargs)
+        self.assertEqual(1, cp.returncode)
+        self.assertEqual("from=a.cub\n", cp.stdout)
+        self.assertEqual("oops\n", cp.stderr)
+        self.assertIn("ru_maxrss", cp.rusage)
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            launcher.run(["echoargs", "a", "b"], check=True, **self.kwargs)
+
+        self.assertRaises(FileNotFoundError, launcher.run, ["nonesuch"], **self.kwargs)
+
+    def test_cwd(self):
+        fake_program(self.bindir, "whereami", "pwd")
+        cp = launcher.run(["whereami"], cwd=self.bindir, **self.kwargs)
+        self.assertEqual(str(self.bindir.resolve()), cp.stdout.strip())
+
+    def test_concurrent(self):
+        def run(i):
+            return launcher.run(["echoargs", str(i)], **self.kwargs).stdout
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(run, range(32)))
+        self.assertEqual(list(f"{i}\n" for i in range(32)), outputs)
+
+    def test_timeout(self):
+        pidfile = self.bindir / "pid"
+        fake_program(
+            self.bindir, "hang", f"echo started\nsleep 30 &\necho $! > {pidfile}\nwait"
+        )
+        env = {"PATH": f"{self.bindir}:{os.defpath}"}
+        with self.assertRaises(subprocess.TimeoutExpired) as cm:
+            launcher.run(["hang"], **dict(self.kwargs, env=env, timeout=0.5))
+        self.assertEqual(0.5, cm.exception.timeout)
+        self.assertEqual(b"started\n", cm.exception.stdout)
+        self.assertIn("ru_maxrss", cm.exception.rusage)
+
+        # The program's child process was killed by the launcher, too.
+        pid = int(pidfile.read_text())
+        for _ in range(100):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail(f"The process {pid} was not killed.")
+
+        cp = launcher.run(["echoargs", "a"], timeout=10, **self.kwargs)
+        self.assertEqual("a\n", cp.stdout)
+
+    def test_stream(self):
+        fake_program(self.bindir, "chatty", "echo one; echo two >&2; echo three")
+        items = list(launcher.stream(["chatty"], env=self.env))
+        self.assertEqual(("returncode", 0), items[-2])
+        self.assertEqual("rusage", items[-1][0])
+        self.assertEqual(
+            b"one\nthree\n", b"".join(v for k, v in items if k == "stdout")
+        )
+        self.assertEqual(b"two\n", b"".join(v for k, v in items if k == "stderr"))
+
+
+class TestSharedLauncher(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.bindir = Path(self.tempdir.name)
+        self.address = self.bindir / "launcher.sock"
+        self.path = f"{self.bindir}:{os.defpath}"
+        # Fails if another copy of it is running at the same time.
+        fake_program(
+            self.bindir,
+            "exclusive",
+            f"mkdir {self.bindir}/lock || exit 9; sleep 0.05; rmdir {self.bindir}/lock",
+        )
+        self.kwargs = dict(
+            env=kalasiris.environ,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+
+    def tearDown(self):
+        launcher.connect(None)
+        self.tempdir.cleanup()
+
+    def test_server(self):
+        with launcher.Server(
+            self.address, max_jobs=1, env={"PATH": self.path}
+        ) as server:
+            t = threading.Thread(target=server.serve_forever, daemon=True)
+            t.start()
+            launcher.connect(self.address)
+
+            # The server's env is used, rather than kalasiris.environ, and
+            # programs with a timeout are also limited by the server.
+            for kwargs in (self.kwargs, dict(self.kwargs, timeout=30)):
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    cps = list(
+                        executor.map(
+                            lambda i: launcher.run(["exclusive"], **kwargs), range(4)
+                        )
+                    )
+                self.assertEqual([0, 0, 0, 0], list(cp.returncode for cp in cps))
+
+            # But not if it is given.
+            self.assertRaises(
+                FileNotFoundError,
+                launcher.run,
+                ["exclusive"],
+                **dict(self.kwargs, env={"PATH": "/nonesuch"}),
+            )
+            server.shutdown()
+            t.join()
+
+    def test_daemon(self):
+        daemon = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "kalasiris.launcher",
+                "--max-jobs",
+                "2",
+                str(self.address),
+            ],
+            stdout=subprocess.PIPE,
+        )
+        try:
+            self.assertEqual(b"ready\n", daemon.stdout.readline())
+            launcher.connect(self.address)
+            cp = launcher.run(
+                ["exclusive"], **dict(self.kwargs, env={"PATH": self.path})
+            )
+            self.assertEqual(0, cp.returncode)
+        finally:
+            daemon.send_signal(signal.SIGINT)
+            daemon.wait(timeout=10)
+            daemon.stdout.close()
+        self.assertFalse(self.address.exists())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `nativestats` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import csv
+import importlib.util
+import io
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import kalasiris as isis
+
+has_numpy_pvl = all(importlib.util.find_spec(m) for m in ("numpy", "pvl"))
+has_numpy_pvl_reason = "Requires the numpy and pvl libraries."
+if has_numpy_pvl:
+    import kalasiris.nativestats  # noqa: F401
+
+label_template = """Object = IsisCube
+  Object = Core
+    StartByte   = {start}
+    Format      = {format}
+    TileSamples = {tile_samples}
+    TileLines   = {tile_lines}
+
+    Group = Dimensions
+      Samples = {samples}
+      Lines   = {lines}
+      Bands   = {bands}
+    End_Group
+
+    Group = Pixels
+      Type       = {type}
+      ByteOrder  = Lsb
+      Base       = {base}
+      Multiplier = {multiplier}
+    End_Group
+  End_Object
+End_Object
+End
+"""
+
+
+def write_cube(path, arr, pixel_type, tile=None, base=0.0, multiplier=1.0):
+    """Writes the numpy *arr* (bands, lines, samples) as an ISIS cube
+    at *path*, in Tile format if *tile* is a (lines, samples) tuple."""
+    import numpy as np
+
+    arr = arr.astype("<" + isis.cube.pixel_types[pixel_type])
+    (bands, lines, samples) = arr.shape
+    if tile is None:
+        (fmt, data, tile) = ("BandSequential", arr, (lines, samples))
+    else:
+        fmt = "Tile"
+        rows = -(-lines // tile[0])
+        cols = -(-samples // tile[1])
+        padded = np.zeros((bands, rows * tile[0], cols * tile[1]), dtype=arr.dtype)
+        padded[:, :lines, :samples] = arr
+        data = padded.reshape(bands, rows, tile[0], cols, tile[1]).transpose(
+            0, 1, 3, 2, 4
+        )
+    label = label_template.format(
+        start=1025,
+        format=fmt,
+        tile_lines=tile[0],
+        tile_samples=tile[1],
+        samples=samples,
+        lines=lines,
+        bands=bands,
+        type=pixel_type,
+        base=base,
+        multiplier=multiplier,
+    )
+    with open(path, "wb") as f:
+        f.write(label.encode().ljust(1024, b" "))
+        f.write(np.ascontiguousarray(data).tobytes())
+
+
+@unittest.skipUnless(has_numpy_pvl, has_numpy_pvl_reason)
+class TestNativeStats(unittest.TestCase):
+    def setUp(self):
+        import numpy as np
+
+        self.np = np
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tempdir.name)
+        rng = np.random.default_rng(42)
+        self.arr = rng.integers(100, 200, size=(2, 37, 23))
+        self.arr[1, 0, :5] = isis.specialpixels.SignedWord.Null
+        self.arr[1, 1, :3] = isis.specialpixels.SignedWord.His
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def check(self, d, values):
+        np = self.np
+        values = values.ravel()
+        self.assertEqual(values.size, int(d["ValidPixels"]))
+        self.assertAlmostEqual(values.mean(), float(d["Average"]))
+        self.assertAlmostEqual(values.std(ddof=1), float(d["StandardDeviation"]))
+        self.assertAlmostEqual(values.sum(), float(d["Sum"]))
+        self.assertEqual(values.min(), float(d["Minimum"]))
+        self.assertEqual(values.max(), float(d["Maximum"]))
+        self.assertEqual(np.sort(values)[(values.size - 1) // 2], float(d["Median"]))
+
+    def test_keys(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord")
+        d = isis.nativestats.stats(cub)
+        self.assertEqual(
+            [
+                "From",
+                "Band",
+                "Average",
+                "StandardDeviation",
+                "Variance",
+                "Median",
+                "Mode",
+                "Skew",
+                "Minimum",
+                "Maximum",
+                "Sum",
+                "TotalPixels",
+                "ValidPixels",
+                "OverValidMaximumPixels",
+                "UnderValidMinimumPixels",
+                "NullPixels",
+                "LisPixels",
+                "LrsPixels",
+                "HisPixels",
+                "HrsPixels",
+            ],
+            list(d.keys()),
+        )
+        for v in d.values():
+            self.assertIsInstance(v, str)
+
+    def test_signedword(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord", base=1.0, multiplier=2.0)
+        d = isis.nativestats.stats(cub)
+        self.assertEqual("2", d["Band"])
+        self.assertEqual(str(37 * 23), d["TotalPixels"])
+        self.assertEqual("5", d["NullPixels"])
+        self.assertEqual("3", d["HisPixels"])
+        self.check(d, self.arr[1][self.arr[1] >= 100] * 2.0 + 1.0)
+
+        d1 = isis.nativestats.stats(cub, band=1)
+        self.check(d1, self.arr[0] * 2.0 + 1.0)
+
+    def test_tile(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord", tile=(8, 16))
+        self.check(isis.nativestats.stats(cub), self.arr[1][self.arr[1] >= 100])
+        self.check(isis.nativestats.stats(cub, band=1), self.arr[0])
+
+    def test_real(self):
+        np = self.np
+        arr = self.arr[:1] / 7.0
+        arr[0, 2, 2] = isis.specialpixels.Real.Lrs
+        cub = self.dir / "test.cub"
+        write_cube(cub, arr, "Real")
+        d = isis.nativestats.stats(cub)
+        self.assertEqual("1", d["LrsPixels"])
+        values = arr[0][arr[0] > 0].astype(np.float32).astype(np.float64)
+        self.assertEqual(values.size, int(d["ValidPixels"]))
+        self.assertAlmostEqual(values.mean(), float(d["Average"]))
+        self.assertTrue(
+            math.isclose(np.median(values), float(d["Median"]), rel_tol=1e-3)
+        )
+
+    def test_validrange(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord")
+        d = isis.nativestats.stats(cub, band=1, validmin=120, validmax=180)
+        a = self.arr[0]
+        self.assertEqual(str(int((a < 120).sum())), d["UnderValidMinimumPixels"])
+        self.assertEqual(str(int((a > 180).sum())), d["OverValidMaximumPixels"])
+        self.check(d, a[(a >= 120) & (a <= 180)])
+
+    def test_compare(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord")
+        native = isis.nativestats.stats(cub)
+        isis_d = dict(native, Average="1.0")
+        with patch("kalasiris.nativestats.isis.stats_k", return_value=isis_d):
+            diffs = isis.nativestats.compare(cub)
+        self.assertEqual({"Average": ("1.0", native["Average"])}, diffs)
+
+    def test_stats_k_backend(self):
+        cub = self.dir / "test.cub"
+        write_cube(cub, self.arr, "SignedWord")
+        native = isis.nativestats.stats(cub, band=1)
+        try:
+            isis.set_stats_backend("native")
+            with patch("kalasiris.k_funcs.isis.stats") as m_stats:
+                self.assertEqual(native, isis.stats_k(f"{cub}+1"))
+                m_stats.assert_not_called()
+
+            isis.set_stats_backend("verify")
+            isis_text = "Group = Results\n  Average = 1.0\nEnd_Group\n"
+            with patch(
+                "kalasiris.k_funcs.isis.stats", return_value=Mock(stdout=isis_text)
+            ):
+                with patch(
+                    "kalasiris.nativestats.stats", wraps=isis.nativestats.stats
+                ) as m_native:
+                    with self.assertLogs("kalasiris.k_funcs", level="WARNING"):
+                        self.assertEqual({"Average": "1.0"}, isis.stats_k(cub))
+                    m_native.assert_called_once()
+        finally:
+            isis.set_stats_backend("isis")
+        self.assertRaises(ValueError, isis.set_stats_backend, "foo")
+
+
+@unittest.skipUnless(has_numpy_pvl, has_numpy_pvl_reason)
+class TestCubenormStats(unittest.TestCase):
+    def setUp(self):
+        import numpy as np
+
+        self.np = np
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cub = Path(self.tempdir.name) / "test.cub"
+        rng = np.random.default_rng(7)
+        self.arr = rng.integers(100, 200, size=(2, 9, 5))
+        self.arr[0, :, 1] = isis.specialpixels.SignedWord.Null
+        self.arr[0, 2, 3] = isis.specialpixels.SignedWord.Lrs
+        write_cube(self.cub, self.arr, "SignedWord", tile=(4, 4))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_column(self):
+        np = self.np
+        d = isis.nativestats.cubenorm_stats(self.cub)
+        self.assertEqual(list(isis.cubenormfile.fieldnames), list(d.keys()))
+        self.assertEqual([1] * 5 + [2] * 5, d["Band"].tolist())
+        self.assertEqual(list(range(1, 6)) * 2, d["RowCol"].tolist())
+        self.assertEqual([9, 0, 9, 8, 9, 9, 9, 9, 9, 9], d["ValidPoints"].tolist())
+        self.assertEqual(isis.specialpixels.Double.Null, d["Average"][1])
+
+        col = np.delete(self.arr[0, :, 3], 2)
+        self.assertAlmostEqual(col.mean(), d["Average"][3])
+        self.assertAlmostEqual(col.std(ddof=1), d["StdDev"][3])
+        self.assertEqual(np.sort(col)[(col.size - 1) // 2], d["Median"][3])
+        self.assertEqual(col.min(), d["Minimum"][3])
+        self.assertEqual(self.arr[1, :, 4].max(), d["Maximum"][9])
+
+    def test_column_slabs(self):
+        np = self.np
+        whole = isis.nativestats.cubenorm_stats(self.cub)
+        bsq = Path(self.tempdir.name) / "bsq.cub"
+        write_cube(bsq, self.arr, "SignedWord")
+        # Two columns of nine lines in each slab.
+        with patch("kalasiris.nativestats.slab_pixels", 18):
+            for c in (self.cub, bsq):
+                with self.subTest(cube=c):
+                    d = isis.nativestats.cubenorm_stats(c)
+                    for n in isis.cubenormfile.fieldnames:
+                        self.assertTrue(np.array_equal(whole[n], d[n]))
+
+        for c in (self.cub, bsq):
+            with self.subTest(cube=c):
+                blocks = isis.cube.pixel_blocks(c, 2, samples=slice(3, 5))
+                self.assertTrue(
+                    np.array_equal(self.arr[1, :, 3:5], np.concatenate(list(blocks)))
+                )
+
+    def test_row(self):
+        np = self.np
+        d = isis.nativestats.cubenorm_stats(self.cub, direction="row", band=2)
+        self.assertEqual(list(range(1, 10)), d["RowCol"].tolist())
+        self.assertEqual([5] * 9, d["ValidPoints"].tolist())
+        self.assertTrue(np.allclose(self.arr[1].mean(axis=1), d["Average"]))
+        self.assertRaises(
+            ValueError, isis.nativestats.cubenorm_stats, self.cub, "diagonal"
+        )
+
+    def test_write(self):
+        with io.StringIO() as f:
+            isis.nativestats.write_cubenorm_stats(self.cub, f, band=2)
+            lines = f.getvalue().splitlines()
+        self.assertEqual(6, len(lines))
+        rows = list(csv.DictReader(lines, dialect=isis.cubenormfile.Dialect))
+        self.assertEqual("2", rows[0]["Band"])
+        self.assertEqual("9", rows[0]["ValidPoints"])
+        col = self.arr[1, :, 0]
+        self.assertAlmostEqual(col.mean(), float(rows[0]["Average"]), places=3)
+        columns = isis.cubenormfile.read_columns(io.StringIO("\n".join(lines)))
+        self.assertEqual(
+            list(float(r["Median"]) for r in rows), columns["Median"].tolist()
+        )
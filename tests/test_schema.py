@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `schema` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import kalasiris.kalasiris as isis
+import kalasiris.schema as schema
+
+xml_text = """<?xml version="1.0" encoding="UTF-8"?>
+<application name="fakeprog">
+  <groups>
+    <group name="Files">
+      <parameter name="FROM">
+        <type>cube</type>
+      </parameter>
+      <parameter name="TO">
+        <type>cube</type>
+      </parameter>
+    </group>
+    <group name="Options">
+      <parameter name="TOLERANCE">
+        <type>double</type>
+      </parameter>
+      <parameter name="LINES">
+        <type>integer</type>
+      </parameter>
+      <parameter name="PROPAGATE">
+        <type>boolean</type>
+      </parameter>
+      <parameter name="METHOD">
+        <type>string</type>
+        <list>
+          <option value="NEAREST"><brief>Nearest</brief></option>
+          <option value="BILINEAR"><brief>Bilinear</brief></option>
+          <option value="CUBIC"><brief>Cubic</brief></option>
+        </list>
+      </parameter>
+    </group>
+  </groups>
+</application>
+"""
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tempdir.name)
+        (self.root / "bin" / "xml").mkdir(parents=True)
+        (self.root / "bin" / "xml" / "fakeprog.xml").write_text(xml_text)
+        (self.root / "bin" / "xml" / "empty.xml").touch()
+        schema._parameters.cache_clear()
+
+    def tearDown(self):
+        schema._parameters.cache_clear()
+        self.tempdir.cleanup()
+
+    def test_parameters(self):
+        p = schema.parameters("fakeprog", self.root)
+        self.assertEqual(
+            ["FROM", "TO", "TOLERANCE", "LINES", "PROPAGATE", "METHOD"], list(p.keys())
+        )
+        self.assertEqual(schema.Parameter("LINES", "integer", None), p["LINES"])
+        self.assertEqual(("NEAREST", "BILINEAR", "CUBIC"), p["METHOD"].options)
+
+        self.assertIsNone(schema.parameters("empty", self.root))
+        self.assertIsNone(schema.parameters("missing", self.root))
+
+    def test_parameters_cached(self):
+        schema.parameters("fakeprog", self.root)
+        with patch("kalasiris.schema.ET.parse") as m_parse:
+            schema.parameters("fakeprog", self.root)
+            m_parse.assert_not_called()
+
+    def test_check_names(self):
+        schema.check("fakeprog", self.root, {"from": "a.cub", "to_": "b.cub"})
+        schema.check("fakeprog", self.root, {"lin": 5, "pref__": "p"})
+        self.assertRaises(
+            ValueError, schema.check, "fakeprog", self.root, {"too": "b.cub"}
+        )
+        # TO is a parameter, so it isn't ambiguous, but T is.
+        self.assertRaises(ValueError, schema.check, "fakeprog", self.root, {"t": 1})
+
+        # No schema, so no checks.
+        schema.check("empty", self.root, {"too": "b.cub"})
+
+    def test_check_types(self):
+        good = {"tolerance": "0.5", "lines": 5, "propagate": "yes", "method": "bil"}
+        schema.check("fakeprog", self.root, good, types=True)
+        for k, v in (
+            ("tolerance", "half"),
+            ("lines", 2.5),
+            ("propagate", "maybe"),
+            ("method", "sinc"),
+        ):
+            with self.subTest(key=k):
+                schema.check("fakeprog", self.root, {k: v})
+                self.assertRaises(
+                    ValueError, schema.check, "fakeprog", self.root, {k: v}, True
+                )
+
+
+@patch("kalasiris.kalasiris.subprocess.run")
+class TestPreflight(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        root = Path(self.tempdir.name)
+        (root / "bin" / "xml").mkdir(parents=True)
+        (root / "bin" / "xml" / "cam2map.xml").write_text(
+            xml_text.replace("fakeprog", "cam2map")
+        )
+        self.environ = patch.dict(isis.environ, ISISROOT=str(root))
+        self.environ.start()
+        schema._parameters.cache_clear()
+
+    def tearDown(self):
+        self.environ.stop()
+        schema._parameters.cache_clear()
+        isis.set_parameter_checks()
+        self.tempdir.cleanup()
+
+    def test_names(self, subp):
+        isis.cam2map("from.cub", to="to.cub", _cwd="foo")
+        subp.assert_called_once()
+
+        subp.reset_mock()
+        self.assertRaises(ValueError, isis.cam2map, "from.cub", too="to.cub")
+        subp.assert_not_called()
+
+        isis.set_parameter_checks(names=False)
+        isis.cam2map("from.cub", too="to.cub")
+        subp.assert_called_once_with(
+            ["cam2map", "from=from.cub", "too=to.cub"],
+            check=True,
+            env=isis.environ,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+
+    def test_types(self, subp):
+        isis.cam2map("from.cub", to="to.cub", lines="many")
+        subp.assert_called_once()
+
+        subp.reset_mock()
+        isis.set_parameter_checks(types=True)
+        self.assertRaises(ValueError, isis.cam2map, "from.cub", lines="many")
+        subp.assert_not_called()
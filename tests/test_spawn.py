@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `spawn` module."""
+
+# Copyright 2026, Ross A. Beyer (rbeyer@seti.org)
+#
+# Reuse is permitted under the terms of the license.
+# The AUTHORS file and the LICENSE file are at the
+# top level of this library.
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import kalasiris.kalasiris as isis
+import kalasiris.spawn as spawn
+
+
+def fake_program(bindir: Path, name: str, script: str):
+    p = bindir / name
+    p.write_text("#!/bin/sh\n" + script + "\n")
+    p.chmod(0o755)
+    return p
+
+
+class TestPosixSpawn(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.bindir = Path(self.tempdir.name)
+        fake_program(self.bindir, "echoargs", 'echo "$@"; echo oops >&2; exit $#')
+        self.env = {"PATH": str(self.bindir)}
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_run(self):
+        cp = spawn.posix_spawn_run(
+            ["echoargs", "from=a.cub"],
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertIsInstance(cp, subprocess.CompletedProcess)
+        self.assertEqual(1, cp.returncode)
+        self.assertEqual("from=a.cub\n", cp.stdout)
+        self.assertEqual("oops\n", cp.stderr)
+        self.assertIn("ru_maxrss", cp.rusage)
+
+    def test_bytes(self):
+        cp = spawn.posix_spawn_run(
+            ["echoargs"],
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        self.assertEqual(0, cp.returncode)
+        self.assertEqual(b"\noops\n", cp.stdout)
+        self.assertIsNone(cp.stderr)
+
+    def test_check(self):
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            spawn.posix_spawn_run(
+                ["echoargs", "a", "b"],
+                env=self.env,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        self.assertEqual(2, cm.exception.returncode)
+        self.assertEqual(b"a b\n", cm.exception.stdout)
+        self.assertIn("ru_maxrss", cm.exception.rusage)
+
+    def test_not_found(self):
+        self.assertRaises(
+            FileNotFoundError, spawn.posix_spawn_run, ["nonesuch"], env=self.env
+        )
+
+    def test_fallback(self):
+        with patch("kalasiris.spawn.subprocess.run") as m_run:
+            spawn.posix_spawn_run(["echoargs"], env=self.env, cwd="foo")
+            m_run.assert_called_once_with(["echoargs"], env=self.env, cwd="foo")
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.bindir = Path(self.tempdir.name)
+        fake_program(self.bindir, "getkey", 'echo "$@"')
+        fake_program(self.bindir, "stats", "exit 3")
+        self.environ = patch.dict(isis.environ, PATH=str(self.bindir))
+        self.environ.start()
+
+    def tearDown(self):
+        isis.set_spawn_backend()
+        self.environ.stop()
+        self.tempdir.cleanup()
+
+    def test_set_spawn_backend(self):
+        self.assertRaises(ValueError, isis.set_spawn_backend, "fork")
+
+    def test_backends(self):
+        for backend in spawn.backends:
+            with self.subTest(backend=backend):
+                isis.set_spawn_backend(backend)
+                cp = isis.getkey("a.cub", grpname="Instrument")
+                self.assertEqual("from=a.cub grpname=Instrument\n", cp.stdout)
+                if backend != "subprocess":
+                    self.assertIsInstance(cp, spawn.CompletedProcess)
+                    self.assertGreater(cp.rusage["ru_maxrss"], 0)
+                self.assertRaises(subprocess.CalledProcessError, isis.stats, "a.cub")
+                self.assertRaises(
+                    FileNotFoundError, isis.getkey, "a.cub", _env={"PATH": os.defpath}
+                )
@@ -10,8 +10,12 @@
 # top level of this library.
 
 import datetime
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
+import kalasiris
 import kalasiris.version as version
 
 
@@ -58,3 +62,52 @@ stable       # release stage (alpha, beta, stable)""",
         # Who knows what version of ISIS will be loaded, this
         # is just for occaisionally testing this functionality.
         print(version.version_info())
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.roots = list(Path(self.tempdir.name) / r for r in ("a", "b"))
+        for r, text in zip(self.roots, ("3.7.0\n2019-04-30\nstable\n", "3.5.2.0\n")):
+            (r / "bin" / "xml").mkdir(parents=True)
+            (r / ("isis_version.txt" if r.name == "a" else "version")).write_text(text)
+        version.clear_cache()
+
+    def tearDown(self):
+        version.clear_cache()
+        self.tempdir.cleanup()
+
+    def test_version_info(self):
+        with patch.dict(kalasiris.environ, ISISROOT=str(self.roots[0])):
+            with patch(
+                "kalasiris.version.get_from_file", wraps=version.get_from_file
+            ) as m_get:
+                v = version.version_info()
+                self.assertEqual(v, version.version_info())
+                m_get.assert_called_once()
+            self.assertEqual((3, 7, 0), v[:3])
+
+            kalasiris.environ["ISISROOT"] = str(self.roots[1])
+            self.assertEqual((3, 5, 2), version.version_info()[:3])
+
+            kalasiris.environ["ISISROOT"] = self.tempdir.name
+            self.assertRaises(FileNotFoundError, version.version_info)
+
+    def test_capabilities(self):
+        with patch.dict(kalasiris.environ, ISISROOT=str(self.roots[0])):
+            c = version.capabilities()
+            self.assertIs(c, version.capabilities())
+            self.assertEqual((3, 7, 0), c["version"][:3])
+            self.assertTrue(c["isis_version.txt"])
+            self.assertTrue(c["xml"])
+            self.assertTrue(c["batchlist"])
+            with self.assertRaises(TypeError):
+                c["xml"] = False
+
+            kalasiris.environ["ISISROOT"] = str(self.roots[1])
+            self.assertFalse(version.capabilities()["isis_version.txt"])
+
+            kalasiris.environ["ISISROOT"] = self.tempdir.name
+            c = version.capabilities()
+            self.assertIsNone(c["version"])
+            self.assertFalse(c["batchlist"])